@@ -4,17 +4,20 @@ Streamlit tabanlı görme engelliler için laboratuvar raporu okuma sistemi.
 """
 import streamlit as st
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 # Proje yollarını ekle
 project_root = Path(__file__).parent
-src_path = project_root / 'src'
-sys.path.insert(0, str(src_path))
+sys.path.insert(0, str(project_root))
 
-from parse_report import ReportParser
-from analyze_results import ResultAnalyzer
-from generate_summary import SummaryGenerator
-from text_to_speech import TextToSpeech
+from src import metrics
+from src.cache import audio_cache, parse_cache
+from src.locales import DEFAULT_LOCALE, available_locales, get_catalog
+from src.phrase_audio import warm_phrase_library
+from src.pipeline import ReportPipeline
+from src.result_store import get_result_store
+from src.text_to_speech import describe_audio
 
 # Sayfa yapılandırması
 st.set_page_config(
@@ -23,6 +26,13 @@ st.set_page_config(
     layout="wide"
 )
 
+# Aşama çıktılarını hatırlayan işlem hattı; ayar değişince yalnızca etkilenen aşamalar çalışır
+if 'pipeline' not in st.session_state:
+    st.session_state['pipeline'] = ReportPipeline(store=get_result_store())
+    # Varsayılan motorun parça sesleri arka planda hazırlanır (süreç başına bir kez)
+    warm_phrase_library()
+pipeline = st.session_state['pipeline']
+
 # Başlık ve açıklama
 st.title("🔊 SmartAudioLabReport")
 st.markdown("**Görme Engelliler için Klinik Sesli Sonuç Yorumlama Sistemi**")
@@ -44,12 +54,56 @@ with st.sidebar:
         help="v0.2 özelliği: Gelişmiş NLP tabanlı özetleme."
     )
     
+    patient_id = st.text_input(
+        "Hasta Kimliği (opsiyonel)",
+        help="Girilirse sonuçlar kaydedilir ve önceki raporlarla karşılaştırılır."
+    ).strip() or None
+    
+    report_date = st.date_input("Rapor Tarihi", help="Önceki sonuçlarla karşılaştırmada kullanılır.")
+    
+    locales = available_locales()
+    locale = st.selectbox(
+        "Özet Dili",
+        locales,
+        index=locales.index(DEFAULT_LOCALE),
+        format_func=lambda code: get_catalog(code).name,
+        help="Özet ve sesli okuma bu dilde üretilir; rapor yeniden analiz edilmez."
+    )
+    
     tts_engine = st.selectbox(
         "Ses Motoru",
         ["pyttsx3", "gtts"],
         help="pyttsx3: Offline, gtts: Online (internet gerekli)"
     )
     
+    audio_formats = {
+        'speech': "Konuşma (Opus 16 kbps)",
+        'opus': "Opus (32 kbps)",
+        'mp3': "MP3 (48 kbps)",
+        'wav': "WAV (sıkıştırmasız)",
+    }
+    audio_format = st.selectbox(
+        "Ses Biçimi",
+        list(audio_formats),
+        format_func=audio_formats.get,
+        help="İndirilen dosyanın biçimi; MP3 ve Opus için ffmpeg gerekir, yoksa WAV verilir."
+    )
+    
+    with st.expander("🗄️ Önbellek İstatistikleri"):
+        st.json({'parse': parse_cache.stats(), 'audio': audio_cache.stats(),
+                 'pipeline': pipeline.stats()})
+    
+    with st.expander("⏱️ Performans Ölçümleri"):
+        # Ölçüm süreç geneli bir ayardır (tüm oturumlar ve API); yalnızca
+        # başlangıçta SMART_AUDIO_METRICS ile açılır, arayüzden değiştirilmez
+        profile_report = st.checkbox("Sonraki raporu profille (cProfile)", value=False)
+        if metrics.is_enabled():
+            st.json(metrics.registry.snapshot())
+            st.code(metrics.registry.prometheus_text(), language='text')
+        else:
+            st.caption("Aşama süreleri ölçülmüyor; açmak için uygulamayı "
+                       "SMART_AUDIO_METRICS=1 ile başlatın.")
+    
     st.markdown("---")
     st.markdown("### 📋 Versiyon Bilgisi")
     st.info("**v0.3** - Web Arayüzü\n\n**Özellikler:**\n- PDF okuma\n- Otomatik analiz\n- Sesli yorumlama")
@@ -67,39 +121,38 @@ with tab1:
     )
     
     if uploaded_file is not None:
-        # Dosyayı geçici olarak kaydet
-        temp_path = project_root / 'temp_report.pdf'
-        with open(temp_path, 'wb') as f:
-            f.write(uploaded_file.getbuffer())
+        with metrics.profiled('report') if profile_report else nullcontext() as profile:
+            # Ayrıştırma yalnızca dosya, analiz cinsiyet, özet NLP ayarı değişince yeniden çalışır
+            pdf_bytes = uploaded_file.getvalue()
+            gender_val = None if gender == "Belirtilmemiş" else gender
+            with st.spinner('Rapor işleniyor...'):
+                result = pipeline.run(pdf_bytes, gender_val, use_nlp, patient_id, report_date, locale)
+            parsed_data = result['parsed']
         
-        # Raporu parse et
-        with st.spinner('Rapor okunuyor...'):
-            parser = ReportParser()
-            parsed_data = parser.parse(str(temp_path))
-        
-        if 'error' not in parsed_data:
-            st.success(f"✓ Rapor başarıyla okundu. {parsed_data.get('test_count', 0)} test bulundu.")
-            
-            # Session state'e kaydet
-            st.session_state['parsed_data'] = parsed_data
-            st.session_state['uploaded'] = True
+            if 'error' not in parsed_data:
+                st.success(f"✓ Rapor başarıyla okundu. {parsed_data.get('test_count', 0)} test bulundu.")
+                if 'ocr' in parsed_data:
+                    st.info(f"🔍 Metin katmanı olmayan {len(parsed_data['ocr']['pages'])} sayfa OCR ile okundu.")
+                    if parsed_data['ocr'].get('failed_pages'):
+                        st.warning(f"⚠️ OCR ile okunamayan sayfalar: "
+                                   f"{', '.join(map(str, parsed_data['ocr']['failed_pages']))}")
             
-            # Analiz yap
-            with st.spinner('Sonuçlar analiz ediliyor...'):
-                analyzer = ResultAnalyzer()
-                gender_val = None if gender == "Belirtilmemiş" else gender
-                analyses = analyzer.analyze(parsed_data['results'], gender_val)
-                st.session_state['analyses'] = analyses
+                # Session state'e kaydet
+                st.session_state['parsed_data'] = parsed_data
+                st.session_state['uploaded'] = True
+                st.session_state['analyses'] = result['analyses']
+                st.session_state['summary'] = result['summary']
+                st.session_state['report_inputs'] = (pdf_bytes, gender_val, use_nlp, patient_id, report_date)
+                st.session_state['locale'] = locale
             
-            # Özet oluştur
-            with st.spinner('Özet hazırlanıyor...'):
-                generator = SummaryGenerator(use_nlp=use_nlp)
-                summary = generator.generate(analyses, use_nlp_summary=use_nlp)
-                st.session_state['summary'] = summary
-            
-            st.balloons()
-        else:
-            st.error("Rapor okunamadı. Lütfen geçerli bir PDF dosyası yükleyin.")
+                if 'parse' in result['recomputed']:
+                    st.balloons()
+            else:
+                st.error("Rapor okunamadı. Lütfen geçerli bir PDF dosyası yükleyin.")
+        
+        if profile is not None:
+            with st.expander("🔬 Profil Çıktısı"):
+                st.code(profile.text, language='text')
 
 with tab2:
     st.header("Analiz Sonuçları")
@@ -185,12 +238,13 @@ with tab3:
             with col1:
                 if st.button("▶️ Canlı Dinle (Tarayıcı)", use_container_width=True):
                     with st.spinner('Ses üretiliyor...'):
-                        tts = TextToSpeech(engine=tts_engine, language='tr')
                         if tts_engine == 'gtts':
-                            # gTTS için MP3 oluştur
-                            audio_file = project_root / 'temp_audio.mp3'
-                            if tts.save_to_file(audio_text, str(audio_file)):
-                                st.audio(str(audio_file), format='audio/mp3')
+                            # gTTS MP3 üretir; çevrimiçi sentez başarısızsa yedek motorun sesi gelir
+                            audio_bytes = pipeline.audio(*st.session_state['report_inputs'],
+                                                         engine=tts_engine, use_phrases=False,
+                                                         locale=st.session_state['locale'])
+                            if audio_bytes:
+                                st.audio(audio_bytes, format=describe_audio(audio_bytes)[1])
                         else:
                             # pyttsx3 için canlı okuma (tarayıcıda çalışmaz, bilgi ver)
                             st.info("pyttsx3 tarayıcıda canlı çalışmaz. Lütfen indirip dinleyin.")
@@ -198,16 +252,19 @@ with tab3:
             with col2:
                 if st.button("💾 Ses Dosyası İndir", use_container_width=True):
                     with st.spinner('Dosya oluşturuluyor...'):
-                        tts = TextToSpeech(engine=tts_engine, language='tr')
-                        audio_file = project_root / 'lab_report_audio.mp3'
-                        if tts.save_to_file(audio_text, str(audio_file)):
-                            with open(audio_file, 'rb') as f:
-                                st.download_button(
-                                    label="📥 MP3 İndir",
-                                    data=f.read(),
-                                    file_name='lab_report_audio.mp3',
-                                    mime='audio/mpeg'
-                                )
+                        # Kural tabanlı özet önceden sentezlenmiş parçalardan birleştirilir
+                        encoded = pipeline.encoded_audio(*st.session_state['report_inputs'], engine=tts_engine,
+                                                         locale=st.session_state['locale'],
+                                                         audio_format=audio_format)
+                        if encoded:
+                            extension = encoded['extension']
+                            st.download_button(
+                                label=f"📥 {extension.upper()} İndir",
+                                data=encoded['audio'],
+                                file_name=f'lab_report_audio.{extension}',
+                                mime=encoded['media_type']
+                            )
+                            st.caption(f"{encoded['bytes'] / 1024:.1f} KB · kodlama {encoded['encode_ms']} ms")
         else:
             st.warning("Seslendirilecek metin bulunamadı.")
     else:
@@ -0,0 +1,5 @@
+"""
+SmartAudioLabReport - Performans ölçüm betikleri.
+
+Depo kök dizininden çalıştırılır, ör. ``python -m benchmarks.bench_matcher``.
+"""
@@ -0,0 +1,69 @@
+"""
+ResultAnalyzer.analyze_batch ile hasta başına analyze döngüsünün karşılaştırması.
+
+Döngü yöntemi bir örneklem üzerinde ölçülüp tüm satır sayısına oranlanır;
+vektörel yöntem tüm tablo üzerinde çalıştırılır. Örneklemdeki her hasta
+için iki çıktının birebir aynı olduğu doğrulanır.
+
+Kullanım:
+    python -m benchmarks.bench_analyze_batch [--rows 1000000] [--sample 20000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analyze_results import ResultAnalyzer
+
+
+def build_frame(analyzer: ResultAnalyzer, rows: int, seed: int = 3) -> pd.DataFrame:
+    """Referans aralıklarının çevresinde dağılmış, %10 eksik değerli tablo (boş cinsiyet: belirtilmemiş) üretir."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for test_name in analyzer.reference_ranges:
+        min_val, max_val, _ = analyzer.resolve_range(test_name)
+        center = (min_val + max_val) / 2
+        spread = max(max_val - min_val, 1.0)
+        column = np.round(rng.normal(center, spread * 0.6, rows), 1)
+        column[rng.random(rows) < 0.1] = np.nan
+        data[test_name] = column
+    data['gender'] = rng.choice(['Erkek', 'Kadın', ''], rows)
+    return pd.DataFrame(data)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=1_000_000)
+    arg_parser.add_argument('--sample', type=int, default=20_000)
+    args = arg_parser.parse_args()
+
+    analyzer = ResultAnalyzer()
+    frame = build_frame(analyzer, args.rows)
+    test_names = [name for name in frame.columns if name != 'gender']
+    sample = frame.iloc[:args.sample]
+
+    start = time.perf_counter()
+    looped = []
+    for row in sample.itertuples(index=False):
+        row = row._asdict()
+        results = {name: {'value': row[name]} for name in test_names if not np.isnan(row[name])}
+        looped.append(analyzer.analyze(results, row['gender']))
+    loop_per_row = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    batch = analyzer.analyze_batch(frame)
+    vector_total = time.perf_counter() - start
+
+    for row, expected in enumerate(looped):
+        assert batch.patient(row) == expected, row
+
+    loop_total = loop_per_row * args.rows
+    print(f"satır: {args.rows:,}  test: {len(test_names)}")
+    print(f"analyze döngüsü (tahmini): {loop_total:8.2f} sn")
+    print(f"analyze_batch           : {vector_total:8.2f} sn")
+    print(f"hızlanma                : {loop_total / vector_total:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Asenkron çevrimiçi TTS istemcisinin yerel taklit sunucuya karşı ölçümü.
+
+gTTS'in davranışı (parçaları sırayla, her parça için yeni bağlantıyla
+indirme) ile havuzlanmış oturum + eşzamanlı parça indirme karşılaştırılır.
+Ayrıca hata oranı yüksek bir sunucuda devre kesicinin çevrimdışı motora
+dönüşü gösterilir. Ağ erişimi gerekmez.
+
+Kullanım:
+    python -m benchmarks.bench_async_tts [--latency 0.1] [--concurrency 4]
+"""
+import argparse
+import asyncio
+import time
+import urllib.request
+
+from benchmarks.bench_streaming_tts import build_audio_text
+from benchmarks.stub_tts_server import start_server
+from src.async_tts import (AsyncOnlineTTS, CircuitBreaker, OnlineTTSBackend, decode_response,
+                           encode_request, split_for_request)
+
+
+def serial_fetch(url: str, text: str) -> bytes:
+    """gTTS benzeri: parçalar sırayla, her biri yeni bağlantıyla."""
+    audio = b''
+    for piece in split_for_request(text):
+        request = urllib.request.Request(
+            url + '/_/TranslateWebserverUi/data/batchexecute',
+            data=encode_request(piece, 'tr').encode('ascii'), method='POST'
+        )
+        with urllib.request.urlopen(request) as response:
+            audio += decode_response(response.read().decode('utf-8'))
+    return audio
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--latency', type=float, default=0.1)
+    arg_parser.add_argument('--concurrency', type=int, default=4)
+    arg_parser.add_argument('--reports', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    text = build_audio_text()
+    server, url = start_server(latency=args.latency)
+    print(f"metin: {len(text)} karakter, {len(split_for_request(text))} istek/rapor")
+
+    start = time.perf_counter()
+    for _ in range(args.reports):
+        serial = serial_fetch(url, text)
+    serial_time = (time.perf_counter() - start) / args.reports
+    serial_connections = len(server.RequestHandlerClass.connections)
+    server.RequestHandlerClass.connections.clear()
+
+    async def run_async():
+        client = AsyncOnlineTTS(base_url=url, concurrency=args.concurrency)
+        try:
+            start = time.perf_counter()
+            for _ in range(args.reports):
+                audio = await client.synthesize(text)
+            return audio, (time.perf_counter() - start) / args.reports
+        finally:
+            await client.close()
+
+    audio, async_time = asyncio.run(run_async())
+    assert audio == serial
+    async_connections = len(server.RequestHandlerClass.connections)
+    server.shutdown()
+
+    print(f"{'yöntem':<26} {'sn/rapor':>9} {'bağlantı':>9}")
+    print(f"{'sıralı, yeni bağlantı':<26} {serial_time:>9.2f} {serial_connections:>9}")
+    print(f"{f'asenkron ({args.concurrency} eşzamanlı)':<26} {async_time:>9.2f} {async_connections:>9}")
+
+    failing, failing_url = start_server(latency=0.01, failure_rate=1.0)
+    backend = OnlineTTSBackend(base_url=failing_url, retries=1,
+                               backoff=0.01, breaker=CircuitBreaker(failure_threshold=2))
+    for _ in range(4):
+        backend.synthesize('Hemoglobin değeri düşük.')
+    print(f"hatalı sunucu: {backend.stats()}")
+    backend.close()
+    failing.shutdown()
+
+
+if __name__ == '__main__':
+    main()
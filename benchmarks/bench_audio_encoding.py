@@ -0,0 +1,94 @@
+"""
+Sesli özetlerin biçim ve bit hızına göre boyut ve kodlama süresi ölçümü.
+
+Rastgele raporların sesli özet metinlerinden, sözcük başına zarflı
+harmonik tonlar ve sözcük araları ile baştaki/sondaki sessizlikten oluşan
+konuşmaya benzer 22050 Hz WAV'lar üretilir. Her biçim için toplam boyut,
+WAV'a göre oran, klip başına kodlama süresi, gerçek zaman katsayısı
+(ses süresi / kodlama süresi) ve işçi havuzuyla paralel kodlamada
+saniyedeki klip sayısı raporlanır. ffmpeg yoksa MP3 ve Opus WAV'a düşer;
+üretilen gerçek biçim tabloda gösterilir.
+
+Kullanım:
+    python -m benchmarks.bench_audio_encoding [--reports 20] [--formats speech opus mp3 wav]
+"""
+import argparse
+import io
+import random
+import time
+import wave
+
+import numpy as np
+
+from benchmarks.bench_phrase_audio import random_analyses
+from src.analyze_results import ResultAnalyzer
+from src.audio_encoding import (ENCODE_WORKERS, FFMPEG_AVAILABLE, FORMATS, encode_audio,
+                                get_encoder_executor)
+from src.generate_summary import SummaryGenerator
+
+
+FRAME_RATE = 22050
+
+
+def speech_like_wav(text: str, rng: random.Random) -> bytes:
+    """Metnin sözcük ve harf sayısına göre konuşmaya benzer PCM içeren WAV."""
+    parts = [np.zeros(int(FRAME_RATE * 0.4))]
+    for word in text.split():
+        length = int(FRAME_RATE * 0.06 * len(word))
+        t = np.arange(length) / FRAME_RATE
+        f0 = rng.uniform(110, 220)
+        tone = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * np.arange(length) / length) ** 2
+        parts.append(tone * envelope * rng.uniform(0.05, 0.25))
+        parts.append(np.zeros(int(FRAME_RATE * 0.08)))
+    parts.append(np.zeros(int(FRAME_RATE * 0.4)))
+    pcm = np.clip(np.concatenate(parts), -1, 1)
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(FRAME_RATE)
+        writer.writeframes((pcm * 32767).astype('<i2').tobytes())
+    return output.getvalue()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--reports', type=int, default=20)
+    arg_parser.add_argument('--formats', nargs='+', default=list(FORMATS), choices=list(FORMATS))
+    arg_parser.add_argument('--seed', type=int, default=25)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    analyzer, generator = ResultAnalyzer(), SummaryGenerator()
+    clips = [speech_like_wav(generator.generate(random_analyses(analyzer, rng))['audio_text'], rng)
+             for _ in range(args.reports)]
+    input_bytes = sum(len(clip) for clip in clips)
+    duration = sum((len(clip) - 44) / (2 * FRAME_RATE) for clip in clips)
+    print(f"{len(clips)} klip, toplam {duration:.1f} sn ses, {input_bytes / 1024:.0f} KB WAV")
+    if not FFMPEG_AVAILABLE:
+        print("Uyarı: ffmpeg bulunamadı, MP3 ve Opus WAV olarak kodlanır.")
+
+    print()
+    print(f"{'biçim':<8}{'üretilen':>10}{'KB':>10}{'oran':>8}{'ms/klip':>10}"
+          f"{'gerçek zaman':>14}{'havuz klip/sn':>15}")
+    executor = get_encoder_executor()
+    for audio_format in args.formats:
+        start = time.perf_counter()
+        results = [encode_audio(clip, audio_format) for clip in clips]
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        list(executor.map(lambda clip: encode_audio(clip, audio_format), clips))
+        pooled = time.perf_counter() - start
+
+        output_bytes = sum(result['bytes'] for result in results)
+        produced = ','.join(sorted({result['format'] for result in results}))
+        print(f"{audio_format:<8}{produced:>10}{output_bytes / 1024:>10.1f}"
+              f"{input_bytes / output_bytes:>7.1f}x{serial / len(clips) * 1000:>10.1f}"
+              f"{duration / serial:>13.0f}x{len(clips) / pooled:>15.1f}")
+    print(f"\nİşçi havuzu: {ENCODE_WORKERS} iş parçacığı (SMART_AUDIO_ENCODE_WORKERS)")
+
+
+if __name__ == '__main__':
+    main()
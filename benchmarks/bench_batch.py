@@ -0,0 +1,45 @@
+"""
+Toplu işleme hattının işçi sayısına göre ölçeklenmesi.
+
+Sentetik PDF'lerle dolu geçici bir dizini farklı işçi sayılarıyla
+``src.batch.run_batch`` üzerinden işler ve rapor/sn değerini gösterir.
+
+Kullanım:
+    python -m benchmarks.bench_batch [--files 200] [--pages 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_streaming import build_report
+from src.batch import find_reports, run_batch
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--files', type=int, default=200)
+    arg_parser.add_argument('--pages', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = build_report(args.pages)
+        for index in range(args.files):
+            (Path(tmp) / f'report_{index:05d}.pdf').write_bytes(report)
+
+        print(f"{'işçi':>5} {'rapor/sn':>10} {'ölçekleme':>10}")
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            count = sum(1 for _ in run_batch(find_reports(Path(tmp)), workers, workers * 4))
+            throughput = count / (time.perf_counter() - start)
+            baseline = baseline or throughput
+            print(f"{workers:>5} {throughput:>10.1f} {throughput / baseline:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
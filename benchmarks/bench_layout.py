@@ -0,0 +1,55 @@
+"""
+Satır tabanlı ve yerleşim tabanlı (tablo sütunlu) ayrıştırmanın karşılaştırması.
+
+Sentetik tablo raporları (sütun sırası rapordan rapora değişir; referans
+aralığı sonuçtan önce gelebilir) ve düz metin raporları her iki yöntemle
+ayrıştırılır; değer ve birim doğruluğu ile saniyedeki rapor sayısı
+raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_layout [--reports 100] [--pages 2]
+"""
+import argparse
+import time
+
+from benchmarks.corpus import CorpusGenerator
+from src.parse_report import ReportParser
+
+
+def evaluate(parser: ReportParser, reports, pdfs):
+    values = units = total = 0
+    start = time.perf_counter()
+    parsed = [parser.parse(pdf)['results'] for pdf in pdfs]
+    elapsed = time.perf_counter() - start
+    for report, results in zip(reports, parsed):
+        for test_name, expected in report.expected.items():
+            total += 1
+            found = results.get(test_name)
+            if found is None:
+                continue
+            values += abs(found['value'] - expected) < 1e-9
+            units += found['unit'] == report.expected_units[test_name]
+    return values / total, units / total, len(pdfs) / elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--reports', type=int, default=100)
+    arg_parser.add_argument('--pages', type=int, default=2)
+    arg_parser.add_argument('--seed', type=int, default=7)
+    args = arg_parser.parse_args()
+
+    parsers = {'satır': ReportParser(), 'yerleşim': ReportParser(layout=True)}
+    print(f"{'külliyat':<12}{'yöntem':<12}{'değer %':>10}{'birim %':>10}{'rapor/sn':>12}")
+    for corpus_name, tabular in (('tablo', True), ('düz metin', False)):
+        generator = CorpusGenerator(args.seed, pdf_safe_names=True)
+        reports = list(generator.corpus(args.reports, pages=args.pages, tabular=tabular))
+        pdfs = [report.pdf_bytes() for report in reports]
+        for parser_name, parser in parsers.items():
+            value_acc, unit_acc, rate = evaluate(parser, reports, pdfs)
+            print(f"{corpus_name:<12}{parser_name:<12}{value_acc * 100:>10.1f}"
+                  f"{unit_acc * 100:>10.1f}{rate:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
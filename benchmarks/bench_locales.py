@@ -0,0 +1,72 @@
+"""
+Tek analizden birden çok dilde özet üretiminin ölçümü.
+
+Sentetik raporlar için iki yöntem karşılaştırılır: her dil için metni
+yeniden ayrıştırıp analiz edip özetlemek (dil başına ayrı kurulum) ve
+raporu bir kez analiz edip ``generate_locales`` ile N dilde özetlemek.
+Her N için saniyedeki rapor sayısı raporlanır; ayrıca katalogların ilk
+yükleme süresi ve paylaşılan kataloğa erişim süresi gösterilir.
+
+Kullanım:
+    python -m benchmarks.bench_locales [--reports 500] [--min-time 1.0]
+"""
+import argparse
+import time
+
+from benchmarks.bench_summary import reports_per_second
+from benchmarks.corpus import CorpusGenerator
+from src.analyze_results import ResultAnalyzer
+from src.generate_summary import SummaryGenerator
+from src.locales import MessageCatalog, available_locales, get_catalog
+from src.parse_report import ReportParser
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--reports', type=int, default=500)
+    arg_parser.add_argument('--min-time', type=float, default=1.0)
+    arg_parser.add_argument('--seed', type=int, default=8)
+    args = arg_parser.parse_args()
+
+    locales = available_locales()
+    print(f"{'dil':<6}{'ilk yükleme ms':>16}{'paylaşılan µs':>16}")
+    for locale in locales:
+        start = time.perf_counter()
+        MessageCatalog.load(locale)
+        load_ms = (time.perf_counter() - start) * 1000
+        get_catalog(locale)
+        start = time.perf_counter()
+        for _ in range(1000):
+            get_catalog(locale)
+        shared_us = (time.perf_counter() - start) * 1000
+        print(f"{locale:<6}{load_ms:>16.2f}{shared_us:>16.3f}")
+
+    parser, analyzer, generator = ReportParser(), ResultAnalyzer(), SummaryGenerator()
+    reports = [(report.text, report.gender) for report in CorpusGenerator(args.seed).corpus(args.reports)]
+
+    def per_locale(item, wanted):
+        text, gender = item
+        for locale in wanted:
+            analyses = analyzer.analyze(parser.find_test_results(text), gender)
+            generator.generate(analyses, locale=locale)
+
+    def fan_out(item, wanted):
+        text, gender = item
+        analyses = analyzer.analyze(parser.find_test_results(text), gender)
+        generator.generate_locales(analyses, wanted)
+
+    print()
+    print(f"{'N dil':<8}{'dil başına (rapor/sn)':>24}{'tek analiz (rapor/sn)':>24}{'hızlanma':>10}")
+    for count in range(1, len(locales) + 1):
+        wanted = locales[:count]
+        separate = reports_per_second(lambda item: per_locale(item, wanted), reports, args.min_time)
+        shared = reports_per_second(lambda item: fan_out(item, wanted), reports, args.min_time)
+        print(f"{count:<8}{separate:>24,.0f}{shared:>24,.0f}{shared / separate:>9.2f}x")
+
+    analyses = [analyzer.analyze(parser.find_test_results(text), gender) for text, gender in reports]
+    rate = reports_per_second(lambda a: generator.generate_locales(a, locales), analyses, args.min_time)
+    print(f"\nYalnızca özet ({len(locales)} dil, hazır analizden): {rate * len(locales):,.0f} özet/sn")
+
+
+if __name__ == '__main__':
+    main()
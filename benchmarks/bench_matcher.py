@@ -0,0 +1,106 @@
+"""
+ReportParser.find_test_results için satır/saniye ölçümü.
+
+Derlenmiş tek geçişli eşleştiriciyi, her satırda her deseni ayrı ayrı
+deneyen eski döngüyle karşılaştırır. Ayrıca desen sayısı yüzlere
+çıktığında iki yöntemin nasıl ölçeklendiğini gösterir.
+
+Kullanım:
+    python -m benchmarks.bench_matcher [--lines 10000] [--repeat 3]
+"""
+import argparse
+import random
+import re
+import time
+from typing import Dict, List
+
+from src.parse_report import ReportParser
+
+
+NOISE_LINES = [
+    'Hasta Adı: ******  Protokol No: 123456',
+    'Numune Kabul Tarihi: 12.03.2024 08:15',
+    'Yöntem: Spektrofotometrik',
+    'Bu rapor elektronik olarak onaylanmıştır.',
+    'Sayfa 3 / 12',
+    'Biyokimya Laboratuvarı - Uzman Onayı',
+    '',
+]
+
+RESULT_LINES = [
+    'Hemoglobin 14.2 g/dL 12.0-16.0',
+    'Hematokrit 42,1 % 36-46',
+    'Lökosit 7.3 x10^9/L 4.0-10.0',
+    'Glukoz 96 mg/dL 70-100',
+    'Kreatinin 0.9 mg/dL 0.6-1.2',
+]
+
+
+def legacy_find_test_results(parser: ReportParser, text: str) -> Dict[str, Dict]:
+    """Derlenmiş eşleştiriciden önceki satır x desen döngüsü (referans)."""
+    results = {}
+    for line in text.split('\n'):
+        line_upper = line.upper()
+        for test_name, pattern in parser.test_patterns.items():
+            if re.search(pattern, line_upper, re.IGNORECASE):
+                value = parser.parse_numeric_value(line)
+                if value is not None:
+                    results[test_name] = {
+                        'value': value,
+                        'unit': parser.extract_unit(line),
+                        'raw_line': line.strip()
+                    }
+                break
+    return results
+
+
+def build_text(line_count: int, seed: int = 42) -> str:
+    """Çoğunluğu gürültü olan sentetik rapor metni üretir."""
+    rng = random.Random(seed)
+    lines: List[str] = []
+    for _ in range(line_count):
+        if rng.random() < 0.05:
+            lines.append(rng.choice(RESULT_LINES))
+        else:
+            lines.append(rng.choice(NOISE_LINES))
+    return '\n'.join(lines)
+
+
+def extra_patterns(count: int) -> Dict[str, str]:
+    """Ölçeklenme testi için yapay analit desenleri."""
+    return {f'analyte_{i}': f'ANL{i:03d}|Analit Numara {i:03d}' for i in range(count)}
+
+
+def time_call(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--lines', type=int, default=10000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    text = build_text(args.lines)
+    print(f"{'desen':>6} {'eski satır/sn':>15} {'yeni satır/sn':>15} {'hızlanma':>9}")
+
+    for extra in (0, 100, 300):
+        parser = ReportParser()
+        parser.test_patterns.update(extra_patterns(extra))
+        parser.compile_patterns()
+
+        assert parser.find_test_results(text) == legacy_find_test_results(parser, text)
+
+        legacy = time_call(lambda: legacy_find_test_results(parser, text), args.repeat)
+        compiled = time_call(lambda: parser.find_test_results(text), args.repeat)
+        print(f"{len(parser.test_patterns):>6} {args.lines / legacy:>15,.0f} "
+              f"{args.lines / compiled:>15,.0f} {legacy / compiled:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+NLP özetleme arka uçlarının (pytorch, int8, onnx) CPU karşılaştırması.
+
+Sabit tohumlu sentetik analizlerden kural tabanlı özet + detaylı yorum
+metinleri üretilir ve her arka uç ayrı bir süreçte bu derlem üzerinde
+çalıştırılır. Ortalama gecikme, tepe bellek (RSS) ve pytorch çıktısıyla
+kelime düzeyinde uyum (F1) raporlanır.
+
+Ağ erişimi olmadan çalıştırmak için küçük bir yerel model dizini verin:
+    HF_HUB_OFFLINE=1 python -m benchmarks.bench_nlp_backends --model ./models/tiny-bart
+
+Kullanım:
+    python -m benchmarks.bench_nlp_backends [--model ADI_VEYA_DİZİN] [--reports 20]
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import List
+
+from src.analyze_results import ResultAnalyzer
+from src.generate_summary import DEFAULT_NLP_MODEL, NLP_BACKENDS, SummaryGenerator
+
+
+def build_corpus(count: int, seed: int = 11) -> List[str]:
+    """NLP özetleyicisine verilen metinlerin aynısından oluşan sabit derlem."""
+    rng = random.Random(seed)
+    analyzer = ResultAnalyzer()
+    generator = SummaryGenerator()
+    corpus = []
+    for _ in range(count):
+        results = {}
+        for test_name in rng.sample(list(analyzer.reference_ranges), rng.randint(4, 11)):
+            min_val, max_val, _ = analyzer.resolve_range(test_name)
+            upper = max_val if max_val != float('inf') else min_val * 2 + 1
+            results[test_name] = {'value': round(rng.uniform(min_val * 0.7, upper * 1.3), 1)}
+        analyses = analyzer.analyze(results, rng.choice(['Erkek', 'Kadın', None]))
+        corpus.append(generator.generate_simple_summary(analyses) + "\n\n"
+                      + generator.generate_detailed_commentary(analyses))
+    return corpus
+
+
+def token_f1(candidate: str, reference: str) -> float:
+    left, right = Counter(candidate.split()), Counter(reference.split())
+    overlap = sum((left & right).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(left.values())
+    recall = overlap / sum(right.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_backend(model: str, backend: str, reports: int) -> dict:
+    from src.generate_summary import load_summarizer
+    from src.summarizer_service import SUMMARY_KWARGS
+
+    corpus = build_corpus(reports)
+    start = time.perf_counter()
+    summarizer = load_summarizer(model, backend)
+    load_time = time.perf_counter() - start
+
+    outputs, latencies = [], []
+    for text in corpus:
+        start = time.perf_counter()
+        outputs.append(summarizer(text, **SUMMARY_KWARGS)[0]['summary_text'])
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        'backend': backend,
+        'load_s': load_time,
+        'mean_s': sum(latencies) / len(latencies),
+        'p90_s': latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))],
+        'peak_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'outputs': outputs,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--model', default=DEFAULT_NLP_MODEL)
+    arg_parser.add_argument('--reports', type=int, default=20)
+    arg_parser.add_argument('--backends', nargs='+', default=list(NLP_BACKENDS),
+                            choices=NLP_BACKENDS)
+    arg_parser.add_argument('--run', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_backend(args.model, args.run, args.reports)))
+        return
+
+    rows = {}
+    for backend in args.backends:
+        completed = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_nlp_backends', '--model', args.model,
+             '--reports', str(args.reports), '--run', backend],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            print(f"{backend}: çalıştırılamadı\n{completed.stderr.strip().splitlines()[-1:]}")
+            continue
+        rows[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    reference = rows.get('pytorch')
+    print(f"{'arka uç':<8} {'yükleme (s)':>12} {'ort. (s)':>9} {'p90 (s)':>8} "
+          f"{'tepe RSS (MiB)':>15} {'uyum F1':>8}")
+    for backend, row in rows.items():
+        agreement = (sum(token_f1(a, b) for a, b in zip(row['outputs'], reference['outputs']))
+                     / len(row['outputs'])) if reference else float('nan')
+        print(f"{backend:<8} {row['load_s']:>12.2f} {row['mean_s']:>9.3f} {row['p90_s']:>8.3f} "
+              f"{row['peak_rss_mib']:>15.1f} {agreement:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
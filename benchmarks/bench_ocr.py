@@ -0,0 +1,76 @@
+"""
+Taranmış (yalnızca görüntü) raporlarda OCR aşamasının ölçümü.
+
+Sentetik raporlar metin katmanı olmadan PDF'e çizilir; her işçi sayısı
+için tüm sayfalar OCR ile okunur ve sayfa başına gecikme (p50/p95),
+saniyedeki sayfa sayısı ve test değerlerinin doğruluğu raporlanır. Son
+satır aynı sayfaların önbellekten okunma süresidir. Tesseract, pytesseract
+ve pypdfium2 kurulu olmalıdır; ağ gerekmez.
+
+Kullanım:
+    python -m benchmarks.bench_ocr [--reports 10] [--pages 2] [--workers 1 2 4]
+"""
+import argparse
+import time
+
+from benchmarks.corpus import CorpusGenerator
+from src import ocr
+from src.cache import ContentCache
+from src.parse_report import ReportParser
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(reports, pdfs, parser: ReportParser, dpi: int, workers: int, cache: ContentCache):
+    page_ms, correct, total = [], 0, 0
+    start = time.perf_counter()
+    for report, pdf in zip(reports, pdfs):
+        result = ocr.ocr_pages(pdf, range(len(report.pages)), dpi=dpi, workers=workers, cache=cache)
+        page_ms.extend(result['page_ms'].values())
+        text = '\n'.join(result['texts'][index] for index in sorted(result['texts']))
+        found = parser.find_test_results(text)
+        for test_name, expected in report.expected.items():
+            total += 1
+            value = found.get(test_name, {}).get('value')
+            correct += value is not None and abs(value - expected) < 1e-9
+    return time.perf_counter() - start, page_ms, correct / total
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--reports', type=int, default=10)
+    arg_parser.add_argument('--pages', type=int, default=2)
+    arg_parser.add_argument('--workers', type=int, nargs='+', default=[1, ocr.OCR_WORKERS])
+    arg_parser.add_argument('--dpi', type=int, default=ocr.DEFAULT_DPI)
+    arg_parser.add_argument('--seed', type=int, default=11)
+    args = arg_parser.parse_args()
+
+    if not ocr.OCR_AVAILABLE:
+        print("OCR kullanılamıyor: tesseract, pytesseract ve pypdfium2 kurulu olmalı.")
+        return
+    ocr.OCR_WORKERS = max(args.workers)
+
+    generator = CorpusGenerator(args.seed, pdf_safe_names=True)
+    reports = list(generator.corpus(args.reports, pages=args.pages, noise_per_page=10))
+    pdfs = [report.scanned_pdf_bytes() for report in reports]
+    page_total = sum(len(report.pages) for report in reports)
+    parser = ReportParser()
+
+    print(f"{page_total} sayfa, {args.dpi} DPI")
+    print(f"{'işçi':<8}{'sayfa/sn':>10}{'p50 ms':>10}{'p95 ms':>10}{'doğruluk %':>12}")
+    cache = None
+    for workers in args.workers:
+        # Her ölçüm boş, yalnızca bellekte tutulan bir önbellekle başlar
+        cache = ContentCache('ocr-bench', memory_items=page_total)
+        elapsed, page_ms, accuracy = run(reports, pdfs, parser, args.dpi, workers, cache)
+        print(f"{workers:<8}{page_total / elapsed:>10.1f}{percentile(page_ms, 0.5):>10.0f}"
+              f"{percentile(page_ms, 0.95):>10.0f}{accuracy * 100:>12.1f}")
+    elapsed, _, accuracy = run(reports, pdfs, parser, args.dpi, args.workers[-1], cache)
+    print(f"{'önbellek':<8}{page_total / elapsed:>10.1f}{'':>10}{'':>10}{accuracy * 100:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Parça kütüphanesiyle birleştirme ile tüm metni sentezlemenin karşılaştırması.
+
+CPU maliyeti metin uzunluğuyla doğrusal artan, WAV üreten benzetimli bir
+motor kullanılır. Kütüphane bir kez ısıtıldıktan sonra rastgele raporlar
+için rapor başına gecikme, CPU süresi ve motor çağrısı sayısı ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_phrase_audio [--reports 50]
+"""
+import argparse
+import io
+import math
+import random
+import struct
+import time
+import wave
+
+from src.analyze_results import ResultAnalyzer
+from src.cache import ContentCache
+from src.generate_summary import SummaryGenerator
+from src.phrase_audio import PhraseAudioLibrary
+from src.text_to_speech import TextToSpeech
+
+
+class SimulatedWavTTS(TextToSpeech):
+    """Karakter başına 10 ms'lik sinüs PCM'i hesaplayan çevrimdışı motor benzetimi."""
+
+    frame_rate = 8000
+
+    def __init__(self):
+        super().__init__(engine='simulated')
+        self.calls = 0
+
+    def get_audio_bytes(self, text: str) -> bytes:
+        self.calls += 1
+        samples = len(text) * self.frame_rate // 100
+        pcm = struct.pack(f'<{samples}h', *(
+            int(8000 * math.sin(2 * math.pi * 220 * i / self.frame_rate)) for i in range(samples)
+        ))
+        output = io.BytesIO()
+        with wave.open(output, 'wb') as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(self.frame_rate)
+            writer.writeframes(pcm)
+        return output.getvalue()
+
+
+def random_analyses(analyzer: ResultAnalyzer, rng: random.Random):
+    results = {}
+    for test_name in rng.sample(list(analyzer.reference_ranges), rng.randint(3, 11)):
+        min_val, max_val, _ = analyzer.resolve_range(test_name)
+        results[test_name] = {'value': round(rng.uniform(min_val * 0.6, max_val * 1.4 + 1), 1)}
+    return analyzer.analyze(results, rng.choice(['Erkek', 'Kadın', None]))
+
+
+def measure(func):
+    wall, cpu = time.perf_counter(), time.process_time()
+    func()
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--reports', type=int, default=50)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(5)
+    analyzer = ResultAnalyzer()
+    generator = SummaryGenerator()
+    reports = [random_analyses(analyzer, rng) for _ in range(args.reports)]
+
+    tts = SimulatedWavTTS()
+    library = PhraseAudioLibrary(tts, cache=ContentCache('bench-phrases', memory_items=10_000))
+    warm_wall, _ = measure(library.precompute)
+    warm_calls = tts.calls
+    print(f"kütüphane ısıtma: {warm_calls} parça, {warm_wall:.2f} sn")
+
+    full_wall = full_cpu = phrase_wall = phrase_cpu = 0.0
+    tts.calls = 0
+    for analyses in reports:
+        text = generator.generate_simple_summary(analyses)
+        wall, cpu = measure(lambda: tts.get_audio_bytes(text))
+        full_wall, full_cpu = full_wall + wall, full_cpu + cpu
+    full_calls, tts.calls = tts.calls, 0
+    for analyses in reports:
+        wall, cpu = measure(lambda: library.render(analyses))
+        phrase_wall, phrase_cpu = phrase_wall + wall, phrase_cpu + cpu
+
+    count = len(reports)
+    print(f"{'yöntem':<12} {'ms/rapor':>9} {'CPU ms/rapor':>13} {'motor çağrısı':>14}")
+    print(f"{'tüm metin':<12} {full_wall / count * 1000:>9.1f} {full_cpu / count * 1000:>13.1f} {full_calls:>14}")
+    print(f"{'parçalar':<12} {phrase_wall / count * 1000:>9.1f} {phrase_cpu / count * 1000:>13.1f} {tts.calls:>14}")
+
+
+if __name__ == '__main__':
+    main()
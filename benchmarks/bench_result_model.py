@@ -0,0 +1,74 @@
+"""
+Sözlük tabanlı analiz çıktısı ile kompakt sonuç modelinin karşılaştırması.
+
+Sentetik raporların ayrıştırma sonuçları bir kez üretilir; ardından
+``analyze`` (iç içe sözlükler) ve ``analyze_model`` (``__slots__`` nesneleri)
+ile çok sayıda rapor analiz edilip bellekte tutulur. Her yöntem için
+saniyedeki sonuç sayısı, tutulan bellek (tracemalloc), sonuç başına bayt,
+çöp toplayıcının izlediği nesne sayısı ve tam toplama süresi raporlanır.
+Son olarak sözlük biçimine dönüşümün kayıpsız olduğu doğrulanır.
+
+Kullanım:
+    python -m benchmarks.bench_result_model [--reports 100000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.corpus import CorpusGenerator
+from src.analyze_results import ResultAnalyzer
+from src.parse_report import ReportParser
+from src.result_model import ReportAnalysis
+
+
+def measure(analyze, inputs, count: int):
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    start = time.perf_counter()
+    retained = [analyze(*inputs[index % len(inputs)]) for index in range(count)]
+    elapsed = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracked = len(gc.get_objects()) - objects_before
+    start = time.perf_counter()
+    gc.collect()
+    gc_ms = (time.perf_counter() - start) * 1000
+    return retained, elapsed, memory, tracked, gc_ms
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--reports', type=int, default=100000)
+    arg_parser.add_argument('--distinct', type=int, default=200)
+    arg_parser.add_argument('--seed', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    parser, analyzer = ReportParser(), ResultAnalyzer()
+    generator = CorpusGenerator(args.seed)
+    inputs = [(parser.find_test_results(report.text), report.gender)
+              for report in generator.corpus(args.distinct)]
+    results_per_pass = sum(len(results) for results, _ in inputs)
+    result_count = round(results_per_pass * args.reports / len(inputs))
+
+    print(f"{args.reports} rapor, {result_count} sonuç")
+    print(f"{'yapı':<12}{'sonuç/sn':>12}{'bellek MB':>12}{'bayt/sonuç':>12}"
+          f"{'GC nesnesi':>12}{'GC ms':>10}")
+    retained = {}
+    for name, analyze in (('sözlük', analyzer.analyze), ('model', analyzer.analyze_model)):
+        retained[name], elapsed, memory, tracked, gc_ms = measure(analyze, inputs, args.reports)
+        print(f"{name:<12}{result_count / elapsed:>12,.0f}{memory / 1024 / 1024:>12.1f}"
+              f"{memory / result_count:>12.0f}{tracked:>12,}{gc_ms:>10.1f}")
+        retained[name] = retained[name][:len(inputs)]
+
+    start = time.perf_counter()
+    converted = [model.to_dict() for model in retained['model']]
+    to_dict_rate = results_per_pass / (time.perf_counter() - start)
+    lossless = (converted == retained['sözlük'] and
+                all(ReportAnalysis.from_dict(d).to_dict() == d for d in retained['sözlük']))
+    print(f"to_dict: {to_dict_rate:,.0f} sonuç/sn, kayıpsız dönüşüm: {'evet' if lossless else 'HAYIR'}")
+
+
+if __name__ == '__main__':
+    main()
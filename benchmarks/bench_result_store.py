@@ -0,0 +1,84 @@
+"""
+Sonuç deposunun toplu ekleme ve geçmiş sorgusu ölçümü.
+
+Geçici bir SQLite dosyasına hasta x tarih x test boyunca milyonlarca sonuç
+eklenir; ardından rastgele hastalar için tek testin geçmişi, tüm geçmiş,
+son değerler ve önceki sonuca göre değişim sorgularının gecikmesi ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_result_store [--patients 20000] [--visits 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from src.analyze_results import ResultAnalyzer
+from src.result_store import ResultStore, to_epoch
+
+
+def generate_rows(analyzer: ResultAnalyzer, patients: int, visits: int, seed: int):
+    rng = random.Random(seed)
+    ranges = {name: analyzer.resolve_range(name) for name in analyzer.reference_ranges}
+    start = date(2020, 1, 1)
+    for patient in range(patients):
+        patient_id = f'P{patient:07d}'
+        day = start + timedelta(days=rng.randint(0, 365))
+        for _ in range(visits):
+            taken_at = to_epoch(day)
+            for test_name, (min_val, max_val, unit) in ranges.items():
+                value = round(rng.uniform(min_val * 0.7, max_val * 1.3 + 1), 1)
+                status = 'low' if value < min_val else 'high' if value > max_val else 'normal'
+                yield patient_id, test_name, taken_at, value, unit, status, None
+            day += timedelta(days=rng.randint(20, 120))
+
+
+def time_queries(func, patient_ids):
+    samples = []
+    for patient_id in patient_ids:
+        start = time.perf_counter()
+        func(patient_id)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.99)] * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--patients', type=int, default=20000)
+    arg_parser.add_argument('--visits', type=int, default=5)
+    arg_parser.add_argument('--queries', type=int, default=2000)
+    arg_parser.add_argument('--seed', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    analyzer = ResultAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results.sqlite3')
+        with ResultStore(path) as store:
+            start = time.perf_counter()
+            inserted = store.bulk_insert(generate_rows(analyzer, args.patients, args.visits, args.seed))
+            elapsed = time.perf_counter() - start
+            size_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"ekleme: {inserted} sonuç, {elapsed:.1f} sn, {inserted / elapsed:,.0f} satır/sn, "
+                  f"dosya {size_mb:.0f} MB")
+
+            rng = random.Random(args.seed + 1)
+            patient_ids = [f'P{rng.randrange(args.patients):07d}' for _ in range(args.queries)]
+            analyses = {'analyses': {'hemoglobin': {'value': 13.0}, 'glucose': {'value': 95.0}}}
+            queries = {
+                'tek test geçmişi': lambda pid: store.history(pid, 'hemoglobin'),
+                'tüm geçmiş': lambda pid: store.history(pid),
+                'son değerler': lambda pid: store.latest(pid),
+                'önceki sonuca göre değişim': lambda pid: store.deltas(pid, analyses, '2030-01-01'),
+                'eğilim': lambda pid: store.trend(pid, 'glucose'),
+            }
+            print(f"{'sorgu':<30}{'p50 ms':>10}{'p99 ms':>10}")
+            for name, query in queries.items():
+                p50, p99 = time_queries(query, patient_ids)
+                print(f"{name:<30}{p50:>10.3f}{p99:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
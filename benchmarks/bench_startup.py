@@ -0,0 +1,72 @@
+"""
+Kural tabanlı yolun soğuk başlangıç süresi koruması.
+
+``python -X importtime`` ile ayrıştırma, analiz, özet ve ses modüllerini
+yeni bir yorumlayıcıda içe aktarır; toplam içe aktarma süresini ve en
+yavaş modülleri raporlar. Süre bütçeyi aşarsa ya da torch/transformers
+gibi ağır kütüphaneler yüklenirse sıfırdan farklı kodla çıkar.
+
+Kullanım:
+    python -m benchmarks.bench_startup [--budget-ms 1500] [--repeat 5]
+"""
+import argparse
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+RULE_BASED_IMPORTS = (
+    'import src.parse_report, src.analyze_results, src.generate_summary, '
+    'src.text_to_speech, src.cache'
+)
+HEAVY_MODULES = ('torch', 'transformers', 'pyttsx3', 'gtts', 'numpy', 'pandas')
+
+_LINE_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def measure_once() -> Tuple[int, Dict[str, int], List[str]]:
+    """Toplam süreyi (µs), üst düzey modül sürelerini ve yüklenen modülleri döndürür."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', RULE_BASED_IMPORTS],
+        capture_output=True, text=True, check=True
+    )
+    top_level: Dict[str, int] = {}
+    loaded: List[str] = []
+    for line in completed.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(2)), match.group(3), match.group(4)
+        loaded.append(module)
+        if len(indent) == 1:
+            top_level[module] = cumulative
+    return sum(top_level.values()), top_level, loaded
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--budget-ms', type=float, default=1500.0)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    total_us, modules, loaded = min(runs, key=lambda run: run[0])
+
+    print(f"kural tabanlı içe aktarma: {total_us / 1000:.1f} ms (en iyi {args.repeat} deneme)")
+    print("en yavaş üst düzey modüller:")
+    for module, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    heavy = sorted({module.split('.')[0] for module in loaded} & set(HEAVY_MODULES))
+    failed = False
+    if heavy:
+        print(f"HATA: ağır kütüphaneler başlangıçta yüklendi: {', '.join(heavy)}")
+        failed = True
+    if total_us / 1000 > args.budget_ms:
+        print(f"HATA: başlangıç süresi bütçeyi aşıyor ({args.budget_ms:.0f} ms)")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Tüm belgeyi tek seferde okuma ile sayfa sayfa akışlı okumanın karşılaştırması.
+
+200 sayfalık sentetik bir PDF üzerinde her mod ayrı bir süreçte çalıştırılır;
+ilk sonuca kadar geçen süre, toplam süre ve en yüksek bellek (RSS) raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_streaming [--pages 200]
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic_pdf import build_pdf
+
+
+RESULT_LINES = [
+    'Hemoglobin 14.2 g/dL 12.0-16.0',
+    'Hematokrit 42.1 % 36-46',
+    'WBC 7.3 x10^9/L 4.0-10.0',
+    'RBC 4.9 x10^12/L 4.5-5.5',
+    'PLT 250 x10^9/L 150-400',
+    'Glucose 96 mg/dL 70-100',
+    'Cholesterol 180 mg/dL 0-200',
+    'Triglyceride 120 mg/dL 0-150',
+    'Creatinine 0.9 mg/dL 0.6-1.2',
+    'Alanin Aminotransferaz 25 U/L 0-41',
+    'Aspartat Aminotransferaz 22 U/L 0-40',
+]
+
+NOISE_LINES = [
+    'Numune Kabul Tarihi: 12.03.2024 08:15',
+    'Yontem: Spektrofotometrik',
+    'Bu rapor elektronik olarak onaylanmistir.',
+    'Biyokimya Laboratuvari - Uzman Onayi',
+]
+
+
+def build_report(page_count: int, seed: int = 7) -> bytes:
+    """İlk sayfalarda tüm testleri, kalan sayfalarda gürültü içeren rapor üretir."""
+    rng = random.Random(seed)
+    pages = []
+    for page_number in range(page_count):
+        lines = [f'Sayfa {page_number + 1} / {page_count}']
+        lines += [rng.choice(NOISE_LINES) for _ in range(55)]
+        if page_number < 2:
+            lines[5:5] = RESULT_LINES[page_number::2]
+        pages.append(lines)
+    return build_pdf(pages)
+
+
+def run_mode(mode: str, pdf_path: str) -> dict:
+    from src.parse_report import ReportParser
+
+    parser = ReportParser()
+    start = time.perf_counter()
+    first = None
+    if mode == 'full':
+        results = parser.parse(pdf_path)['results']
+        first = time.perf_counter() - start
+    else:
+        results = {}
+        for partial in parser.iter_parse(pdf_path, stop_when_complete=(mode == 'stream-early')):
+            if first is None and partial['page_results']:
+                first = time.perf_counter() - start
+            results = partial['results']
+    total = time.perf_counter() - start
+    # Linux'ta ru_maxrss KiB cinsindendir
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'mode': mode,
+        'first_result_s': first,
+        'total_s': total,
+        'peak_rss_mib': peak_kib / 1024,
+        'tests_found': len(results),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--pages', type=int, default=200)
+    arg_parser.add_argument('--mode', help=argparse.SUPPRESS)
+    arg_parser.add_argument('--pdf', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.pdf)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / 'synthetic_report.pdf'
+        pdf_path.write_bytes(build_report(args.pages))
+
+        print(f"{'mod':<13} {'ilk sonuç (s)':>14} {'toplam (s)':>11} {'tepe RSS (MiB)':>15} {'test':>5}")
+        for mode in ('full', 'stream', 'stream-early'):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_streaming',
+                 '--mode', mode, '--pdf', str(pdf_path)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            row = json.loads(output.strip().splitlines()[-1])
+            print(f"{row['mode']:<13} {row['first_result_s']:>14.3f} {row['total_s']:>11.3f} "
+                  f"{row['peak_rss_mib']:>15.1f} {row['tests_found']:>5}")
+
+
+if __name__ == '__main__':
+    main()
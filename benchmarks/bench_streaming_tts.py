@@ -0,0 +1,73 @@
+"""
+Cümle parçalı akışlı sentez ile tüm metni tek seferde sentezlemenin karşılaştırması.
+
+Varsayılan olarak ağ gerektirmeyen, gecikmesi metin uzunluğuyla artan
+benzetimli bir çevrimiçi motor kullanılır (sabit istek gecikmesi +
+karakter başına süre). ``--engine gtts`` ile gerçek gTTS ölçülebilir.
+İlk sese kadar geçen süre (TTFA) ve toplam sentez süresi raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_streaming_tts [--engine simulated|gtts] [--workers 4]
+"""
+import argparse
+import time
+
+from src.analyze_results import ResultAnalyzer
+from src.generate_summary import SummaryGenerator
+from src.text_to_speech import TextToSpeech, split_into_chunks
+
+
+class SimulatedOnlineTTS(TextToSpeech):
+    """Ağ gecikmesini taklit eden, gTTS gibi eşzamanlı çağrılabilen motor."""
+
+    def __init__(self, request_latency: float = 0.15, per_char: float = 0.002):
+        super().__init__(engine='gtts')
+        self.request_latency = request_latency
+        self.per_char = per_char
+
+    def get_audio_bytes(self, text: str) -> bytes:
+        time.sleep(self.request_latency + self.per_char * len(text))
+        return text.encode('utf-8')
+
+
+def build_audio_text() -> str:
+    """Birden fazla anormal sonuç içeren uzun bir özet metni."""
+    analyzer = ResultAnalyzer()
+    results = {
+        'hemoglobin': {'value': 10.1}, 'hematocrit': {'value': 31.0}, 'wbc': {'value': 12.4},
+        'rbc': {'value': 3.6}, 'platelet': {'value': 480}, 'glucose': {'value': 132},
+        'cholesterol': {'value': 245}, 'triglyceride': {'value': 210},
+        'creatinine': {'value': 1.6}, 'alt': {'value': 58}, 'ast': {'value': 22},
+    }
+    analyses = analyzer.analyze(results, 'Kadın')
+    return SummaryGenerator().generate(analyses)['audio_text']
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--engine', choices=['simulated', 'gtts'], default='simulated')
+    arg_parser.add_argument('--workers', type=int, default=4)
+    args = arg_parser.parse_args()
+
+    tts = SimulatedOnlineTTS() if args.engine == 'simulated' else TextToSpeech(engine='gtts')
+    text = build_audio_text()
+    print(f"metin: {len(text)} karakter, {len(split_into_chunks(text))} parça")
+
+    start = time.perf_counter()
+    tts.get_audio_bytes(text)
+    whole = time.perf_counter() - start
+
+    start = time.perf_counter()
+    first = None
+    for _ in tts.iter_audio_chunks(text, max_workers=args.workers):
+        if first is None:
+            first = time.perf_counter() - start
+    streamed = time.perf_counter() - start
+
+    print(f"{'yöntem':<22} {'TTFA (s)':>9} {'toplam (s)':>11}")
+    print(f"{'tüm metin':<22} {whole:>9.2f} {whole:>11.2f}")
+    print(f"{f'akışlı ({args.workers} işçi)':<22} {first:>9.2f} {streamed:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
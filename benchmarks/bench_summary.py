@@ -0,0 +1,68 @@
+"""
+Özet üretiminin saniyedeki rapor sayısı ölçümü.
+
+Sentetik raporların analizleri bir kez hazırlanır; ardından tüm çıktılar,
+yalnızca sesli özet metni ve önceki sonuçlarla karşılaştırmalı özet için
+``SummaryGenerator.generate`` hem analiz sözlüğü hem ``ReportAnalysis``
+modeliyle ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_summary [--reports 2000] [--min-time 1.0]
+"""
+import argparse
+import time
+
+from benchmarks.corpus import CorpusGenerator
+from src.analyze_results import ResultAnalyzer
+from src.generate_summary import SummaryGenerator
+from src.parse_report import ReportParser
+
+
+def reports_per_second(func, items, min_time: float) -> float:
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for item in items:
+            func(item)
+        count += len(items)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return count / elapsed
+
+
+def trend_deltas(analysis):
+    # Her test için önceki bir sonuç varmış gibi değişim üretir
+    return {test_name: {'previous_value': data['value'],
+                        'previous_at': '2024-01-15', 'previous_status': 'normal',
+                        'delta': 1.5, 'unit': data.get('unit', '')}
+            for test_name, data in analysis['analyses'].items()}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--reports', type=int, default=2000)
+    arg_parser.add_argument('--min-time', type=float, default=1.0)
+    arg_parser.add_argument('--seed', type=int, default=8)
+    args = arg_parser.parse_args()
+
+    parser, analyzer, generator = ReportParser(), ResultAnalyzer(), SummaryGenerator()
+    parsed = [(parser.find_test_results(report.text), report.gender)
+              for report in CorpusGenerator(args.seed).corpus(args.reports)]
+    dicts = [analyzer.analyze(results, gender) for results, gender in parsed]
+    models = [analyzer.analyze_model(results, gender) for results, gender in parsed]
+    with_deltas = [(analysis, trend_deltas(analysis)) for analysis in dicts]
+
+    cases = {
+        'tüm çıktılar (sözlük)': (dicts, generator.generate),
+        'tüm çıktılar (model)': (models, generator.generate),
+        'yalnızca ses metni (sözlük)': (dicts, lambda a: generator.generate(a, outputs=('audio_text',))),
+        'yalnızca ses metni (model)': (models, lambda a: generator.generate(a, outputs=('audio_text',))),
+        'karşılaştırmalı (sözlük)': (with_deltas, lambda item: generator.generate(item[0], deltas=item[1])),
+    }
+    print(f"{'durum':<32}{'rapor/sn':>12}")
+    for name, (items, func) in cases.items():
+        print(f"{name:<32}{reports_per_second(func, items, args.min_time):>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
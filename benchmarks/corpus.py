@@ -0,0 +1,236 @@
+"""
+Ölçümler için deterministik, sentetik laboratuvar raporu üretici.
+
+Test adları ayrıştırıcının kalıplarından (Türkçe ve İngilizce eş adlar),
+değerler referans aralıklarından türetilir. Sayfa sayısı, test sayısı,
+gürültü satırı oranı, ondalık ayırıcı ve birim yazımı çeşitlendirilir;
+her rapor beklenen sonuçlarıyla birlikte üretildiğinden doğruluk da
+ölçülebilir. Aynı tohum her zaman aynı külliyatı verir. ``tabular`` açıkken
+test satırları sütunları farklı sıralarda dizilmiş bir tablo olarak yazılır.
+
+Kullanım:
+    python -m benchmarks.corpus --out data/sample_reports [--count 10]
+"""
+import argparse
+import random
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from benchmarks.synthetic_pdf import Line, build_image_pdf, build_pdf, pdf_safe
+from src.analyze_results import ResultAnalyzer
+from src.layout_parse import normalize_unit
+from src.parse_report import ReportParser
+
+
+NOISE_LINES = {
+    'tr': [
+        'Numune Kabul Tarihi: {date} 08:15',
+        'Protokol No: {number}',
+        'Yöntem: Spektrofotometrik',
+        'Bu rapor elektronik olarak onaylanmıştır.',
+        'Biyokimya Laboratuvarı - Uzman Onayı',
+        'Hasta Adı Soyadı: Deneme Hasta',
+        'Doğum Tarihi: {date}',
+    ],
+    'en': [
+        'Sample Received: {date} 08:15',
+        'Accession No: {number}',
+        'Method: Spectrophotometric',
+        'This report has been electronically validated.',
+        'Clinical Chemistry Laboratory - Reviewed by',
+        'Patient Name: Test Patient',
+        'Date of Birth: {date}',
+    ],
+}
+
+HEADERS = {
+    'tr': ['Test Adı', 'Sonuç', 'Birim', 'Referans Aralığı'],
+    'en': ['Test', 'Result', 'Unit', 'Reference Range'],
+}
+
+# Tablo modunda sütun sıraları ve sütunların yatay konumları (pt)
+TABLE_COLUMNS = (
+    ('name', 'value', 'unit', 'ref'),
+    ('name', 'ref', 'value', 'unit'),
+    ('name', 'unit', 'value', 'ref'),
+    ('name', 'value', 'flag', 'unit', 'ref'),
+)
+TABLE_HEADERS = {
+    'tr': {'name': 'Test Adı', 'value': 'Sonuç', 'unit': 'Birim', 'ref': 'Referans Aralığı',
+           'flag': 'Durum'},
+    'en': {'name': 'Test', 'value': 'Result', 'unit': 'Unit', 'ref': 'Reference Range',
+           'flag': 'Flag'},
+}
+COLUMN_X = (40, 210, 300, 390, 480)
+
+# Aynı birimin raporlarda görülen farklı yazımları
+UNIT_VARIANTS = {
+    'g/dL': ['g/dL', 'g/dl', 'gr/dL'],
+    'mg/dL': ['mg/dL', 'mg/dl'],
+    'U/L': ['U/L', 'IU/L', 'u/L'],
+    '%': ['%', '% '],
+    '10^9/L': ['x10^9/L', '10^9/L', 'K/uL'],
+    '10^12/L': ['x10^12/L', '10^12/L', 'M/uL'],
+}
+
+LAYOUTS = (
+    '{name} {value} {unit} {ref}',
+    '{name}: {value} {unit} ({ref})',
+    '{name} ........ {value} {unit}   {ref}',
+    '{name}\t{value}\t{unit}\t{ref}',
+)
+
+
+class SyntheticReport:
+    """Sayfa satırları ve beklenen test değerleriyle tek bir sentetik rapor."""
+
+    def __init__(self, pages: List[List[Line]], expected: Dict[str, float],
+                 language: str, gender: Optional[str],
+                 expected_units: Optional[Dict[str, str]] = None):
+        self.pages = pages
+        self.expected = expected
+        self.expected_units = expected_units or {}
+        self.language = language
+        self.gender = gender
+
+    @property
+    def text(self) -> str:
+        """Raporun düz metin hali (PDF'ten okunmuş metne denk)."""
+        return '\n'.join(
+            '\n'.join(line if isinstance(line, str) else ' '.join(text for _, text in line)
+                      for line in page)
+            for page in self.pages
+        )
+
+    @property
+    def line_count(self) -> int:
+        return sum(len(page) for page in self.pages)
+
+    def pdf_bytes(self) -> bytes:
+        return build_pdf(self.pages)
+
+    def scanned_pdf_bytes(self, dpi: int = 150) -> bytes:
+        """Raporun metin katmanı olmayan, taranmış belge benzeri PDF hali."""
+        return build_image_pdf(self.pages, dpi)
+
+
+class CorpusGenerator:
+    """Tohumlanmış rastgele üreteçle sentetik raporlar üretir."""
+
+    def __init__(self, seed: int = 42, pdf_safe_names: bool = False):
+        """
+        Args:
+            seed: Rastgele üreteç tohumu
+            pdf_safe_names: Yalnızca PDF'e yazılınca değişmeyen eş adları kullanır
+                (Helvetica/WinAnsi'de bulunmayan harfler dönüştürülür)
+        """
+        self.rng = random.Random(seed)
+        self.analyzer = ResultAnalyzer()
+        self.aliases = {}
+        for test_name, pattern in ReportParser().test_patterns.items():
+            names = pattern.split('|')
+            if pdf_safe_names:
+                names = [name for name in names if pdf_safe(name) == name] or names
+            self.aliases[test_name] = names
+        self.test_names = [name for name in self.aliases if name in self.analyzer.reference_ranges]
+
+    def _value_fields(self, test_name: str, language: str, gender: Optional[str]) -> Dict:
+        min_val, max_val, unit = self.analyzer.resolve_range(test_name, gender)
+        spread = (max_val - min_val) or max_val or 1.0
+        value = round(self.rng.uniform(max(0.0, min_val - spread * 0.4), max_val + spread * 0.4), 1)
+        decimal = ',' if language == 'tr' and self.rng.random() < 0.5 else '.'
+        unit_key = unit.replace('x', '', 1) if unit.startswith('x') else unit
+        flag = 'H' if value > max_val else 'L' if value < min_val else ''
+        return {
+            'value': str(value).replace('.', decimal),
+            'unit': self.rng.choice(UNIT_VARIANTS.get(unit_key, [unit])),
+            'ref': f'{min_val:g}-{max_val:g}'.replace('.', decimal),
+            'flag': flag,
+            'number': value,
+        }
+
+    def _value_line(self, test_name: str, language: str, gender: Optional[str]) -> tuple:
+        fields = self._value_fields(test_name, language, gender)
+        layout = self.rng.choice(LAYOUTS)
+        fields['name'] = self.rng.choice(self.aliases[test_name])
+        return layout.format(**fields), fields
+
+    def _table_row(self, test_name: str, language: str, gender: Optional[str],
+                   columns: tuple) -> tuple:
+        fields = self._value_fields(test_name, language, gender)
+        fields['name'] = self.rng.choice(self.aliases[test_name])
+        row = [(x, fields[column]) for x, column in zip(COLUMN_X, columns) if fields[column].strip()]
+        return row, fields
+
+    def report(self, pages: int = 1, analytes: Optional[int] = None,
+               noise_per_page: int = 20, language: Optional[str] = None,
+               tabular: bool = False) -> SyntheticReport:
+        """Tek bir rapor üretir; test satırları sayfalara rastgele dağıtılır.
+
+        ``tabular`` açıksa test satırları ilk sayfadaki başlığın altında,
+        rastgele seçilen sütun sırasıyla hizalanmış bir tablo olarak yazılır.
+        """
+        language = language or self.rng.choice(['tr', 'en'])
+        gender = self.rng.choice(['Erkek', 'Kadın', None])
+        count = analytes if analytes is not None else self.rng.randint(3, len(self.test_names))
+        chosen = self.rng.sample(self.test_names, min(count, len(self.test_names)))
+
+        page_lines = []
+        for page_number in range(pages):
+            lines = [f'{"Sayfa" if language == "tr" else "Page"} {page_number + 1} / {pages}']
+            for _ in range(noise_per_page):
+                lines.append(self.rng.choice(NOISE_LINES[language]).format(
+                    date=f'{self.rng.randint(1, 28):02d}.{self.rng.randint(1, 12):02d}.2024',
+                    number=self.rng.randint(100000, 999999),
+                ))
+            page_lines.append(lines)
+
+        expected, expected_units = {}, {}
+        if tabular:
+            columns = self.rng.choice(TABLE_COLUMNS)
+            header = [(x, TABLE_HEADERS[language][column]) for x, column in zip(COLUMN_X, columns)]
+            rows: List[Line] = [header]
+            for test_name in chosen:
+                row, fields = self._table_row(test_name, language, gender, columns)
+                rows.append(row)
+                expected[test_name] = fields['number']
+                expected_units[test_name] = normalize_unit(fields['unit'])
+            page_lines[0][1:1] = rows
+        else:
+            page_lines[0].insert(min(3, len(page_lines[0])), '   '.join(HEADERS[language]))
+            for test_name in chosen:
+                line, fields = self._value_line(test_name, language, gender)
+                lines = self.rng.choice(page_lines)
+                lines.insert(self.rng.randint(1, len(lines)), line)
+                expected[test_name] = fields['number']
+                expected_units[test_name] = normalize_unit(fields['unit'])
+        return SyntheticReport(page_lines, expected, language, gender, expected_units)
+
+    def corpus(self, count: int, **kwargs) -> Iterator[SyntheticReport]:
+        """Aynı parametrelerle ``count`` rapor üretir."""
+        for _ in range(count):
+            yield self.report(**kwargs)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--out', default='data/sample_reports', help='Çıktı dizini')
+    arg_parser.add_argument('--count', type=int, default=10)
+    arg_parser.add_argument('--max-pages', type=int, default=3)
+    arg_parser.add_argument('--seed', type=int, default=42)
+    arg_parser.add_argument('--tabular', action='store_true', help='Sonuçları tablo olarak yaz')
+    args = arg_parser.parse_args()
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    generator = CorpusGenerator(args.seed, pdf_safe_names=True)
+    for index in range(args.count):
+        report = generator.report(pages=generator.rng.randint(1, args.max_pages),
+                                  tabular=args.tabular)
+        path = out_dir / f'synthetic_{index + 1:03d}_{report.language}.pdf'
+        path.write_bytes(report.pdf_bytes())
+        print(f'{path}  ({len(report.pages)} sayfa, {len(report.expected)} test)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+HTTP servisine (src.api) karşı yük testi.
+
+Sentetik PDF raporlarını (bkz. corpus) sabit eşzamanlılıkla belirtilen
+uç noktaya gönderir; p50/p90/p99 gecikme, saniyedeki istek sayısı ve hata
+dağılımını raporlar. Servisin ayrıca başlatılmış olması gerekir:
+
+    uvicorn src.api:app --port 8000 --workers 1
+
+Kullanım:
+    python -m benchmarks.load_test [--url http://127.0.0.1:8000]
+        [--endpoint report-to-audio] [--concurrency 16] [--requests 500]
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import List, Tuple
+
+import aiohttp
+
+from benchmarks.corpus import CorpusGenerator
+
+
+def build_payloads(endpoint: str, count: int, seed: int) -> List[Tuple[str, bytes, str]]:
+    """Uç noktaya göre (içerik türü, gövde, sorgu) üçlülerini üretir."""
+    generator = CorpusGenerator(seed, pdf_safe_names=True)
+    payloads = []
+    for _ in range(count):
+        report = generator.report(pages=generator.rng.randint(1, 3))
+        gender = report.gender or ''
+        if endpoint in ('parse', 'report-to-audio'):
+            query = f'?gender={gender}' if gender and endpoint == 'report-to-audio' else ''
+            payloads.append(('application/pdf', report.pdf_bytes(), query))
+        elif endpoint == 'analyze':
+            results = {name: {'value': value} for name, value in report.expected.items()}
+            body = {'results': results, 'gender': report.gender}
+            payloads.append(('application/json', json.dumps(body).encode('utf-8'), ''))
+        else:
+            raise ValueError(f'Desteklenmeyen uç nokta: {endpoint}')
+    return payloads
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(url: str, endpoint: str, payloads, total: int, concurrency: int):
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    received = 0
+    counter = iter(range(total))
+
+    async def worker(session: aiohttp.ClientSession):
+        nonlocal received
+        for index in counter:
+            content_type, body, query = payloads[index % len(payloads)]
+            start = time.perf_counter()
+            try:
+                async with session.post(f'{url}/{endpoint}{query}', data=body,
+                                        headers={'Content-Type': content_type}) as response:
+                    # Akışlı ses yanıtı tamamen okunana kadar süre sayılır
+                    async for block in response.content.iter_any():
+                        received += len(block)
+                    statuses[response.status] += 1
+            except aiohttp.ClientError as e:
+                statuses[type(e).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, statuses, received, elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--url', default='http://127.0.0.1:8000')
+    arg_parser.add_argument('--endpoint', default='report-to-audio',
+                            choices=['report-to-audio', 'parse', 'analyze'])
+    arg_parser.add_argument('--concurrency', type=int, default=16)
+    arg_parser.add_argument('--requests', type=int, default=500)
+    arg_parser.add_argument('--distinct', type=int, default=50,
+                            help='Farklı rapor sayısı (küçükse önbellek isabeti artar)')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    args = arg_parser.parse_args()
+
+    payloads = build_payloads(args.endpoint, args.distinct, args.seed)
+    latencies, statuses, received, elapsed = asyncio.run(
+        run_load(args.url.rstrip('/'), args.endpoint, payloads, args.requests, args.concurrency)
+    )
+
+    print(f"uç nokta: /{args.endpoint}  eşzamanlılık: {args.concurrency}  "
+          f"istek: {args.requests}  farklı rapor: {args.distinct}")
+    print(f"durumlar: {dict(statuses)}")
+    if latencies:
+        print(f"istek/sn: {len(latencies) / elapsed:.1f}  alınan: {received / 1024:.0f} KB")
+        print(f"gecikme ms  p50: {percentile(latencies, 0.50) * 1000:.1f}  "
+              f"p90: {percentile(latencies, 0.90) * 1000:.1f}  "
+              f"p99: {percentile(latencies, 0.99) * 1000:.1f}  "
+              f"en fazla: {max(latencies) * 1000:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+Uçtan uca ve aşama bazlı performans ölçüm takımı.
+
+Sentetik külliyat (bkz. corpus) üzerinde her aşama ayrı ayrı ölçülür:
+test sonucu bulma, aralık kontrolü, analiz, özet üretimi, boş motorla
+ses sentezi ve PDF'ten sese tam akış. Sonuçlar işlem/sn, ortalama ve
+p95 gecikme olarak yazdırılır ve commit bilgisiyle birlikte JSON'a
+kaydedilir; ``--compare`` önceki bir JSON'la karşılaştırır ve eşiği aşan
+gerilemede sıfırdan farklı kodla çıkar.
+
+Kullanım:
+    python -m benchmarks.run_suite [--reports 200] [--json sonuc.json]
+    python -m benchmarks.run_suite --compare onceki.json [--threshold 0.15]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmarks.corpus import CorpusGenerator, SyntheticReport
+from src.analyze_results import ResultAnalyzer
+from src.generate_summary import SummaryGenerator
+from src.parse_report import ReportParser
+from src.text_to_speech import TextToSpeech
+
+_EMPTY_WAV = (b'RIFF$\x00\x00\x00WAVEfmt \x10\x00\x00\x00\x01\x00\x01\x00'
+              b'@\x1f\x00\x00\x80>\x00\x00\x02\x00\x10\x00data\x00\x00\x00\x00')
+
+
+class _NullEngine:
+    """pyttsx3 arayüzünü taklit eden, boş WAV yazan motor."""
+
+    def __init__(self):
+        self.pending: List[str] = []
+
+    def save_to_file(self, text: str, path: str):
+        self.pending.append(path)
+
+    def runAndWait(self):
+        for path in self.pending:
+            with open(path, 'wb') as output:
+                output.write(_EMPTY_WAV)
+        self.pending.clear()
+
+
+class NullTTS(TextToSpeech):
+    """Sentez maliyeti olmayan motor; yalnızca TextToSpeech katmanını ölçer."""
+
+    def __init__(self):
+        super().__init__(engine='null')
+        self.engine_type = 'pyttsx3'
+        self.engine = _NullEngine()
+
+
+def _percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(items: Sequence, func: Callable, min_time: float) -> Dict:
+    """``func``'ı öğeler üzerinde en az ``min_time`` saniye döngüyle çalıştırır."""
+    samples: List[float] = []
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    while True:
+        for item in items:
+            item_start = time.perf_counter()
+            func(item)
+            samples.append(time.perf_counter() - item_start)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    return {
+        'ops': len(samples),
+        'ops_per_s': round(len(samples) / elapsed, 1),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 4),
+        'p50_ms': round(_percentile(samples, 0.50) * 1000, 4),
+        'p95_ms': round(_percentile(samples, 0.95) * 1000, 4),
+        'cpu_s': round(time.process_time() - cpu_start, 3),
+    }
+
+
+def accuracy(parser: ReportParser, reports: Sequence[SyntheticReport],
+             texts: Optional[Sequence[str]] = None) -> float:
+    """Beklenen test değerlerinin doğru bulunma oranı."""
+    found = total = 0
+    for index, report in enumerate(reports):
+        text = texts[index] if texts is not None else report.text
+        results = parser.find_test_results(text)
+        for test_name, value in report.expected.items():
+            total += 1
+            if results.get(test_name, {}).get('value') == value:
+                found += 1
+    return round(found / total, 4) if total else 1.0
+
+
+def git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                   capture_output=True, text=True, check=True)
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(report_count: int, pdf_count: int, min_time: float, seed: int) -> Dict:
+    generator = CorpusGenerator(seed, pdf_safe_names=True)
+    reports = [generator.report(pages=generator.rng.randint(1, 4)) for _ in range(report_count)]
+    texts = [report.text for report in reports]
+    pdfs = [report.pdf_bytes() for report in reports[:pdf_count]]
+
+    parser = ReportParser()
+    analyzer = ResultAnalyzer()
+    summary_generator = SummaryGenerator(use_nlp=False)
+    tts = NullTTS()
+
+    parsed = [parser.find_test_results(text) for text in texts]
+    checks = [(name, result['value'], report.gender)
+              for report, results in zip(reports, parsed) for name, result in results.items()]
+    analyzed = [analyzer.analyze(results, report.gender) for report, results in zip(reports, parsed)]
+    summaries = [summary_generator.generate(analysis)['audio_text'] for analysis in analyzed]
+
+    def pipeline(index: int):
+        report = reports[index]
+        parse_result = parser.parse(pdfs[index])
+        analysis = analyzer.analyze(parse_result['results'], report.gender)
+        summary = summary_generator.generate(analysis)
+        tts.get_audio_bytes(summary['audio_text'])
+
+    stages = {
+        'find_test_results': (texts, parser.find_test_results),
+        'check_range': (checks, lambda args: analyzer.check_range(*args)),
+        'analyze': (list(zip(parsed, reports)), lambda item: analyzer.analyze(item[0], item[1].gender)),
+        'generate': (analyzed, summary_generator.generate),
+        'tts_null': (summaries, tts.get_audio_bytes),
+        'pdf_extract': (pdfs, parser.extract_text_from_pdf),
+        'pipeline': (list(range(len(pdfs))), pipeline),
+    }
+    results = {}
+    for name, (items, func) in stages.items():
+        results[name] = measure(items, func, min_time)
+
+    pdf_texts = [parser.extract_text_from_pdf(pdf) for pdf in pdfs]
+    corpus_info = {
+        'reports': report_count,
+        'pdfs': len(pdfs),
+        'lines': sum(report.line_count for report in reports),
+        'analytes': sum(len(report.expected) for report in reports),
+        'text_accuracy': accuracy(parser, reports),
+        'pdf_accuracy': accuracy(parser, reports[:pdf_count], pdf_texts),
+    }
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'min_time_s': min_time,
+        },
+        'corpus': corpus_info,
+        'results': results,
+    }
+
+
+def print_results(data: Dict):
+    print(f"Commit: {data['meta']['commit']}  Python {data['meta']['python']}")
+    corpus = data['corpus']
+    print(f"Külliyat: {corpus['reports']} rapor, {corpus['pdfs']} PDF, {corpus['lines']} satır, "
+          f"{corpus['analytes']} test; doğruluk metin {corpus['text_accuracy']:.1%}, "
+          f"PDF {corpus['pdf_accuracy']:.1%}")
+    print(f"{'Aşama':<20}{'işlem/sn':>12}{'ort. ms':>12}{'p50 ms':>12}{'p95 ms':>12}")
+    for name, stats in data['results'].items():
+        print(f"{name:<20}{stats['ops_per_s']:>12.1f}{stats['mean_ms']:>12.4f}"
+              f"{stats['p50_ms']:>12.4f}{stats['p95_ms']:>12.4f}")
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """İşlem/sn'si eşikten fazla düşen aşamaları döndürür."""
+    regressions = []
+    print(f"\nKarşılaştırma: {baseline['meta'].get('commit')} -> {current['meta'].get('commit')}")
+    for name, stats in current['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if not old:
+            print(f"{name:<20}{'(yeni)':>12}")
+            continue
+        ratio = stats['ops_per_s'] / old['ops_per_s'] if old['ops_per_s'] else float('inf')
+        flag = ''
+        if ratio < 1 - threshold:
+            flag = '  GERİLEME'
+            regressions.append(name)
+        print(f"{name:<20}{ratio:>11.2f}x{flag}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--reports', type=int, default=200, help='Metin külliyatı boyutu')
+    arg_parser.add_argument('--pdfs', type=int, default=20, help='PDF aşamaları için rapor sayısı')
+    arg_parser.add_argument('--min-time', type=float, default=1.0, help='Aşama başına en az süre (sn)')
+    arg_parser.add_argument('--seed', type=int, default=42)
+    arg_parser.add_argument('--json', help='Sonuçların yazılacağı JSON dosyası')
+    arg_parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON dosyası')
+    arg_parser.add_argument('--threshold', type=float, default=0.15,
+                            help='Gerileme sayılacak işlem/sn düşüş oranı')
+    args = arg_parser.parse_args()
+
+    data = run_suite(args.reports, min(args.pdfs, args.reports), args.min_time, args.seed)
+    print_results(data)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as output:
+            json.dump(data, output, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as source:
+            regressions = compare(data, json.load(source), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
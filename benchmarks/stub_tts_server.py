@@ -0,0 +1,77 @@
+"""
+Google Translate TTS uç noktasını taklit eden yerel HTTP sunucusu.
+
+Ağ gerektirmeyen ölçümler ve denemeler içindir. Her istek yapay bir
+gecikmeyle yanıtlanır; ``failure_rate`` oranında 503 döner. Yanıt, gTTS
+ile aynı biçimde base64 kodlanmış sahte MP3 verisi içerir.
+
+Kullanım:
+    python -m benchmarks.stub_tts_server [--port 8765] [--latency 0.1]
+"""
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.1
+    failure_rate = 0.0
+    connections = set()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        type(self).connections.add(self.client_address)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        rpc = json.loads(urllib.parse.unquote(body.split('f.req=', 1)[1].rstrip('&')))
+        text = json.loads(rpc[0][0][1])[0]
+        audio = base64.b64encode(b'\xff\xfb' + text.encode('utf-8')).decode('ascii')
+        envelope = [['wrb.fr', 'jQ1olc', json.dumps([audio]), None, None, None, 'generic']]
+        payload = (")]}'\n\n" + json.dumps(envelope, separators=(',', ':'))).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_server(port: int = 0, latency: float = 0.1, failure_rate: float = 0.0):
+    """Sunucuyu arka planda başlatır ve (sunucu, kök URL) döndürür."""
+    handler = type('Handler', (StubTTSHandler,), {
+        'latency': latency, 'failure_rate': failure_rate, 'connections': set()
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--port', type=int, default=8765)
+    arg_parser.add_argument('--latency', type=float, default=0.1)
+    arg_parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = arg_parser.parse_args()
+    server, url = start_server(args.port, args.latency, args.failure_rate)
+    print(f"Taklit TTS sunucusu: {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Ölçümler için bağımlılıksız, minimal PDF üretici.
+
+Yalnızca standart Helvetica yazı tipiyle (WinAnsiEncoding) düz metin
+sayfaları yazar (sekmeler boşluğa açılır); pdfminer'ın metin katmanını okuyabilmesi için yeterlidir.
+Bir satır, (x, metin) hücrelerinden oluşan bir liste de olabilir; hücreler
+verilen yatay konuma yazılarak tablo sütunları oluşturulur.
+WinAnsi'de bulunmayan Türkçe harfler (ş, ğ, ı, İ) en yakın ASCII harfe
+çevrilir.
+"""
+import io
+from typing import List, Sequence, Tuple, Union
+
+# Düz metin satırı ya da (x, metin) hücreleri
+Line = Union[str, Sequence[Tuple[float, str]]]
+
+LEFT_MARGIN = 40
+
+_TRANSLITERATION = str.maketrans({'ş': 's', 'Ş': 'S', 'ğ': 'g', 'Ğ': 'G', 'ı': 'i', 'İ': 'I'})
+
+
+def pdf_safe(text: str) -> str:
+    """Metnin PDF'e yazıldıktan sonra okunacak halini döndürür."""
+    return text.translate(_TRANSLITERATION).encode('cp1252', 'replace').decode('cp1252')
+
+
+def _escape(text: str) -> bytes:
+    # Sekmeler glif değildir; pdfminer bunları (cid:9) olarak okur
+    text = pdf_safe(text).expandtabs(8).replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return text.encode('cp1252')
+
+
+def _content_stream(lines: Sequence[Line], font_size: int = 10) -> bytes:
+    leading = font_size + 2
+    ops = [f'BT /F1 {font_size} Tf'.encode('ascii')]
+    for index, line in enumerate(lines):
+        y = 800 - index * leading
+        cells = [(LEFT_MARGIN, line)] if isinstance(line, str) else line
+        for x, text in cells:
+            ops.append(b'1 0 0 1 %g %d Tm (' % (x, y) + _escape(text) + b') Tj')
+    ops.append(b'ET')
+    return b'\n'.join(ops)
+
+
+def build_pdf(pages: Sequence[Sequence[Line]]) -> bytes:
+    """Her biri satır listesi olan sayfalardan PDF baytları üretir."""
+    objects: List[bytes] = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'',  # Pages nesnesi sayfa numaraları belli olunca doldurulur
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    page_ids = []
+    for lines in pages:
+        stream = _content_stream(lines)
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id
+        )
+        page_ids.append(len(objects))
+    kids = ' '.join(f'{page_id} 0 R' for page_id in page_ids)
+    objects[1] = f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'.encode('ascii')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, xref_offset
+    )
+    return bytes(output)
+
+
+def build_image_pdf(pages: Sequence[Sequence[Line]], dpi: int = 150) -> bytes:
+    """Sayfaları görüntüye çizip metin katmanı olmayan bir PDF üretir."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    scale = dpi / 72
+    font = ImageFont.load_default(size=round(10 * scale))
+    images = []
+    for lines in pages:
+        image = Image.new('L', (round(595 * scale), round(842 * scale)), 255)
+        draw = ImageDraw.Draw(image)
+        for index, line in enumerate(lines):
+            y = (842 - 800 + index * 12 - 10) * scale
+            cells = [(LEFT_MARGIN, line)] if isinstance(line, str) else line
+            for x, text in cells:
+                draw.text((x * scale, y), text.expandtabs(8), fill=0, font=font)
+        images.append(image)
+    output = io.BytesIO()
+    images[0].save(output, format='PDF', resolution=dpi, save_all=True, append_images=images[1:])
+    return output.getvalue()
@@ -1,10 +1,18 @@
 """
 Laboratuvar sonuçlarını referans aralıklarıyla karşılaştıran analiz modülü.
 """
-import json
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple, Union
 from pathlib import Path
 
+from .locales import DEFAULT_LOCALE, get_catalog
+from .metrics import instrument
+from .reference_index import ReferenceIndex, gender_code, get_reference_source
+from .result_model import ReportAnalysis, Status, TestResult
+
+
+# Varsayılan dildeki (Türkçe) test adları; bkz. data/locales/tr.json
+TEST_NAMES_TR = get_catalog(DEFAULT_LOCALE).test_names
+
 
 class ResultAnalyzer:
     """Test sonuçlarını referans aralıklarıyla karşılaştırır ve yorumlar."""
@@ -13,29 +21,23 @@ class ResultAnalyzer:
         if reference_ranges_path is None:
             reference_ranges_path = Path(__file__).parent.parent / 'data' / 'reference_ranges.json'
         
-        self.reference_ranges = self.load_reference_ranges(reference_ranges_path)
-        self.test_names_tr = {
-            'hemoglobin': 'Hemoglobin',
-            'hematocrit': 'Hematokrit',
-            'wbc': 'Lökosit',
-            'rbc': 'Eritrosit',
-            'platelet': 'Trombosit',
-            'glucose': 'Açlık Kan Şekeri',
-            'cholesterol': 'Kolesterol',
-            'triglyceride': 'Triglisirit',
-            'creatinine': 'Kreatinin',
-            'alt': 'ALT',
-            'ast': 'AST',
-        }
+        # Aynı dosyayı kullanan analizciler derlenmiş indeksi paylaşır; analiz
+        # sözlüğündeki mesajlar varsayılan dilde, diğer diller özet aşamasında üretilir
+        self.catalog = get_catalog(DEFAULT_LOCALE)
+        self.reference_source = get_reference_source(
+            reference_ranges_path, self.catalog, self.get_default_ranges()
+        )
+        self.test_names_tr = TEST_NAMES_TR
+    
+    @property
+    def reference_index(self) -> ReferenceIndex:
+        """Güncel derlenmiş referans indeksi (dosya değişince yenilenir)."""
+        return self.reference_source.current()
     
-    def load_reference_ranges(self, path: Path) -> Dict:
-        """Referans aralıklarını yükler."""
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print(f"Uyarı: {path} bulunamadı, varsayılan aralıklar kullanılıyor.")
-            return self.get_default_ranges()
+    @property
+    def reference_ranges(self) -> Dict:
+        """Ham referans aralıkları (salt okunur)."""
+        return self.reference_source.current().raw
     
     def get_default_ranges(self) -> Dict:
         """Varsayılan referans aralıkları."""
@@ -53,55 +55,41 @@ class ResultAnalyzer:
             'ast': {'min': 0, 'max': 40, 'unit': 'U/L'},
         }
     
+    def resolve_range(self, test_name: str, gender: Optional[str] = None) -> Tuple[float, float, str]:
+        """Test ve cinsiyet için (min, max, birim) referansını döndürür."""
+        record = self.reference_index.lookup(test_name, gender)
+        if record is None:
+            raise KeyError(test_name)
+        return record.min, record.max, record.unit
+    
     def check_range(self, test_name: str, value: float, gender: Optional[str] = None) -> Dict:
         """Bir test değerinin referans aralığında olup olmadığını kontrol eder."""
-        if test_name not in self.reference_ranges:
+        record = self.reference_index.lookup(test_name, gender)
+        if record is None:
             return {
                 'status': 'unknown',
-                'message': f'{test_name} için referans aralığı bulunamadı',
+                'message': self.catalog.message(test_name, 'unknown'),
                 'is_normal': None
             }
-        
-        ref = self.reference_ranges[test_name]
-        
-        # Cinsiyet özel aralık varsa kullan
-        if ref.get('gender_specific') and gender:
-            gender_key = 'male' if gender.lower() == 'erkek' else 'female'
-            if gender_key in ref:
-                ref = ref[gender_key]
-        
-        min_val = ref.get('min', 0)
-        max_val = ref.get('max', float('inf'))
-        
-        is_normal = min_val <= value <= max_val
-        
-        if value < min_val:
-            status = 'low'
-            message = f'{self.test_names_tr.get(test_name, test_name)} değeri düşük (referans: {min_val}-{max_val} {ref.get("unit", "")})'
-        elif value > max_val:
-            status = 'high'
-            message = f'{self.test_names_tr.get(test_name, test_name)} değeri yüksek (referans: {min_val}-{max_val} {ref.get("unit", "")})'
-        else:
-            status = 'normal'
-            message = f'{self.test_names_tr.get(test_name, test_name)} değeri normal (referans: {min_val}-{max_val} {ref.get("unit", "")})'
-        
-        return {
-            'status': status,
-            'message': message,
-            'is_normal': is_normal,
-            'reference_range': f'{min_val}-{max_val} {ref.get("unit", "")}'
-        }
+        return record.check(value)
     
+    @instrument('analyze', sizes=lambda args, result: {'tests': result['summary']['total_tests'],
+                                                       'abnormal': result['summary']['abnormal_count']})
     def analyze(self, results: Dict[str, Dict], gender: Optional[str] = None) -> Dict:
         """Tüm sonuçları analiz eder ve özet oluşturur."""
         analyses = {}
         abnormal_count = 0
         normal_count = 0
+        index = self.reference_index
         
         for test_name, test_data in results.items():
             value = test_data.get('value')
             if value is not None:
-                analysis = self.check_range(test_name, value, gender)
+                record = index.lookup(test_name, gender)
+                if record is not None:
+                    analysis = record.check(value)
+                else:
+                    analysis = self.check_range(test_name, value, gender)
                 analyses[test_name] = {
                     **test_data,
                     **analysis
@@ -121,4 +109,48 @@ class ResultAnalyzer:
                 'unknown_count': len(analyses) - normal_count - abnormal_count
             }
         }
+    
+    @instrument('analyze.model', sizes=lambda args, result: {'tests': len(result),
+                                                             'abnormal': result.abnormal_count})
+    def analyze_model(self, results: Dict[str, Union[Dict, TestResult]],
+                      gender: Optional[str] = None) -> ReportAnalysis:
+        """``analyze`` ile aynı analizi kompakt modelle döndürür (bkz. result_model).
+
+        ``results`` ayrıştırma sözlükleri veya ``TestResult`` nesneleri
+        içerebilir; ``analyze_model(r).to_dict() == analyze(r)``.
+        """
+        analyses = {}
+        normal = abnormal = 0
+        lookup = self.reference_index.records.get
+        code = gender_code(gender)
+        from_parsed = TestResult.from_parsed
+        for test_name, test_data in results.items():
+            record = lookup((test_name, code))
+            if isinstance(test_data, TestResult):
+                if test_data.value is None:
+                    continue
+                result = analyses[test_name] = test_data.analyzed(record)
+            elif test_data.get('value') is not None:
+                result = analyses[test_name] = from_parsed(test_name, test_data, record)
+            else:
+                continue
+            if result.status is Status.NORMAL:
+                normal += 1
+            elif result.status is not Status.UNKNOWN:
+                abnormal += 1
+        return ReportAnalysis(analyses, normal, abnormal)
+    
+    def analyze_batch(self, data, gender=None) -> 'BatchAnalysis':
+        """Hasta x test tablosunu vektörel olarak analiz eder.
+
+        Args:
+            data: Sütunları test adları olan pandas DataFrame'i veya
+                test adı -> değer dizisi sözlüğü (eksik değerler NaN)
+            gender: Tüm hastalar için tek değer ya da hasta başına dizi;
+                None ise varsa ``gender`` sütunu kullanılır
 
+        Returns:
+            Satır ``i`` için ``patient(i)`` çıktısı, ``analyze`` ile birebir aynıdır.
+        """
+        from .batch_analysis import analyze_batch
+        return analyze_batch(self, data, gender)
@@ -0,0 +1,408 @@
+"""
+Rapor işleme hattını sunan başsız HTTP servisi (FastAPI/ASGI).
+
+Mobil ekran okuyucu uygulaması ve sesli yanıt sistemi gibi istemciler
+için ayrıştırma, analiz, özet, ses sentezi ve tek adımda rapordan sese
+uç noktaları sunar; özet ve ses istenen dilde (``locale``) üretilir.
+Ayrıştırıcı, analizci ve özet üretici süreç genelinde tek örnektir; CPU
+yoğun PDF ayrıştırma süreç havuzunda, ses sentezi ve kodlama iş parçacığı
+havuzlarında çalışır, olay döngüsü bloklanmaz. Ses yanıtı parça
+parça akıtılır; gövde boyutları sınırlandırılır.
+
+Kullanım:
+    uvicorn src.api:app --host 0.0.0.0 --port 8000
+"""
+import asyncio
+import functools
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, Iterator, List, Literal, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from . import metrics
+from .analyze_results import ResultAnalyzer
+from .cache import audio_cache, is_cacheable_parse, parse_cache, parse_cache_key, tts_cache_key
+from .generate_summary import SummaryGenerator
+from .locales import DEFAULT_LOCALE, MessageCatalog, available_locales, get_catalog
+from .parse_report import ReportParser
+from .text_to_speech import describe_audio
+
+
+MAX_PDF_BYTES = int(os.environ.get('SMART_AUDIO_MAX_PDF_MB', '20')) * 1024 * 1024
+MAX_JSON_BYTES = 1024 * 1024
+MAX_TEXT_CHARS = 20000
+PARSE_WORKERS = int(os.environ.get('SMART_AUDIO_PARSE_WORKERS', str(os.cpu_count() or 1)))
+SYNTH_WORKERS = int(os.environ.get('SMART_AUDIO_SYNTH_WORKERS', '4'))
+
+# Akışlı yanıtlarda tek seferde gönderilen en büyük ses bloğu
+STREAM_BLOCK = 64 * 1024
+
+MEDIA_TYPES = {'pyttsx3': 'audio/wav', 'gtts': 'audio/mpeg'}
+
+Engine = Literal['pyttsx3', 'gtts']
+AudioFormat = Literal['wav', 'mp3', 'opus', 'speech']
+Gender = Optional[Literal['Erkek', 'Kadın']]
+
+
+# Süreç havuzundaki her işçide bir kez oluşturulan ayrıştırıcı
+_worker_parser: Optional[ReportParser] = None
+
+
+def _parse_in_worker(pdf_bytes: bytes) -> Dict:
+    global _worker_parser
+    if _worker_parser is None:
+        from .ocr import configure_workers
+
+        # Ayrıştırma zaten süreç havuzunda; OCR işçi başına iç içe havuz kurmaz
+        configure_workers(1)
+        _worker_parser = ReportParser()
+    return _worker_parser.parse(pdf_bytes)
+
+
+_singletons: Dict = {}
+_singletons_lock = threading.Lock()
+
+
+def _singleton(key, factory):
+    with _singletons_lock:
+        instance = _singletons.get(key)
+        if instance is None:
+            instance = _singletons[key] = factory()
+        return instance
+
+
+def get_analyzer() -> ResultAnalyzer:
+    return _singleton('analyzer', ResultAnalyzer)
+
+
+def get_generator(use_nlp: bool = False) -> SummaryGenerator:
+    return _singleton(('generator', use_nlp),
+                      lambda: SummaryGenerator(use_nlp=use_nlp, use_service=use_nlp))
+
+
+_executors: Dict = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # spawn: uvicorn'un iş parçacıkları ve olay döngüsü çatallanmaz
+    _executors['parse'] = ProcessPoolExecutor(
+        max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context('spawn')
+    )
+    _executors['synth'] = ThreadPoolExecutor(max_workers=SYNTH_WORKERS,
+                                             thread_name_prefix='synth')
+    try:
+        yield
+    finally:
+        _executors.pop('parse').shutdown(cancel_futures=True)
+        _executors.pop('synth').shutdown(cancel_futures=True)
+
+
+app = FastAPI(title='SmartAudioLabReport API', lifespan=lifespan)
+
+
+class BodySizeLimitMiddleware:
+    """İstek gövdesini PDF uç noktalarında MAX_PDF_BYTES, diğerlerinde
+    MAX_JSON_BYTES ile sınırlar; Content-Length olmayan (chunked) gövdeler
+    okunurken sayılır."""
+
+    PDF_PATHS = ('/parse', '/report-to-audio', '/report-summaries')
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        limit = MAX_PDF_BYTES if scope['path'] in self.PDF_PATHS else MAX_JSON_BYTES
+        headers = dict(scope['headers'])
+        declared = headers.get(b'content-length')
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            return await PlainTextResponse('İstek gövdesi çok büyük', status_code=413)(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > limit:
+                    raise HTTPException(413, 'İstek gövdesi çok büyük')
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(BodySizeLimitMiddleware)
+
+
+class ParsedResult(BaseModel):
+    """``/parse`` çıktısındaki tek test sonucu; diğer alanlar (raw_line vb.) korunur."""
+    model_config = ConfigDict(extra='allow')
+
+    value: float = Field(allow_inf_nan=False)
+    unit: Optional[str] = None
+
+
+class AnalyzeRequest(BaseModel):
+    results: Dict[str, ParsedResult]
+    gender: Gender = None
+
+
+class TestAnalysis(BaseModel):
+    """``/analyze`` çıktısındaki tek test analizi; diğer alanlar korunur."""
+    model_config = ConfigDict(extra='allow')
+
+    value: Optional[float] = Field(None, allow_inf_nan=False)
+    unit: Optional[str] = None
+    status: Optional[Literal['low', 'high', 'normal', 'unknown']] = None
+    message: Optional[str] = None
+    is_normal: Optional[bool] = None
+    reference_range: Optional[str] = None
+
+
+class AnalysisSummary(BaseModel):
+    total_tests: int = Field(ge=0)
+    normal_count: int = Field(0, ge=0)
+    abnormal_count: int = Field(0, ge=0)
+    unknown_count: int = Field(0, ge=0)
+
+
+class ReportAnalyses(BaseModel):
+    """``ResultAnalyzer.analyze`` çıktısı."""
+    analyses: Dict[str, TestAnalysis]
+    summary: AnalysisSummary
+
+
+class SummarizeRequest(BaseModel):
+    analyses: ReportAnalyses
+    use_nlp: bool = False
+    locale: str = DEFAULT_LOCALE
+
+
+class SynthesizeRequest(BaseModel):
+    text: str = Field(min_length=1, max_length=MAX_TEXT_CHARS)
+    engine: Engine = 'pyttsx3'
+    language: str = 'tr'
+    voice_profile: Literal['default', 'female', 'male'] = 'default'
+    audio_format: Optional[AudioFormat] = None
+
+
+async def _read_pdf(request: Request) -> bytes:
+    pdf_bytes = await request.body()
+    if not pdf_bytes.startswith(b'%PDF'):
+        raise HTTPException(415, 'Gövde bir PDF dosyası olmalıdır (application/pdf)')
+    return pdf_bytes
+
+
+async def _parse(pdf_bytes: bytes) -> Dict:
+    """Önbellekte yoksa PDF'i süreç havuzunda ayrıştırır."""
+    key = parse_cache_key(pdf_bytes)
+    cached = parse_cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+    loop = asyncio.get_running_loop()
+    parsed = await loop.run_in_executor(_executors['parse'], _parse_in_worker, pdf_bytes)
+    if 'error' in parsed:
+        raise HTTPException(422, parsed['error'])
+    if is_cacheable_parse(parsed):
+        parse_cache.put(key, json.dumps(parsed, ensure_ascii=False).encode('utf-8'))
+    return parsed
+
+
+def _tts_language(language: str) -> str:
+    """Ses dilini kataloglardaki ``tts_language`` değerleriyle doğrular.
+
+    Her yeni dil için kalıcı bir çevrimiçi TTS arka ucu başlatıldığından
+    istemciden gelen serbest değerler kabul edilmez.
+    """
+    supported = _singleton('tts_languages', lambda: frozenset(
+        get_catalog(locale).tts_language for locale in available_locales()
+    ))
+    if language not in supported:
+        raise HTTPException(422, f"Desteklenmeyen ses dili: {language} "
+                                 f"(seçenekler: {', '.join(sorted(supported))})")
+    return language
+
+
+def _catalog(locale: str) -> MessageCatalog:
+    try:
+        return get_catalog(locale)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+
+
+async def _summarize(analyses: Dict, use_nlp: bool, outputs: Optional[tuple] = None,
+                     locale: str = DEFAULT_LOCALE) -> Dict:
+    _catalog(locale)
+    generator = get_generator(use_nlp)
+    if not use_nlp:
+        return generator.generate(analyses, outputs=outputs, locale=locale)
+    # NLP özeti servisi beklerken olay döngüsünü bloklamasın
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executors['synth'], functools.partial(
+        generator.generate, analyses, True, outputs=outputs, locale=locale
+    ))
+
+
+def _blocks(audio: bytes) -> Iterator[bytes]:
+    for start in range(0, len(audio), STREAM_BLOCK):
+        yield audio[start:start + STREAM_BLOCK]
+
+
+def _stream_chunks(text: str, engine: str, language: str, voice_profile: str) -> Iterator[bytes]:
+    """MP3 parçalarını sentezlendikçe gönderir; tamamlanan sesi önbelleğe yazar.
+
+    Bir parça sentezlenemezse RuntimeError verir: ilk parçada çağıran yedek
+    motora döner, sonraki parçalarda yanıt yarıda kesilir ve istemci eksik
+    sesi tamamlanmış sanmaz (MP3 akışına yedek motorun WAV sesi eklenemez).
+    """
+    from .text_to_speech import TextToSpeech
+
+    tts = TextToSpeech(engine=engine, language=language, use_pool=True)
+    if voice_profile != 'default':
+        tts.set_voice_profile(voice_profile)
+    parts = []
+    for index, _, audio in tts.iter_audio_chunks(text):
+        if audio is None:
+            raise RuntimeError(f"Ses parçası {index + 1} sentezlenemedi")
+        parts.append(audio)
+        yield audio
+    audio_cache.put(tts_cache_key(text, engine, language, voice_profile), b''.join(parts))
+
+
+async def _encoded_response(text: str, engine: str, language: str, voice_profile: str,
+                            audio_format: str, headers: Optional[Dict[str, str]]) -> StreamingResponse:
+    """Sesi sentezleyip ``audio_format`` biçimine kodlar (bkz. audio_encoding)."""
+    from .audio_encoding import submit_encode
+    from .cache import cached_synthesize
+
+    loop = asyncio.get_running_loop()
+    audio = await loop.run_in_executor(
+        _executors['synth'], cached_synthesize, text, engine, language, voice_profile
+    )
+    if audio is None:
+        raise HTTPException(503, 'Ses üretilemedi')
+    encoded = await asyncio.wrap_future(submit_encode(audio, audio_format))
+    headers = {**(headers or {}), 'X-Audio-Format': encoded['format'],
+               'X-Audio-Bytes': str(encoded['bytes']), 'X-Encode-Ms': str(encoded['encode_ms'])}
+    return StreamingResponse(_blocks(encoded['audio']), media_type=encoded['media_type'],
+                             headers=headers)
+
+
+async def _audio_response(text: str, engine: str, language: str, voice_profile: str,
+                          headers: Optional[Dict[str, str]] = None,
+                          audio_format: Optional[str] = None) -> StreamingResponse:
+    _tts_language(language)
+    if audio_format is not None:
+        return await _encoded_response(text, engine, language, voice_profile, audio_format, headers)
+    # MIME türü baytlardan bulunur: gTTS başarısızsa ses çevrimdışı motordan gelir
+    cached = audio_cache.get(tts_cache_key(text, engine, language, voice_profile))
+    if cached is not None:
+        return StreamingResponse(_blocks(cached), media_type=describe_audio(cached)[1], headers=headers)
+    loop = asyncio.get_running_loop()
+    if engine == 'gtts':
+        # MP3 parçaları art arda eklenebildiğinden ilk cümle hazır olur olmaz
+        # gönderilir; ilk parça başarısızsa tüm metin yedek motorla sentezlenir
+        chunks = _stream_chunks(text, engine, language, voice_profile)
+        try:
+            first = await loop.run_in_executor(_executors['synth'], next, chunks, None)
+        except RuntimeError as e:
+            print(f"Akışlı sentez hatası: {e}")
+            first = None
+        if first is not None:
+            return StreamingResponse(itertools.chain([first], chunks),
+                                     media_type=MEDIA_TYPES[engine], headers=headers)
+
+    from .cache import cached_synthesize
+
+    audio = await loop.run_in_executor(
+        _executors['synth'], cached_synthesize, text, engine, language, voice_profile
+    )
+    if audio is None:
+        raise HTTPException(503, 'Ses üretilemedi')
+    return StreamingResponse(_blocks(audio), media_type=describe_audio(audio)[1], headers=headers)
+
+
+@app.get('/health')
+async def health() -> Dict:
+    return {'status': 'ok'}
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+async def prometheus_metrics() -> str:
+    return metrics.registry.prometheus_text()
+
+
+@app.get('/locales')
+async def locales() -> Dict:
+    """Özet ve ses için kullanılabilen diller."""
+    return {locale: {'name': get_catalog(locale).name, 'direction': get_catalog(locale).direction}
+            for locale in available_locales()}
+
+
+@app.post('/parse')
+async def parse(request: Request) -> Dict:
+    """Gövdedeki PDF'ten test sonuçlarını çıkarır."""
+    return await _parse(await _read_pdf(request))
+
+
+@app.post('/analyze')
+async def analyze(body: AnalyzeRequest) -> Dict:
+    results = {name: result.model_dump(exclude_none=True) for name, result in body.results.items()}
+    return get_analyzer().analyze(results, body.gender)
+
+
+@app.post('/summarize')
+async def summarize(body: SummarizeRequest) -> Dict:
+    return await _summarize(body.analyses.model_dump(exclude_none=True), body.use_nlp,
+                            locale=body.locale)
+
+
+@app.post('/synthesize')
+async def synthesize(body: SynthesizeRequest) -> StreamingResponse:
+    return await _audio_response(body.text, body.engine, body.language, body.voice_profile,
+                                 audio_format=body.audio_format)
+
+
+@app.post('/report-to-audio')
+async def report_to_audio(request: Request, gender: Gender = None,
+                          engine: Engine = 'pyttsx3', language: Optional[str] = None,
+                          use_nlp: bool = False,
+                          voice_profile: Literal['default', 'female', 'male'] = Query('default'),
+                          locale: str = DEFAULT_LOCALE, audio_format: Optional[AudioFormat] = None):
+    """PDF raporunu tek istekte ayrıştırır, analiz eder, ``locale`` dilinde
+    özetler ve seslendirir (``language`` verilmezse dilin ses kodu kullanılır).
+    ``audio_format`` verilirse ses akıtılmaz, bu biçime kodlanıp gönderilir."""
+    language = _tts_language(language or _catalog(locale).tts_language)
+    parsed = await _parse(await _read_pdf(request))
+    analyses = get_analyzer().analyze(parsed['results'], gender)
+    summary = await _summarize(analyses, use_nlp, outputs=('audio_text',), locale=locale)
+    headers = {
+        'X-Test-Count': str(analyses['summary']['total_tests']),
+        'X-Abnormal-Count': str(analyses['summary']['abnormal_count']),
+    }
+    return await _audio_response(summary['audio_text'], engine, language, voice_profile, headers,
+                                 audio_format)
+
+
+@app.post('/report-summaries')
+async def report_summaries(request: Request, gender: Gender = None, use_nlp: bool = False,
+                           locales: List[str] = Query([DEFAULT_LOCALE])) -> Dict:
+    """PDF raporunu bir kez ayrıştırıp analiz eder ve her dil için özeti döndürür."""
+    for locale in locales:
+        _catalog(locale)
+    parsed = await _parse(await _read_pdf(request))
+    analyses = get_analyzer().analyze(parsed['results'], gender)
+    return {'summary': analyses['summary'],
+            'locales': {locale: await _summarize(analyses, use_nlp, locale=locale)
+                        for locale in dict.fromkeys(locales)}}
@@ -0,0 +1,240 @@
+"""
+Asenkron çevrimiçi TTS istemcisi (Google Translate TTS uç noktası).
+
+gTTS ile aynı uç noktayı kullanır, ancak tek bir havuzlanmış HTTP oturumu
+üzerinden bağlantıları yeniden kullanır ve metin parçalarını ayarlanabilir
+bir semafor altında eşzamanlı indirir. Her parça zaman aşımı, yeniden
+deneme ve üstel geri çekilmeyle alınır. Art arda hatalarda devre kesici
+açılır; başarısız sentez None döner ve çevrimdışı motora dönüşü çağıran
+taraf kendi önbellek anahtarıyla yapar (bkz. cache.cached_synthesize), böylece
+WAV/AIFF yedek ses hiçbir zaman MP3 olarak saklanmaz veya sunulmaz.
+
+aiohttp isteğe bağlı bir bağımlılıktır ve ilk kullanımda içe aktarılır.
+"""
+import asyncio
+import base64
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from typing import Dict, List, Optional
+
+from .text_to_speech import split_into_chunks
+
+
+RPC_ID = 'jQ1olc'
+MAX_CHUNK_CHARS = 100  # gTTS ile aynı parça sınırı
+_AUDIO_RE = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+_HEADERS = {
+    'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8',
+    'Referer': 'http://translate.google.com/',
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/47.0.2526.106 Safari/537.36',
+}
+
+
+def split_for_request(text: str, limit: int = MAX_CHUNK_CHARS) -> List[str]:
+    """Metni uç noktanın kabul ettiği uzunlukta parçalara böler.
+
+    Cümleler sığdığı sürece aynı parçada birleştirilir; sınırı aşan cümleler
+    kelime sınırından bölünür.
+    """
+    pieces = []
+    current = ''
+    for sentence in split_into_chunks(text):
+        for word in sentence.split():
+            if current and len(current) + 1 + len(word) > limit:
+                pieces.append(current)
+                current = word
+            else:
+                current = f'{current} {word}' if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def encode_request(text: str, language: str, slow: bool = False) -> str:
+    parameter = json.dumps([text, language, True if slow else None, 'null'], separators=(',', ':'))
+    rpc = json.dumps([[[RPC_ID, parameter, None, 'generic']]], separators=(',', ':'))
+    return f'f.req={urllib.parse.quote(rpc)}&'
+
+
+def decode_response(body: str) -> bytes:
+    audio = b''
+    for line in body.splitlines():
+        if RPC_ID in line:
+            match = _AUDIO_RE.search(line)
+            if match:
+                audio += base64.b64decode(match.group(1).encode('ascii'))
+    if not audio:
+        raise ValueError('Yanıtta ses verisi bulunamadı')
+    return audio
+
+
+class CircuitBreaker:
+    """Art arda ``failure_threshold`` hatada açılır, ``reset_timeout`` sonra bir deneme yapar."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        return self.state != 'open'
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold or self.state == 'half-open':
+            self.opened_at = time.monotonic()
+
+
+class AsyncOnlineTTS:
+    """Havuzlanmış oturum, eşzamanlılık sınırı ve yeniden denemeyle çevrimiçi TTS."""
+
+    def __init__(self, language: str = 'tr', tld: str = 'com', base_url: Optional[str] = None,
+                 concurrency: int = 4, timeout: float = 10.0, retries: int = 3,
+                 backoff: float = 0.5, breaker: Optional[CircuitBreaker] = None):
+        """
+        Args:
+            language: Dil kodu
+            tld: translate.google.<tld> alan adı uzantısı
+            base_url: Uç nokta kökü (testlerde yerel taklit sunucu için)
+            concurrency: Aynı anda en fazla istek sayısı
+            timeout: İstek başına zaman aşımı (sn)
+            retries: Parça başına en fazla yeniden deneme
+            backoff: Üstel geri çekilmenin başlangıç süresi (sn)
+        """
+        self.language = language
+        self.url = (base_url or f'https://translate.google.{tld}').rstrip('/') + \
+            '/_/TranslateWebserverUi/data/batchexecute'
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.failures = 0
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            import aiohttp
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=_HEADERS,
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def _fetch(self, text: str) -> bytes:
+        session = await self._get_session()
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._semaphore:
+                    self.requests += 1
+                    async with session.post(self.url, data=encode_request(text, self.language)) as response:
+                        response.raise_for_status()
+                        return decode_response(await response.text())
+            except Exception:
+                self.failures += 1
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(delay * (1 + random.random() * 0.25))
+                delay *= 2
+
+    async def synthesize(self, text: str) -> bytes:
+        """Metnin MP3 baytlarını döndürür; devre açıksa veya istek başarısızsa hata verir."""
+        if not self.breaker.allow():
+            raise RuntimeError('Çevrimiçi TTS devre kesicisi açık')
+        pieces = split_for_request(text)
+        try:
+            audio = await asyncio.gather(*(self._fetch(piece) for piece in pieces))
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return b''.join(audio)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    def stats(self) -> Dict:
+        return {
+            'breaker': self.breaker.state,
+            'requests': self.requests,
+            'failures': self.failures,
+        }
+
+
+class OnlineTTSBackend:
+    """Eşzamanlı (senkron) koddan kullanım için arka plan olay döngüsünde çalışan istemci.
+
+    Oturum tek bir olay döngüsüne bağlı olduğundan tüm çağrılar aynı döngüde
+    çalıştırılır; böylece bağlantılar istekler arasında yeniden kullanılır.
+    """
+
+    def __init__(self, **client_kwargs):
+        self.client = AsyncOnlineTTS(**client_kwargs)
+        self.failed_calls = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='online-tts', daemon=True)
+        self._thread.start()
+
+    def synthesize(self, text: str) -> Optional[bytes]:
+        """Metnin MP3 baytlarını döndürür; çevrimiçi sentez başarısızsa None."""
+        future = asyncio.run_coroutine_threadsafe(self.client.synthesize(text), self._loop)
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Çevrimiçi TTS hatası: {e}")
+            self.failed_calls += 1
+            return None
+
+    def stats(self) -> Dict:
+        return {**self.client.stats(), 'failed_calls': self.failed_calls}
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.client.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+# Her arka uç kalıcı bir iş parçacığı ve olay döngüsü tutar
+MAX_ONLINE_BACKENDS = 8
+
+_backends: Dict[str, OnlineTTSBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_online_backend(language: str = 'tr') -> Optional[OnlineTTSBackend]:
+    """Dil başına süreç genelinde paylaşılan çevrimiçi TTS arka ucunu döndürür.
+
+    En fazla ``MAX_ONLINE_BACKENDS`` dil için arka uç kurulur; sınır
+    dolduysa None döner ve çağıran havuzsuz gTTS istemcisini kullanır.
+    """
+    with _backends_lock:
+        backend = _backends.get(language)
+        if backend is None:
+            if len(_backends) >= MAX_ONLINE_BACKENDS:
+                return None
+            backend = OnlineTTSBackend(language=language)
+            _backends[language] = backend
+        return backend
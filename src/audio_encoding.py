@@ -0,0 +1,268 @@
+"""
+Ses kodlama aşaması: PCM'e dönüştürme, sessizlik kırpma, ses yüksekliği
+normalleştirme ve sıkıştırma.
+
+TTS motorlarının çıktısı (pyttsx3: sürücüye göre WAV veya AIFF, gTTS: MP3)
+önce tek kanallı 16 bit PCM'e çevrilir; baştaki ve sondaki sessizlik
+kırpılır, konuşma bölümlerinin ses yüksekliği sabit bir RMS düzeyine
+getirilir (tepe değeri sınırlanarak). Ardından seçilen biçime kodlanır:
+
+    wav     16 bit PCM WAV (her zaman kullanılabilir)
+    mp3     MP3 (libmp3lame)
+    opus    Ogg/Opus
+    speech  Konuşma için düşük bit hızlı Ogg/Opus (16 kHz, VoIP modu)
+
+Sıkıştırılmış biçimler yerel ``ffmpeg`` programıyla kodlanır; ffmpeg yoksa
+WAV üretilir ve sonuç gerçek biçimi ve MIME türünü bildirir. Kodlama arka
+plandaki işçi havuzunda çalışır; rapor başına bayt ve kodlama süresi
+``audio.encode`` aşaması olarak ölçümlere yazılır.
+"""
+import io
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from . import metrics
+from .cache import ContentCache, audio_cache, content_key
+from .text_to_speech import describe_audio
+
+FFMPEG = shutil.which('ffmpeg')
+FFMPEG_AVAILABLE = FFMPEG is not None
+
+FORMATS = {
+    'wav': {'media_type': 'audio/wav', 'extension': 'wav'},
+    'mp3': {'media_type': 'audio/mpeg', 'extension': 'mp3', 'bitrate': '48k', 'sample_rate': 22050,
+            'codec': ['-c:a', 'libmp3lame', '-f', 'mp3']},
+    'opus': {'media_type': 'audio/ogg', 'extension': 'ogg', 'bitrate': '32k', 'sample_rate': 24000,
+             'codec': ['-c:a', 'libopus', '-application', 'audio', '-f', 'ogg']},
+    'speech': {'media_type': 'audio/ogg', 'extension': 'ogg', 'bitrate': '16k', 'sample_rate': 16000,
+               'codec': ['-c:a', 'libopus', '-application', 'voip', '-f', 'ogg']},
+}
+DEFAULT_FORMAT = os.environ.get('SMART_AUDIO_FORMAT', 'speech')
+ENCODE_WORKERS = int(os.environ.get('SMART_AUDIO_ENCODE_WORKERS', '2'))
+ENCODE_TIMEOUT = 60
+
+# Kodlama ayarları değişince önbellekteki çıktılar geçersiz olsun
+ENCODER_VERSION = '1'
+
+# Sessizlik kırpma ve ses yüksekliği
+FRAME_MS = 20
+SILENCE_DBFS = -45.0
+PADDING_MS = 150
+TARGET_RMS_DBFS = -20.0
+PEAK_DBFS = -1.0
+# ffmpeg ile çözülen (WAV olmayan) girdilerin örnekleme hızı
+DECODE_RATE = 24000
+
+
+def _result_info(encoded: bytes, audio_format: str) -> Tuple[str, str, str]:
+    actual, media_type, extension = describe_audio(encoded)
+    # speech ve opus aynı kapsayıcıyı (Ogg/Opus) kullanır
+    if actual == 'opus' and audio_format == 'speech':
+        actual = 'speech'
+    return actual, media_type, extension
+
+
+def _ffmpeg(args, data: bytes) -> Optional[bytes]:
+    try:
+        completed = subprocess.run([FFMPEG, '-hide_banner', '-loglevel', 'error', *args], input=data,
+                                   capture_output=True, timeout=ENCODE_TIMEOUT, check=True)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"ffmpeg hatası: {e}")
+        return None
+    return completed.stdout
+
+
+def _read_wav(audio: bytes) -> Tuple[np.ndarray, int]:
+    with wave.open(io.BytesIO(audio), 'rb') as reader:
+        channels, width, rate = reader.getnchannels(), reader.getsampwidth(), reader.getframerate()
+        frames = reader.readframes(reader.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(frames, np.uint8).astype(np.int16) - 128) << 8
+    elif width == 2:
+        samples = np.frombuffer(frames, '<i2')
+    elif width == 3:
+        data = np.frombuffer(frames, np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((data[:, 0] << 8 | data[:, 1] << 16 | data[:, 2] << 24) >> 16).astype(np.int16)
+    elif width == 4:
+        samples = (np.frombuffer(frames, '<i4') >> 16).astype(np.int16)
+    else:
+        raise ValueError(f"Desteklenmeyen örnek genişliği: {width}")
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples.astype(np.int16), rate
+
+
+def decode_pcm(audio: bytes) -> Optional[Tuple[np.ndarray, int]]:
+    """Ses baytlarını tek kanallı int16 örneklere ve örnekleme hızına çevirir.
+
+    PCM WAV doğrudan okunur; diğer biçimler (AIFF, MP3, kayan noktalı WAV)
+    ffmpeg ile çözülür. Çözülemezse None döner.
+    """
+    if audio[:4] == b'RIFF' and audio[8:12] == b'WAVE':
+        try:
+            return _read_wav(audio)
+        except (wave.Error, EOFError, ValueError):
+            pass
+    if not FFMPEG_AVAILABLE:
+        return None
+    pcm = _ffmpeg(['-i', 'pipe:0', '-f', 's16le', '-ac', '1', '-ar', str(DECODE_RATE), 'pipe:1'], audio)
+    if not pcm:
+        return None
+    return np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], '<i2'), DECODE_RATE
+
+
+def _frame_levels(samples: np.ndarray, frame: int) -> np.ndarray:
+    """Her çerçevenin RMS düzeyi (dBFS)."""
+    count = len(samples) // frame
+    frames = samples[:count * frame].astype(np.float32).reshape(count, frame) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-9))
+
+
+def prepare_pcm(samples: np.ndarray, rate: int, trim: bool = True,
+                normalize: bool = True) -> np.ndarray:
+    """Baştaki/sondaki sessizliği kırpar ve konuşma düzeyini TARGET_RMS_DBFS'e getirir.
+
+    Tamamen sessiz ses değiştirilmeden döner.
+    """
+    frame = max(1, rate * FRAME_MS // 1000)
+    levels = _frame_levels(samples, frame)
+    active = np.flatnonzero(levels > SILENCE_DBFS)
+    if len(active) == 0:
+        return samples
+    # Yalnızca konuşma çerçeveleri ölçülür; sessiz aralar düzeyi düşürmez
+    speech_rms = float(np.sqrt(np.mean(np.power(10.0, levels[active] / 10))))
+    if trim:
+        padding = rate * PADDING_MS // 1000
+        start = max(0, active[0] * frame - padding)
+        end = min(len(samples), (active[-1] + 1) * frame + padding)
+        samples = samples[start:end]
+    if normalize:
+        gain = 10 ** (TARGET_RMS_DBFS / 20) / max(speech_rms, 1e-9)
+        peak = float(np.max(np.abs(samples.astype(np.float32)))) / 32768.0
+        if peak > 0:
+            gain = min(gain, 10 ** (PEAK_DBFS / 20) / peak)
+        samples = np.clip(samples.astype(np.float32) * gain, -32768, 32767).astype(np.int16)
+    return samples
+
+
+def _write_wav(samples: np.ndarray, rate: int) -> bytes:
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(samples.astype('<i2').tobytes())
+    return output.getvalue()
+
+
+def encode_pcm(samples: np.ndarray, rate: int, audio_format: str,
+               bitrate: Optional[str] = None) -> Tuple[bytes, str]:
+    """PCM örneklerini kodlar; (ses baytları, gerçek biçim) döndürür.
+
+    ffmpeg yoksa veya kodlama başarısızsa WAV'a geri dönülür.
+    """
+    profile = FORMATS[audio_format]
+    if 'codec' in profile and FFMPEG_AVAILABLE:
+        encoded = _ffmpeg([
+            '-f', 's16le', '-ar', str(rate), '-ac', '1', '-i', 'pipe:0',
+            '-ar', str(profile['sample_rate']), '-ac', '1', '-b:a', bitrate or profile['bitrate'],
+            *profile['codec'], 'pipe:1',
+        ], samples.astype('<i2').tobytes())
+        if encoded:
+            return encoded, audio_format
+    return _write_wav(samples, rate), 'wav'
+
+
+def encode_audio(audio: bytes, audio_format: str = DEFAULT_FORMAT, bitrate: Optional[str] = None,
+                 trim: bool = True, normalize: bool = True) -> Dict:
+    """TTS çıktısını normalleştirip seçilen biçime kodlar.
+
+    Çözülemeyen ses (ör. ffmpeg olmadan MP3) olduğu gibi döner.
+
+    Returns:
+        'audio', 'format' (gerçek biçim), 'media_type', 'extension', 'bytes',
+        'input_bytes', 'duration_s' ve 'encode_ms'
+    """
+    if audio_format not in FORMATS:
+        raise ValueError(f"Bilinmeyen ses biçimi: {audio_format} (seçenekler: {', '.join(FORMATS)})")
+    wall, cpu = time.perf_counter(), time.process_time()
+    decoded = decode_pcm(audio)
+    duration = None
+    if decoded is None:
+        encoded = audio
+    else:
+        samples, rate = decoded
+        samples = prepare_pcm(samples, rate, trim, normalize)
+        duration = round(len(samples) / rate, 2)
+        encoded, _ = encode_pcm(samples, rate, audio_format, bitrate)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    actual, media_type, extension = _result_info(encoded, audio_format)
+    if metrics.is_enabled():
+        metrics.registry.record('audio.encode', wall, cpu, 'ok' if actual == audio_format else 'fallback',
+                                {'bytes': len(encoded), 'input_bytes': len(audio)})
+    return {
+        'audio': encoded,
+        'format': actual,
+        'media_type': media_type,
+        'extension': extension,
+        'bytes': len(encoded),
+        'input_bytes': len(audio),
+        'duration_s': duration,
+        'encode_ms': round(wall * 1000, 1),
+    }
+
+
+def cached_encode(audio: bytes, audio_format: str = DEFAULT_FORMAT, bitrate: Optional[str] = None,
+                  cache: Optional[ContentCache] = None) -> Dict:
+    """``encode_audio`` sonucunu ses içeriği ve ayarlarla önbelleğe alır.
+
+    Önbellekten gelen sonuçta 'encode_ms' 0, 'cached' True'dur. İstenen
+    biçime kodlanamayan (WAV'a ya da girdiye dönen) sonuçlar saklanmaz;
+    ffmpeg yeniden çalıştığında ses istenen biçimde üretilir.
+    """
+    cache = cache or audio_cache
+    key = content_key(b'encode', ENCODER_VERSION, audio_format, bitrate or '', audio)
+    cached = cache.get(key)
+    if cached is not None:
+        actual, media_type, extension = _result_info(cached, audio_format)
+        return {'audio': cached, 'format': actual, 'media_type': media_type, 'extension': extension,
+                'bytes': len(cached), 'input_bytes': len(audio), 'duration_s': None,
+                'encode_ms': 0.0, 'cached': True}
+    result = encode_audio(audio, audio_format, bitrate)
+    if result['format'] == audio_format:
+        cache.put(key, result['audio'])
+    result['cached'] = False
+    return result
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_encoder_executor() -> ThreadPoolExecutor:
+    """Süreç genelinde tek kodlama işçi havuzunu döndürür.
+
+    ffmpeg alt süreçte, NumPy işlemleri GIL dışında çalıştığından iş
+    parçacıkları yeterlidir.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ENCODE_WORKERS, thread_name_prefix='encode')
+        return _executor
+
+
+def submit_encode(audio: bytes, audio_format: str = DEFAULT_FORMAT,
+                  bitrate: Optional[str] = None) -> Future:
+    """Kodlamayı arka plandaki işçi havuzunda başlatır (sonuç: ``cached_encode`` çıktısı)."""
+    return get_encoder_executor().submit(cached_encode, audio, audio_format, bitrate)
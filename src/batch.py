@@ -0,0 +1,186 @@
+"""
+Toplu rapor işleme komut satırı aracı.
+
+Bir dizindeki PDF raporlarını süreç havuzuna dağıtır ve her rapor için
+ayrıştırma → analiz → özet sonucunu JSONL dosyasına satır satır yazar.
+``--store`` verilirse analizler, dosya adından çıkarılan hasta kimliği ve
+rapor tarihiyle sonuç deposuna (bkz. result_store) toplu olarak eklenir.
+
+Kullanım:
+    python -m src.batch raporlar/ -o sonuclar.jsonl --workers 8
+    python -m src.batch raporlar/ --store sonuclar.sqlite3   # HASTA_2024-03-12.pdf
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from .analyze_results import ResultAnalyzer
+from .generate_summary import SummaryGenerator
+from .parse_report import ReportParser
+from .result_store import INSERT_BATCH, ResultStore, analysis_rows
+
+
+# Dosya adından hasta kimliği ve rapor tarihini çıkaran varsayılan desen
+DEFAULT_NAME_PATTERN = r'(?P<patient>[^_]+)_(?P<date>\d{4}-\d{2}-\d{2})'
+
+
+# Her işçi süreçte bir kez oluşturulan nesneler
+_worker_state: Dict = {}
+
+
+def _init_worker(gender: Optional[str], use_nlp: bool, layout: bool = False):
+    """İşçi süreç başlatıcısı: ayrıştırıcı, analizci ve özet üreticiyi bir kez kurar."""
+    from .ocr import configure_workers
+
+    # Raporlar zaten süreçlere dağıtıldığından OCR işçi başına iç içe havuz kurmaz
+    configure_workers(1)
+    _worker_state['parser'] = ReportParser(layout=layout)
+    _worker_state['analyzer'] = ResultAnalyzer()
+    _worker_state['generator'] = SummaryGenerator(use_nlp=use_nlp)
+    _worker_state['gender'] = gender
+    _worker_state['use_nlp'] = use_nlp
+
+
+def process_file(pdf_path: str) -> Dict:
+    """Tek bir raporu uçtan uca işler; hataları kayda dönüştürür."""
+    start = time.perf_counter()
+    record = {'file': pdf_path}
+    try:
+        parsed = _worker_state['parser'].parse(pdf_path)
+        if 'error' in parsed:
+            record['error'] = parsed['error']
+        else:
+            analyses = _worker_state['analyzer'].analyze(parsed['results'], _worker_state['gender'])
+            summary = _worker_state['generator'].generate(
+                analyses, use_nlp_summary=_worker_state['use_nlp']
+            )
+            record['test_count'] = parsed['test_count']
+            record['analyses'] = analyses
+            record['summary'] = summary
+    except Exception as e:
+        record['error'] = f'{type(e).__name__}: {e}'
+        record['traceback'] = traceback.format_exc()
+    record['elapsed_s'] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def find_reports(directory: Path, recursive: bool = False) -> Iterator[str]:
+    """Dizindeki PDF dosyalarını sıralı olarak bulur."""
+    pattern = '**/*.pdf' if recursive else '*.pdf'
+    for path in sorted(directory.glob(pattern)):
+        if path.is_file():
+            yield str(path)
+
+
+def run_batch(pdf_paths: Iterable[str], workers: int, max_in_flight: int,
+              gender: Optional[str] = None, use_nlp: bool = False,
+              layout: bool = False) -> Iterator[Dict]:
+    """Raporları süreç havuzunda işler; tamamlanan kayıtları geldikçe üretir.
+
+    Aynı anda en fazla ``max_in_flight`` iş kuyrukta tutulur, böylece on
+    binlerce dosyalık dizinlerde bellek kullanımı sınırlı kalır.
+    """
+    paths = iter(pdf_paths)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(gender, use_nlp, layout)) as executor:
+        pending = set()
+        for path in paths:
+            pending.add(executor.submit(process_file, path))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                path = next(paths, None)
+                if path is not None:
+                    pending.add(executor.submit(process_file, path))
+
+
+def main(argv: Optional[list] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description='PDF laboratuvar raporlarını toplu işler.')
+    arg_parser.add_argument('directory', type=Path, help='PDF raporlarının bulunduğu dizin')
+    arg_parser.add_argument('-o', '--output', type=Path, default=Path('batch_results.jsonl'),
+                            help='JSONL çıktı dosyası (varsayılan: batch_results.jsonl)')
+    arg_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                            help='İşçi süreç sayısı (varsayılan: CPU sayısı)')
+    arg_parser.add_argument('--max-in-flight', type=int, default=None,
+                            help='Aynı anda kuyruktaki en fazla iş (varsayılan: 4 x işçi)')
+    arg_parser.add_argument('--gender', choices=['Erkek', 'Kadın'], default=None)
+    arg_parser.add_argument('--nlp', action='store_true', help='NLP özetlemeyi kullan')
+    arg_parser.add_argument('--layout', action='store_true',
+                            help='Sonuçları tablo sütunlarına göre oku (bkz. layout_parse)')
+    arg_parser.add_argument('-r', '--recursive', action='store_true', help='Alt dizinleri de tara')
+    arg_parser.add_argument('--store', type=Path, default=None,
+                            help='Analizlerin eklendiği SQLite sonuç deposu')
+    arg_parser.add_argument('--name-pattern', default=DEFAULT_NAME_PATTERN,
+                            help='Dosya adından hasta (patient) ve tarih (date) grubunu '
+                                 'çıkaran düzenli ifade')
+    args = arg_parser.parse_args(argv)
+    try:
+        name_pattern = re.compile(args.name_pattern)
+    except re.error as e:
+        arg_parser.error(f"--name-pattern geçersiz düzenli ifade: {e}")
+    missing = {'patient', 'date'} - set(name_pattern.groupindex)
+    if missing:
+        arg_parser.error("--name-pattern şu adlı grupları içermeli: "
+                         + ', '.join(f'(?P<{name}>...)' for name in sorted(missing)))
+
+    if not args.directory.is_dir():
+        print(f"Hata: {args.directory} bir dizin değil.", file=sys.stderr)
+        return 2
+
+    max_in_flight = args.max_in_flight or args.workers * 4
+    store = ResultStore(args.store) if args.store else None
+    pending_rows = []
+    stored = 0
+    unnamed = 0
+    processed = 0
+    failed = 0
+    start = time.perf_counter()
+
+    with open(args.output, 'w', encoding='utf-8') as out:
+        for record in run_batch(find_reports(args.directory, args.recursive), args.workers,
+                                max_in_flight, args.gender, args.nlp, args.layout):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            processed += 1
+            if 'error' in record:
+                failed += 1
+            elif store is not None:
+                match = name_pattern.search(Path(record['file']).stem)
+                if match is None:
+                    unnamed += 1
+                else:
+                    pending_rows += analysis_rows(match.group('patient'), record['analyses'],
+                                                  match.group('date'), record['file'])
+                    # Depoya tek yazıcıdan, büyük işlemlerle eklenir
+                    if len(pending_rows) >= INSERT_BATCH:
+                        stored += store.bulk_insert(pending_rows)
+                        pending_rows = []
+            if processed % 100 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{processed} rapor işlendi ({failed} hata), "
+                      f"{processed / elapsed:.1f} rapor/sn", file=sys.stderr)
+
+    if store is not None:
+        stored += store.bulk_insert(pending_rows)
+        store.close()
+        print(f"Depo: {stored} sonuç eklendi, adı desene uymayan {unnamed} rapor atlandı "
+              f"-> {args.store}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    throughput = processed / elapsed if elapsed > 0 else 0.0
+    print(f"Tamamlandı: {processed} rapor, {failed} hata, {elapsed:.1f} sn, "
+          f"{throughput:.1f} rapor/sn ({args.workers} işçi) -> {args.output}", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Hasta x test tabloları için vektörel sonuç analizi.
+
+Referans aralıkları cinsiyete göre min/max dizilerine bir kez yüklenir;
+durum kodları NumPy karşılaştırmalarıyla tek seferde hesaplanır. Mesaj
+metinleri yalnızca bir hastanın sonucu istendiğinde üretilir.
+"""
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from .reference_index import GENDER_FEMALE, GENDER_MALE, GENDER_NONE, gender_code
+from .result_model import unknown_message
+
+
+# Durum kodları
+MISSING = -1
+NORMAL = 0
+LOW = 1
+HIGH = 2
+UNKNOWN = 3
+
+STATUS_NAMES = {NORMAL: 'normal', LOW: 'low', HIGH: 'high', UNKNOWN: 'unknown'}
+
+
+def encode_gender(gender, rows: int) -> np.ndarray:
+    """Cinsiyet değer(ler)ini ``check_range`` kuralıyla koda çevirir."""
+    if gender is None or isinstance(gender, str):
+        values = [gender]
+    else:
+        values = list(gender)
+        if len(values) != rows:
+            raise ValueError(f'gender uzunluğu ({len(values)}) satır sayısıyla ({rows}) uyuşmuyor')
+
+    codes = np.empty(len(values), dtype=np.int8)
+    cache = {}
+    for index, value in enumerate(values):
+        code = cache.get(value)
+        if code is None:
+            if isinstance(value, float) and np.isnan(value):
+                code = GENDER_NONE
+            else:
+                code = gender_code(value)
+            cache[value] = code
+        codes[index] = code
+
+    if len(values) == 1:
+        return np.full(rows, codes[0], dtype=np.int8)
+    return codes
+
+
+class BatchAnalysis:
+    """``analyze_batch`` sonucu: durum kodları ve hasta başına sayımlar."""
+
+    def __init__(self, reference_index, test_names: List[str], values: np.ndarray,
+                 gender_codes: np.ndarray, status: np.ndarray, index=None):
+        self.reference_index = reference_index
+        self.test_names = test_names
+        self.values = values
+        self.gender_codes = gender_codes
+        self.status = status
+        self.index = index
+
+        present = status != MISSING
+        self.total_tests = present.sum(axis=1)
+        self.normal_count = (status == NORMAL).sum(axis=1)
+        self.abnormal_count = ((status == LOW) | (status == HIGH)).sum(axis=1)
+        self.unknown_count = self.total_tests - self.normal_count - self.abnormal_count
+
+    def __len__(self) -> int:
+        return self.status.shape[0]
+
+    def status_frame(self) -> pd.DataFrame:
+        """Durum kodlarını DataFrame olarak döndürür (-1: değer yok)."""
+        return pd.DataFrame(self.status, columns=self.test_names, index=self.index)
+
+    def summary_frame(self) -> pd.DataFrame:
+        """Hasta başına ``analyze`` özet sayılarını döndürür."""
+        return pd.DataFrame({
+            'total_tests': self.total_tests,
+            'normal_count': self.normal_count,
+            'abnormal_count': self.abnormal_count,
+            'unknown_count': self.unknown_count,
+        }, index=self.index)
+
+    def patient(self, row: int) -> Dict:
+        """Bir hastanın sonucunu ``analyze`` çıktısıyla aynı biçimde üretir."""
+        records = self.reference_index.records
+        gender = int(self.gender_codes[row])
+        analyses = {}
+        for column, test_name in enumerate(self.test_names):
+            code = self.status[row, column]
+            if code == MISSING:
+                continue
+            value = float(self.values[row, column])
+            if code == UNKNOWN:
+                analyses[test_name] = {
+                    'value': value,
+                    'status': 'unknown',
+                    'message': unknown_message(test_name),
+                    'is_normal': None
+                }
+                continue
+            status = STATUS_NAMES[code]
+            record = records[(test_name, gender)]
+            analyses[test_name] = {
+                'value': value,
+                'status': status,
+                'message': record.messages[status],
+                'is_normal': status == 'normal',
+                'reference_range': record.reference_range
+            }
+
+        return {
+            'analyses': analyses,
+            'summary': {
+                'total_tests': int(self.total_tests[row]),
+                'normal_count': int(self.normal_count[row]),
+                'abnormal_count': int(self.abnormal_count[row]),
+                'unknown_count': int(self.unknown_count[row])
+            }
+        }
+
+    def iter_patients(self) -> Iterator[Dict]:
+        for row in range(len(self)):
+            yield self.patient(row)
+
+
+def analyze_batch(analyzer, data, gender=None) -> BatchAnalysis:
+    """``ResultAnalyzer.analyze_batch`` uygulaması."""
+    reference_index = analyzer.reference_index
+    records = reference_index.records
+    index = None
+    if isinstance(data, pd.DataFrame):
+        index = data.index
+        if gender is None and 'gender' in data.columns:
+            gender = data['gender'].tolist()
+        columns = {name: data[name] for name in data.columns if name != 'gender'}
+    else:
+        columns = {name: column for name, column in data.items() if name != 'gender'}
+        if gender is None and 'gender' in data:
+            gender = list(data['gender'])
+
+    test_names = list(columns)
+    values = np.column_stack([
+        np.asarray(columns[name], dtype=np.float64) for name in test_names
+    ]) if test_names else np.empty((0, 0))
+    rows = values.shape[0]
+    gender_codes = encode_gender(gender, rows)
+
+    status = np.full(values.shape, MISSING, dtype=np.int8)
+    for column, test_name in enumerate(test_names):
+        column_values = values[:, column]
+        present = ~np.isnan(column_values)
+        if (test_name, GENDER_NONE) not in records:
+            status[present, column] = UNKNOWN
+            continue
+
+        bounds = [records[(test_name, code)] for code in (GENDER_NONE, GENDER_MALE, GENDER_FEMALE)]
+        mins = np.array([record.min for record in bounds], dtype=np.float64)[gender_codes]
+        maxs = np.array([record.max for record in bounds], dtype=np.float64)[gender_codes]
+
+        codes = np.where(column_values < mins, LOW,
+                         np.where(column_values > maxs, HIGH, NORMAL)).astype(np.int8)
+        status[:, column] = np.where(present, codes, MISSING)
+
+    return BatchAnalysis(reference_index, test_names, values, gender_codes, status, index)
@@ -0,0 +1,230 @@
+"""
+İçerik adresli önbellek modülü.
+
+Ayrıştırma sonuçları ve üretilen ses baytları, girdilerinin SHA-256 özetiyle
+anahtarlanır. Bellekte LRU katmanı, diskte boyut sınırlı ikinci bir katman
+bulunur; tekrar açılan raporlar pdfminer'ı veya ses motorunu yeniden
+çalıştırmadan sunulur.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .parse_report import PARSER_VERSION, ReportParser
+
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('SMART_AUDIO_CACHE_DIR', Path.home() / '.cache' / 'smart-audio-lab-report')
+)
+
+
+def content_key(*parts) -> str:
+    """Verilen parçaların (bayt veya metin) SHA-256 özetini döndürür."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def parse_cache_key(pdf_bytes: bytes, parser_version: str = PARSER_VERSION) -> str:
+    return content_key(b'parse', parser_version, pdf_bytes)
+
+
+def tts_cache_key(text: str, engine: str, language: str, voice_profile: str = 'default') -> str:
+    return content_key(b'tts', engine, language, voice_profile, text)
+
+
+class ContentCache:
+    """Bellek (LRU) ve disk katmanlı bayt önbelleği."""
+
+    def __init__(self, name: str, memory_items: int = 64, disk_dir: Optional[Path] = None,
+                 disk_max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            name: Disk üzerindeki alt dizin adı
+            memory_items: Bellekte tutulacak en fazla kayıt sayısı
+            disk_dir: Disk katmanının kök dizini (None ise disk katmanı kapalı)
+            disk_max_bytes: Disk katmanının en fazla toplam boyutu
+        """
+        self.name = name
+        self.memory_items = memory_items
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_path = Path(disk_dir) / name if disk_dir is not None else None
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_path is not None:
+            try:
+                self.disk_path.mkdir(parents=True, exist_ok=True)
+                self._disk_bytes = sum(p.stat().st_size for p in self.disk_path.glob('*.bin'))
+            except OSError as e:
+                print(f"Önbellek dizini kullanılamıyor, yalnızca bellek kullanılacak: {e}")
+                self.disk_path = None
+
+    def _remember(self, key: str, value: bytes):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Anahtara karşılık gelen baytları döndürür, yoksa None."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+
+        if self.disk_path is not None:
+            path = self.disk_path / f'{key}.bin'
+            try:
+                value = path.read_bytes()
+                os.utime(path)  # LRU tahliyesi için erişim zamanını güncelle
+            except OSError:
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: bytes):
+        """Baytları her iki katmana yazar."""
+        with self._lock:
+            self._remember(key, value)
+
+        if self.disk_path is None or len(value) > self.disk_max_bytes:
+            return
+        path = self.disk_path / f'{key}.bin'
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=self.disk_path, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            existed = path.exists()
+            os.replace(tmp_name, path)
+        except OSError as e:
+            print(f"Önbelleğe yazma hatası: {e}")
+            return
+        with self._lock:
+            if not existed:
+                self._disk_bytes += len(value)
+        if self._disk_bytes > self.disk_max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Toplam boyut sınırın altına inene kadar en eski dosyaları siler."""
+        entries = []
+        for path in self.disk_path.glob('*.bin'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = total
+
+    def get_or_compute(self, key: str, compute: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """Önbellekte yoksa ``compute`` ile üretir ve saklar (None saklanmaz)."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def stats(self) -> Dict:
+        """İsabet/ıska sayaçlarını döndürür."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'name': self.name,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_items': len(self._memory),
+                'disk_bytes': self._disk_bytes,
+            }
+
+
+parse_cache = ContentCache('parse', memory_items=128, disk_dir=DEFAULT_CACHE_DIR,
+                           disk_max_bytes=64 * 1024 * 1024)
+audio_cache = ContentCache('audio', memory_items=32, disk_dir=DEFAULT_CACHE_DIR,
+                           disk_max_bytes=512 * 1024 * 1024)
+
+
+def is_cacheable_parse(parsed: Dict) -> bool:
+    """Hata ya da okunamayan OCR sayfası içermeyen sonuçlar önbelleğe alınır."""
+    return 'error' not in parsed and not parsed.get('ocr', {}).get('failed_pages')
+
+
+def cached_parse(pdf_bytes: bytes, parser: Optional[ReportParser] = None,
+                 cache: Optional[ContentCache] = None) -> Dict:
+    """PDF baytlarını ayrıştırır; aynı içerik için önbellekteki sonucu döndürür.
+
+    Okunamayan PDF'lerin hata sonucu ve OCR'ı başarısız sayfa içeren
+    sonuçlar önbelleğe alınmaz.
+    """
+    cache = cache or parse_cache
+    key = parse_cache_key(pdf_bytes, parser.cache_version if parser else PARSER_VERSION)
+    cached = cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+
+    parser = parser or ReportParser()
+    parsed = parser.parse(pdf_bytes)
+    if is_cacheable_parse(parsed):
+        cache.put(key, json.dumps(parsed, ensure_ascii=False).encode('utf-8'))
+    return parsed
+
+
+def cached_synthesize(text: str, engine: str = 'pyttsx3', language: str = 'tr',
+                      voice_profile: str = 'default',
+                      cache: Optional[ContentCache] = None) -> Optional[bytes]:
+    """Metnin ses baytlarını döndürür; ses motoru yalnızca ıskada oluşturulur.
+
+    gTTS sentezi başarısız olursa ses çevrimdışı motordan (pyttsx3) kendi
+    anahtarıyla üretilir; dönen baytların biçimi ``describe_audio`` ile
+    bulunmalıdır (MP3 yerine WAV/AIFF olabilir).
+    """
+    cache = cache or audio_cache
+
+    def synthesize() -> Optional[bytes]:
+        from .text_to_speech import TextToSpeech
+
+        tts = TextToSpeech(engine=engine, language=language, use_pool=True)
+        if voice_profile != 'default':
+            tts.set_voice_profile(voice_profile)
+        return tts.get_audio_bytes(text)
+
+    audio = cache.get_or_compute(tts_cache_key(text, engine, language, voice_profile), synthesize)
+    if audio is None and engine == 'gtts':
+        return cached_synthesize(text, 'pyttsx3', language, voice_profile, cache)
+    return audio
@@ -1,158 +1,237 @@
 """
 Rapor özeti ve yorumlama metni üretme modülü.
 v0.2: NLP tabanlı özetleme desteği eklendi.
+
+transformers ve torch yalnızca NLP modeli gerçekten yüklenirken içe
+aktarılır; kural tabanlı kullanım bu kütüphanelerin yükleme süresini ödemez.
+Metinler dil kataloğunun şablonuyla üretilir (bkz. locales); aynı analiz
+``generate_locales`` ile birden çok dilde özetlenebilir.
 """
-from typing import Dict, Optional
-try:
-    from transformers import pipeline
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from .locales import DEFAULT_LOCALE, get_catalog
+from .metrics import instrument
+from .result_model import ReportAnalysis
+from .summary_templates import DETAILED, SIMPLE, TREND, SummaryTemplate
+
+# Kütüphaneleri içe aktarmadan yalnızca kurulu olup olmadıklarına bakılır
+TRANSFORMERS_AVAILABLE = find_spec('transformers') is not None and find_spec('torch') is not None
+
+
+DEFAULT_NLP_MODEL = "facebook/bart-large-cnn"
+NLP_BACKENDS = ('pytorch', 'int8', 'onnx')
+
+# ONNX'e dışa aktarılmış modellerin dizini (model başına bir alt dizin);
+# verilmezse önbellek dizini altındaki 'onnx' kullanılır
+ONNX_EXPORT_DIR = os.environ.get('SMART_AUDIO_ONNX_DIR')
+
+# generate çıktısının anahtarları (çıktıdaki sırayla)
+GENERATE_OUTPUTS = (SIMPLE, DETAILED, 'nlp_summary', TREND, 'audio_text')
+
+
+def _test_count(analyses) -> int:
+    if isinstance(analyses, ReportAnalysis):
+        return len(analyses)
+    return len(analyses.get('analyses', {}))
+
+
+def onnx_export_path(model: str, export_dir: Optional[Union[str, Path]] = None) -> Path:
+    """Modelin dışa aktarılmış ONNX dizini (yerel dizinler mutlak yoluyla ayrılır)."""
+    if export_dir is None:
+        from .cache import DEFAULT_CACHE_DIR
+        export_dir = ONNX_EXPORT_DIR or DEFAULT_CACHE_DIR / 'onnx'
+    source = str(Path(model).resolve()) if Path(model).is_dir() else model
+    name = re.sub(r'[^\w.-]+', '_', model.strip('/\\'))[-60:]
+    return Path(export_dir) / f"{name}-{hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _load_onnx(model: str, export_dir: Optional[Union[str, Path]] = None):
+    """ONNX modelini yükler; dışa aktarma model başına yalnızca bir kez yapılır."""
+    # optimum[onnxruntime] isteğe bağlı bir bağımlılıktır
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    path = onnx_export_path(model, export_dir)
+    if path.is_dir():
+        try:
+            return ORTModelForSeq2SeqLM.from_pretrained(path)
+        except Exception as e:
+            print(f"Kaydedilmiş ONNX modeli yüklenemedi, yeniden dışa aktarılıyor: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+    seq2seq = ORTModelForSeq2SeqLM.from_pretrained(model, export=True)
+    # Geçici dizine yazılıp yeniden adlandırılır: yarım kalmış dışa aktarma yüklenmez
+    staging = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.export-', dir=path.parent)
+        seq2seq.save_pretrained(staging)
+        os.rename(staging, path)
+    except Exception as e:
+        # ör. başka bir süreç aynı modeli önce kaydetti
+        if not path.is_dir():
+            print(f"ONNX modeli kaydedilemedi: {e}")
+        if staging is not None:
+            shutil.rmtree(staging, ignore_errors=True)
+    return seq2seq
+
+
+def load_summarizer(model: str = DEFAULT_NLP_MODEL, backend: str = 'pytorch'):
+    """Hugging Face özetleme pipeline'ını yükler.
+
+    Args:
+        model: Model adı veya yerel model dizini (damıtılmış modeller de olur,
+            ör. ``sshleifer/distilbart-cnn-12-6``)
+        backend: 'pytorch' (tam hassasiyet), 'int8' (CPU için dinamik int8
+            nicemleme) veya 'onnx' (optimum + onnxruntime ile ONNX grafiği;
+            dışa aktarılan grafik bir kez kaydedilir, bkz. onnx_export_path)
+    """
+    if backend not in NLP_BACKENDS:
+        raise ValueError(f"Bilinmeyen NLP arka ucu: {backend} (seçenekler: {', '.join(NLP_BACKENDS)})")
+    
     import torch
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    torch = None
+    from transformers import pipeline
+    
+    if backend == 'pytorch':
+        return pipeline(
+            "summarization",
+            model=model,
+            device=0 if torch.cuda.is_available() else -1
+        )
+    
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(model)
+    
+    if backend == 'int8':
+        from transformers import AutoModelForSeq2SeqLM
+        seq2seq = AutoModelForSeq2SeqLM.from_pretrained(model)
+        seq2seq = torch.quantization.quantize_dynamic(seq2seq, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        seq2seq = _load_onnx(model)
+    
+    return pipeline("summarization", model=seq2seq, tokenizer=tokenizer, device=-1)
 
 
 class SummaryGenerator:
     """Laboratuvar sonuçları için özet ve yorumlama metni üretir."""
     
-    def __init__(self, use_nlp: bool = False):
+    def __init__(self, use_nlp: bool = False, use_service: bool = False,
+                 service_timeout: float = 30.0, nlp_model: str = DEFAULT_NLP_MODEL,
+                 nlp_backend: str = 'pytorch', template: Optional[SummaryTemplate] = None,
+                 locale: str = DEFAULT_LOCALE):
+        """
+        Args:
+            use_nlp: NLP tabanlı özetlemeyi etkinleştirir
+            use_service: Modeli bu süreçte yüklemek yerine paylaşılan
+                özetleme servisini kullanır (bkz. summarizer_service)
+            service_timeout: Servis yanıtı için beklenecek en uzun süre (sn);
+                aşılırsa kural tabanlı özet kullanılır
+            nlp_model: Özetleme modeli adı veya yerel dizini
+            nlp_backend: Çıkarım arka ucu ('pytorch', 'int8', 'onnx'),
+                bkz. load_summarizer
+            template: Özet metinlerinin derlenmiş şablonu (bkz. summary_templates);
+                verilmezse ``locale`` dilinin kataloğundaki şablon kullanılır
+            locale: Varsayılan özet dili (bkz. locales.available_locales)
+        """
+        self.template = template or get_catalog(locale).template
         self.use_nlp = use_nlp
         self.summarizer = None
+        self.service = None
+        self.service_timeout = service_timeout
         
         if use_nlp:
             if not TRANSFORMERS_AVAILABLE:
                 print("Transformers kütüphanesi yüklü değil. NLP özetleme kullanılamıyor.")
                 self.use_nlp = False
                 return
+            if use_service:
+                from .summarizer_service import get_summarizer_service
+                self.service = get_summarizer_service(model=nlp_model, backend=nlp_backend)
+                return
             try:
-                self.summarizer = pipeline(
-                    "summarization",
-                    model="facebook/bart-large-cnn",
-                    device=0 if torch.cuda.is_available() else -1
-                )
+                self.summarizer = load_summarizer(nlp_model, nlp_backend)
             except Exception as e:
                 print(f"NLP modeli yüklenemedi, kural tabanlı mod kullanılıyor: {e}")
                 self.use_nlp = False
     
-    def generate_simple_summary(self, analyses: Dict) -> str:
+    def generate_simple_summary(self, analyses: Union[Dict, ReportAnalysis]) -> str:
         """Kural tabanlı basit özet üretir."""
-        summary_parts = []
-        summary_data = analyses.get('summary', {})
-        
-        total = summary_data.get('total_tests', 0)
-        normal = summary_data.get('normal_count', 0)
-        abnormal = summary_data.get('abnormal_count', 0)
-        
-        summary_parts.append(f"Laboratuvar sonuçlarınız analiz edildi. Toplam {total} test değerlendirildi.")
-        
-        if normal > 0:
-            summary_parts.append(f"{normal} test sonucu normal aralıkta.")
-        
-        if abnormal > 0:
-            summary_parts.append(f"{abnormal} test sonucu referans aralığının dışında.")
-        
-        # Anormal sonuçları listele
-        abnormal_results = []
-        for test_name, analysis in analyses.get('analyses', {}).items():
-            if analysis.get('is_normal') is False:
-                abnormal_results.append(analysis.get('message', ''))
-        
-        if abnormal_results:
-            summary_parts.append("\nDikkat gereken sonuçlar:")
-            for result in abnormal_results:
-                summary_parts.append(f"- {result}")
-        
-        # Normal sonuçlar için kısa özet
-        normal_count = 0
-        for test_name, analysis in analyses.get('analyses', {}).items():
-            if analysis.get('is_normal') is True:
-                normal_count += 1
-        
-        if normal_count == total and total > 0:
-            summary_parts.append("\nTüm test sonuçlarınız normal aralıkta. Genel sağlık durumunuz iyi görünüyor.")
-        
-        return "\n".join(summary_parts)
+        return self.template.render(analyses, (SIMPLE,))[SIMPLE]
     
-    def generate_detailed_commentary(self, analyses: Dict) -> str:
+    def generate_detailed_commentary(self, analyses: Union[Dict, ReportAnalysis]) -> str:
         """Detaylı yorumlama metni üretir."""
-        commentary = []
-        commentary.append("=" * 50)
-        commentary.append("DETAYLI LABORATUVAR SONUÇ YORUMU")
-        commentary.append("=" * 50)
-        commentary.append("")
-        
-        # Testleri kategorilere ayır
-        hematology_tests = ['hemoglobin', 'hematocrit', 'wbc', 'rbc', 'platelet']
-        biochemistry_tests = ['glucose', 'cholesterol', 'triglyceride', 'creatinine', 'alt', 'ast']
-        
-        hematology_results = []
-        biochemistry_results = []
-        
-        for test_name, analysis in analyses.get('analyses', {}).items():
-            test_entry = {
-                'name': analysis.get('message', test_name),
-                'value': analysis.get('value'),
-                'unit': analysis.get('unit', ''),
-                'status': analysis.get('status', 'unknown')
-            }
-            
-            if test_name in hematology_tests:
-                hematology_results.append(test_entry)
-            elif test_name in biochemistry_tests:
-                biochemistry_results.append(test_entry)
-        
-        if hematology_results:
-            commentary.append("HEMATOLOJİ (Kan Sayımı) Sonuçları:")
-            commentary.append("-" * 40)
-            for result in hematology_results:
-                status_icon = "✓" if result['status'] == 'normal' else "⚠"
-                commentary.append(f"{status_icon} {result['name']}: {result['value']} {result['unit']}")
-            commentary.append("")
-        
-        if biochemistry_results:
-            commentary.append("BİYOKİMYA Sonuçları:")
-            commentary.append("-" * 40)
-            for result in biochemistry_results:
-                status_icon = "✓" if result['status'] == 'normal' else "⚠"
-                commentary.append(f"{status_icon} {result['name']}: {result['value']} {result['unit']}")
-            commentary.append("")
-        
-        # Genel değerlendirme
-        summary = analyses.get('summary', {})
-        if summary.get('abnormal_count', 0) > 0:
-            commentary.append("ÖNEMLİ NOT:")
-            commentary.append("Bazı test sonuçlarınız referans aralığının dışında.")
-            commentary.append("Lütfen bu sonuçları doktorunuzla görüşün.")
-        else:
-            commentary.append("GENEL DEĞERLENDİRME:")
-            commentary.append("Tüm test sonuçlarınız normal aralıkta.")
-        
-        return "\n".join(commentary)
+        return self.template.render(analyses, (DETAILED,))[DETAILED]
+    
+    def generate_trend_commentary(self, analyses: Union[Dict, ReportAnalysis],
+                                  deltas: Dict[str, Dict]) -> str:
+        """Önceki sonuçlara göre değişimleri anlatan metni üretir (bkz. ResultStore.deltas)."""
+        return self.template.render(analyses, (TREND,), deltas)[TREND]
     
-    def generate(self, analyses: Dict, use_nlp_summary: bool = False) -> Dict:
-        """Özet ve yorumlama metni üretir."""
-        simple_summary = self.generate_simple_summary(analyses)
-        detailed_commentary = self.generate_detailed_commentary(analyses)
+    @instrument('generate.nlp', sizes=lambda args, summary: {'chars': len(args[1])})
+    def summarize_nlp(self, text: str) -> Optional[str]:
+        """Metni NLP modeliyle (servis veya yerel model) özetler; başarısızsa None."""
+        if self.service:
+            if not self.service.available:
+                # Sonlanan servis aynı model ve arka uç için yeniden başlatılır
+                from .summarizer_service import get_summarizer_service
+                self.service = get_summarizer_service(model=self.service.model,
+                                                      backend=self.service.backend)
+            return self.service.summarize(text, timeout=self.service_timeout)
+        try:
+            nlp_result = self.summarizer(
+                text,
+                max_length=150,
+                min_length=50,
+                do_sample=False
+            )
+            return nlp_result[0]['summary_text']
+        except Exception as e:
+            print(f"NLP özetleme hatası: {e}")
+            return None
+    
+    @instrument('generate', sizes=lambda args, result: {'tests': _test_count(args[1]),
+                                                        'chars': len(result.get('audio_text', ''))})
+    def generate(self, analyses: Union[Dict, ReportAnalysis], use_nlp_summary: bool = False,
+                 deltas: Optional[Dict[str, Dict]] = None,
+                 outputs: Optional[Iterable[str]] = None, locale: Optional[str] = None) -> Dict:
+        """Özet ve yorumlama metni üretir.
+
+        ``analyses``, ``analyze`` sözlüğü veya ``analyze_model`` çıktısı olabilir.
+        ``deltas`` verilirse (bkz. ResultStore.deltas) önceki sonuçlara göre
+        değişimler özete ve yorumlamaya eklenir. ``outputs`` verilirse yalnızca
+        bu anahtarlar üretilir (ör. ``('audio_text',)`` ile detaylı yorum hiç
+        oluşturulmaz); varsayılan tüm anahtarlardır. ``locale`` verilirse
+        metinler bu dilde üretilir.
+        """
+        template = self.template if locale is None else get_catalog(locale).template
+        wanted = GENERATE_OUTPUTS if outputs is None else frozenset(outputs)
+        use_nlp = use_nlp_summary and self.use_nlp and (self.service or self.summarizer)
+        needed = {name for name in (SIMPLE, DETAILED, TREND) if name in wanted}
+        if 'audio_text' in wanted:
+            needed.add(SIMPLE)
+        if use_nlp and ('nlp_summary' in wanted or 'audio_text' in wanted):
+            # NLP modeli basit özet ve detaylı yorumun birleşimini özetler
+            needed.update((SIMPLE, DETAILED))
+        rendered = template.render(analyses, needed, deltas)
         
         # NLP tabanlı özet (opsiyonel)
         nlp_summary = None
-        if use_nlp_summary and self.use_nlp and self.summarizer:
-            try:
-                combined_text = simple_summary + "\n\n" + detailed_commentary
-                nlp_result = self.summarizer(
-                    combined_text,
-                    max_length=150,
-                    min_length=50,
-                    do_sample=False
-                )
-                nlp_summary = nlp_result[0]['summary_text']
-            except Exception as e:
-                print(f"NLP özetleme hatası: {e}")
+        if use_nlp and ('nlp_summary' in wanted or 'audio_text' in wanted):
+            nlp_summary = self.summarize_nlp(rendered[SIMPLE] + "\n\n" + rendered[DETAILED])
         
-        return {
-            'simple_summary': simple_summary,
-            'detailed_commentary': detailed_commentary,
-            'nlp_summary': nlp_summary,
-            'audio_text': nlp_summary if nlp_summary else simple_summary
-        }
-
+        rendered['nlp_summary'] = nlp_summary
+        if 'audio_text' in wanted:
+            rendered['audio_text'] = nlp_summary if nlp_summary else rendered[SIMPLE]
+        return {name: rendered[name] for name in GENERATE_OUTPUTS if name in wanted}
+    
+    def generate_locales(self, analyses: Union[Dict, ReportAnalysis], locales: Iterable[str],
+                         use_nlp_summary: bool = False, deltas: Optional[Dict[str, Dict]] = None,
+                         outputs: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """Aynı analizin özetlerini her dil için üretir (dil -> ``generate`` çıktısı)."""
+        return {locale: self.generate(analyses, use_nlp_summary, deltas, outputs, locale)
+                for locale in dict.fromkeys(locales)}
@@ -0,0 +1,196 @@
+"""
+Koordinat bilgisini kullanan tablo tabanlı sonuç çıkarımı.
+
+pdfminer'ın yerleşim analizinde bulduğu her ``LTTextLine`` bir hücre olarak
+konumuyla birlikte alınır; aynı yükseklikteki hücreler satırlarda
+birleştirilir. Sütun rolleri (test / sonuç / birim / referans) sayfa başına
+bir kez, başlık satırından ya da başlık yoksa hücre içeriklerinden
+belirlenir; ardından her satır sütunlara göre eşlenir. Böylece referans
+aralığındaki sayılar veya yan sütundaki birimler sonuç olarak okunmaz.
+Tek hücreden oluşan (tablo olmayan) satırlar satır tabanlı yönteme döner.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTTextContainer, LTTextLine
+
+TEST, VALUE, UNIT, REFERENCE = 'test', 'value', 'unit', 'reference'
+
+# Başlık hücresinin (katlanmış) öneki -> sütun rolü; PDF'te ı/ğ/ş harfleri
+# ASCII karşılıklarına dönüşmüş olabilir
+HEADER_PREFIXES = (
+    ('test', TEST), ('tetkik', TEST), ('parametre', TEST), ('analiz', TEST),
+    ('sonu', VALUE), ('result', VALUE), ('değer', VALUE), ('deger', VALUE),
+    ('birim', UNIT), ('unit', UNIT),
+    ('referans', REFERENCE), ('reference', REFERENCE), ('ref', REFERENCE),
+)
+
+# Bilinen birimlerin küçük harfli yazımı -> standart yazım
+CANONICAL_UNITS = {
+    unit.lower(): unit for unit in (
+        'g/dL', 'mg/dL', 'mg/L', 'U/L', 'IU/L', 'mmol/L', 'x10^9/L', 'x10^12/L', '%', 'fL', 'pg'
+    )
+}
+CANONICAL_UNITS.update({'10^9/l': 'x10^9/L', '10^12/l': 'x10^12/L', 'gr/dl': 'g/dL'})
+
+_VALUE_RE = re.compile(r'^[<>]?\s*(\d+(?:[.,]\d+)?)\s*[*HLhl]?$')
+_RANGE_RE = re.compile(r'^[(\[]?\s*\d+(?:[.,]\d+)?\s*-\s*\d+(?:[.,]\d+)?\s*[)\]]?$')
+
+# Aynı satırdaki hücrelerin dikey merkezleri arasındaki en büyük fark (pt)
+ROW_TOLERANCE = 3.0
+
+# (x0, x1, y merkezi, metin)
+Cell = Tuple[float, float, float, str]
+
+
+def _fold(text: str) -> str:
+    return text.replace('İ', 'i').replace('ı', 'i').lower()
+
+
+def page_cells(page_layout) -> List[Cell]:
+    """Sayfadaki tüm metin satırlarını konumlarıyla birlikte döndürür."""
+    cells = []
+    stack = list(page_layout)
+    while stack:
+        element = stack.pop()
+        if isinstance(element, LTTextLine):
+            text = element.get_text().strip()
+            if text:
+                cells.append((element.x0, element.x1, (element.y0 + element.y1) / 2, text))
+        elif isinstance(element, LTTextContainer):
+            stack.extend(element)
+    return cells
+
+
+def group_rows(cells: Iterable[Cell]) -> List[List[Cell]]:
+    """Hücreleri yukarıdan aşağıya satırlara, satır içinde soldan sağa dizer."""
+    rows: List[List[Cell]] = []
+    row_y = None
+    for cell in sorted(cells, key=lambda c: (-c[2], c[0])):
+        if row_y is None or row_y - cell[2] > ROW_TOLERANCE:
+            rows.append([])
+            row_y = cell[2]
+        rows[-1].append(cell)
+    for row in rows:
+        row.sort(key=lambda c: c[0])
+    return rows
+
+
+def header_role(text: str) -> Optional[str]:
+    folded = _fold(text)
+    for prefix, role in HEADER_PREFIXES:
+        if folded.startswith(prefix):
+            return role
+    return None
+
+
+class ColumnLayout:
+    """Sütun sınırları ve rolleri; hücreler yatay merkezlerine göre eşlenir."""
+
+    __slots__ = ('boundaries', 'roles')
+
+    def __init__(self, header: List[Cell], roles: List[str]):
+        # Ardışık başlıklar arasındaki boşluğun ortası sütun sınırıdır
+        self.boundaries = [(left[1] + right[0]) / 2 for left, right in zip(header, header[1:])]
+        self.roles = roles
+
+    @classmethod
+    def from_header(cls, row: List[Cell]) -> Optional['ColumnLayout']:
+        roles = [header_role(cell[3]) for cell in row]
+        found = {role for role in roles if role}
+        if len(row) < 3 or TEST not in found or VALUE not in found or len(found) < 3:
+            return None
+        return cls(row, roles)
+
+    def assign(self, row: List[Cell]) -> Dict[str, str]:
+        columns: Dict[str, str] = {}
+        for x0, x1, _, text in row:
+            role = self.roles[bisect_right(self.boundaries, (x0 + x1) / 2)]
+            if role and role not in columns:
+                columns[role] = text
+        return columns
+
+
+def classify_cells(row: List[Cell]) -> Dict[str, str]:
+    """Başlık yokken ilk hücreyi test adı, diğerlerini içeriğine göre sınıflar."""
+    columns = {TEST: row[0][3]}
+    for _, _, _, text in row[1:]:
+        if _RANGE_RE.match(text):
+            columns.setdefault(REFERENCE, text)
+        elif _VALUE_RE.match(text):
+            columns.setdefault(VALUE, text)
+        else:
+            columns.setdefault(UNIT, text)
+    return columns
+
+
+def parse_value(text: str) -> Optional[float]:
+    match = _VALUE_RE.match(text.strip())
+    if match is None:
+        return None
+    return float(match.group(1).replace(',', '.'))
+
+
+def normalize_unit(text: str) -> str:
+    text = text.strip()
+    return CANONICAL_UNITS.get(text.lower(), text)
+
+
+class LayoutTableExtractor:
+    """Sayfa yerleşiminden tablo satırlarını okuyup test sonuçlarını çıkarır."""
+
+    def __init__(self, parser):
+        """
+        Args:
+            parser: Test adı eşleyicisi ve satır tabanlı yedek yöntem için ReportParser
+        """
+        self.parser = parser
+
+    def page_results(self, page_layout, layout: Optional[ColumnLayout] = None
+                     ) -> Tuple[Dict[str, Dict], Optional[ColumnLayout], str]:
+        """Tek sayfanın sonuçlarını döndürür.
+
+        Sayfada başlık yoksa önceki sayfanın sütun düzeni (``layout``) kullanılır.
+
+        Returns:
+            (sonuçlar, bu sayfadan sonra geçerli sütun düzeni, sayfa metni)
+        """
+        match_cell = self.parser.matcher.match_cell
+        results: Dict[str, Dict] = {}
+        lines = []
+        for row in group_rows(page_cells(page_layout)):
+            raw_line = ' '.join(cell[3] for cell in row)
+            lines.append(raw_line)
+            if len(row) == 1:
+                # Tablo olmayan satır: satır tabanlı yönteme dön
+                results.update(self.parser.find_results_in_lines((raw_line,)))
+                continue
+            header = ColumnLayout.from_header(row)
+            if header is not None:
+                layout = header
+                continue
+            columns = layout.assign(row) if layout is not None else classify_cells(row)
+            test_name = match_cell(columns.get(TEST, ''))
+            if test_name is None:
+                continue
+            value = parse_value(columns.get(VALUE, ''))
+            if value is None:
+                continue
+            result = {
+                'value': value,
+                'unit': normalize_unit(columns.get(UNIT, '')),
+                'raw_line': raw_line,
+            }
+            if REFERENCE in columns:
+                result['report_reference'] = columns[REFERENCE]
+            results[test_name] = result
+        return results, layout, '\n'.join(lines)
+
+    def iter_pages(self, pdf_input) -> Iterator[Tuple[Dict[str, Dict], str]]:
+        """Her sayfa için (sonuçlar, sayfa metni) üretir."""
+        layout = None
+        for page_layout in extract_pages(pdf_input):
+            results, layout, text = self.page_results(page_layout, layout)
+            yield results, text
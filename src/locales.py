@@ -0,0 +1,107 @@
+"""
+Dil katmanı: derlenmiş mesaj katalogları.
+
+Test adları, durum sözcükleri, sonuç mesajları ve özet cümleleri
+``data/locales/<dil>.json`` dosyalarında tutulur. Her katalog süreç
+genelinde bir kez yüklenip derlenir (özet şablonu dahil) ve tüm
+analizci/özet üreticiler tarafından paylaşılır. Analiz dilden bağımsız
+durum kodları ('normal', 'low', 'high', 'unknown') ve referans aralığı
+üretir; metinler bu kodlardan istenen dilde üretilir. Böylece tek bir
+analiz yeniden ayrıştırma veya analiz yapılmadan birden çok dilde
+özetlenip seslendirilebilir.
+"""
+import json
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from .result_model import ReportAnalysis
+from .summary_templates import CATEGORY_TESTS, OUTPUTS, SummaryTemplate
+
+
+LOCALE_DIR = Path(__file__).parent.parent / 'data' / 'locales'
+DEFAULT_LOCALE = 'tr'
+
+# İstemciden gelen referans metinleriyle mesaj önbelleği sınırsız büyümesin
+MAX_CACHED_MESSAGES = 4096
+
+
+def available_locales(directory: Path = LOCALE_DIR) -> Tuple[str, ...]:
+    return tuple(sorted(path.stem for path in Path(directory).glob('*.json')))
+
+
+class MessageCatalog:
+    """Bir dilin derlenmiş mesajları ve özet şablonu."""
+
+    def __init__(self, locale: str, data: Mapping):
+        self.locale = locale
+        self.name = data.get('name', locale)
+        self.tts_language = data.get('tts_language', locale)
+        self.direction = data.get('direction', 'ltr')
+        self.test_names: Mapping[str, str] = MappingProxyType(dict(data['test_names']))
+        self.status_words: Mapping[str, str] = MappingProxyType(dict(data['status_words']))
+        self.result_message = data['result_message']
+        self._unknown_message = data['unknown_message']
+        # (test, durum, referans) -> mesaj; rapor başına yeni metin üretilmez
+        self._messages: Dict[Tuple[str, str, Optional[str]], str] = {}
+        titles = data['categories']
+        self.template = SummaryTemplate(
+            self, data['summary'], [(titles[key], tests) for key, tests in CATEGORY_TESTS]
+        )
+
+    @classmethod
+    def load(cls, locale: str, directory: Path = LOCALE_DIR) -> 'MessageCatalog':
+        locales = available_locales(directory)
+        if locale not in locales:
+            raise ValueError(f"Bilinmeyen dil: {locale} "
+                             f"(seçenekler: {', '.join(locales)})")
+        with open(Path(directory) / f'{locale}.json', 'r', encoding='utf-8') as f:
+            return cls(locale, json.load(f))
+
+    def test_name(self, test_name: str) -> str:
+        """Testin bu dildeki adı (katalogda yoksa test anahtarı)."""
+        return self.test_names.get(test_name, test_name)
+
+    def message(self, test_name: str, status: str, reference_range: Optional[str] = None) -> str:
+        """Durum kodu ve referans aralığından sonuç mesajını üretir.
+
+        Referans aralığı olmayan veya durumu 'unknown' olan testler için
+        "referans aralığı bulunamadı" mesajı döner.
+        """
+        key = (test_name, status, reference_range)
+        message = self._messages.get(key)
+        if message is None:
+            word = self.status_words.get(status)
+            if word is None or reference_range is None:
+                message = self._unknown_message.format(test=test_name)
+            else:
+                message = self.result_message.format(name=self.test_name(test_name), status=word,
+                                                      reference=reference_range)
+            if len(self._messages) < MAX_CACHED_MESSAGES:
+                self._messages[key] = message
+        return message
+
+    def render(self, analyses: Union[Dict, ReportAnalysis], outputs: Iterable[str] = OUTPUTS,
+               deltas: Optional[Dict[str, Dict]] = None) -> Dict[str, str]:
+        """Analizin özet metinlerini bu dilde üretir (bkz. SummaryTemplate.render)."""
+        return self.template.render(analyses, outputs, deltas)
+
+
+_catalogs: Dict[str, MessageCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(locale: str = DEFAULT_LOCALE) -> MessageCatalog:
+    """Dil için süreç genelinde tek, derlenmiş kataloğu döndürür.
+
+    Raises:
+        ValueError: Dil için katalog dosyası yoksa
+    """
+    catalog = _catalogs.get(locale)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(locale)
+            if catalog is None:
+                catalog = _catalogs[locale] = MessageCatalog.load(locale)
+    return catalog
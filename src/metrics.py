@@ -0,0 +1,309 @@
+"""
+Aşama bazlı süre ölçümü ve profilleme.
+
+``@instrument('parse')`` ile işaretlenen fonksiyonların her çağrısı için
+duvar saati ve CPU süresi, girdi boyutları (sayfa, satır, karakter, test
+sayısı) ve sonuç (ok / failed / error; erken kapatılan üreteçler için
+closed) kaydedilir. Kayıtlar yapılandırılmış JSON log satırları ve
+Prometheus metin biçiminde dışa aktarılabilir.
+
+Ölçüm varsayılan olarak kapalıdır; kapalıyken sarmalayıcı tek bir bayrak
+kontrolü yapar. ``SMART_AUDIO_METRICS=1`` (loglarla birlikte ``log``)
+ortam değişkeni ya da ``enable()`` ile açılır. Tek bir istek
+``profiled()`` bağlamında cProfile ile profillenebilir.
+"""
+import cProfile
+import functools
+import inspect
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger('smart_audio.metrics')
+
+# Prometheus histogramı için gecikme kova sınırları (saniye)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+_enabled = False
+_log_records = False
+_local = threading.local()
+
+
+class StageStats:
+    """Tek bir aşamanın birikmiş ölçümleri."""
+
+    __slots__ = ('count', 'wall_sum', 'cpu_sum', 'wall_max', 'outcomes', 'sizes', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.wall_sum = 0.0
+        self.cpu_sum = 0.0
+        self.wall_max = 0.0
+        self.outcomes: Dict[str, int] = {}
+        self.sizes: Dict[str, float] = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, wall: float, cpu: float, outcome: str, sizes: Dict):
+        self.count += 1
+        self.wall_sum += wall
+        self.cpu_sum += cpu
+        self.wall_max = max(self.wall_max, wall)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        for name, value in sizes.items():
+            self.sizes[name] = self.sizes.get(name, 0) + value
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if wall <= bound:
+                self.buckets[i] += 1
+
+    def as_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'wall_s': round(self.wall_sum, 6),
+            'cpu_s': round(self.cpu_sum, 6),
+            'wall_max_s': round(self.wall_max, 6),
+            'wall_mean_ms': round(self.wall_sum / self.count * 1000, 3) if self.count else 0.0,
+            'outcomes': dict(self.outcomes),
+            'sizes': dict(self.sizes),
+        }
+
+
+class MetricsRegistry:
+    """Süreç genelindeki aşama ölçümlerini iş parçacığı güvenli biçimde toplar."""
+
+    def __init__(self, recent_items: int = 256):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageStats] = {}
+        self.recent = deque(maxlen=recent_items)
+
+    def record(self, stage: str, wall: float, cpu: float, outcome: str, sizes: Dict):
+        entry = {
+            'stage': stage,
+            'wall_ms': round(wall * 1000, 3),
+            'cpu_ms': round(cpu * 1000, 3),
+            'outcome': outcome,
+            'sizes': sizes,
+        }
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(wall, cpu, outcome, sizes)
+            self.recent.append(entry)
+        if _log_records:
+            logger.info(json.dumps(entry, ensure_ascii=False))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {stage: stats.as_dict() for stage, stats in sorted(self._stages.items())}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.recent.clear()
+
+    def prometheus_text(self, prefix: str = 'smart_audio') -> str:
+        """Ölçümleri Prometheus metin gösterim biçiminde döndürür."""
+        with self._lock:
+            stages = sorted(self._stages.items())
+            lines = [
+                f'# HELP {prefix}_stage_seconds Aşama duvar saati süresi',
+                f'# TYPE {prefix}_stage_seconds histogram',
+            ]
+            for stage, stats in stages:
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats.count}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {stats.wall_sum:.6f}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {stats.count}')
+            lines += [
+                f'# HELP {prefix}_stage_cpu_seconds_total Aşama CPU süresi',
+                f'# TYPE {prefix}_stage_cpu_seconds_total counter',
+            ]
+            for stage, stats in stages:
+                lines.append(f'{prefix}_stage_cpu_seconds_total{{stage="{stage}"}} {stats.cpu_sum:.6f}')
+            lines += [
+                f'# HELP {prefix}_stage_calls_total Sonuca göre aşama çağrıları',
+                f'# TYPE {prefix}_stage_calls_total counter',
+            ]
+            for stage, stats in stages:
+                for outcome, count in sorted(stats.outcomes.items()):
+                    lines.append(f'{prefix}_stage_calls_total{{stage="{stage}",outcome="{outcome}"}} {count}')
+            lines += [
+                f'# HELP {prefix}_stage_input_total Aşama girdi boyutları toplamı',
+                f'# TYPE {prefix}_stage_input_total counter',
+            ]
+            for stage, stats in stages:
+                for size, value in sorted(stats.sizes.items()):
+                    lines.append(f'{prefix}_stage_input_total{{stage="{stage}",size="{size}"}} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def enable(log: bool = False):
+    """Ölçümü açar; ``log`` ile her aşama kaydı JSON log satırı olarak da yazılır."""
+    global _enabled, _log_records
+    _enabled = True
+    _log_records = log
+
+
+def disable():
+    global _enabled, _log_records
+    _enabled = False
+    _log_records = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def annotate(**sizes):
+    """Çalışan aşamanın kaydına boyut bilgisi ekler (ölçüm kapalıyken etkisizdir)."""
+    if not _enabled:
+        return
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1].update(sizes)
+
+
+def _outcome_of(result) -> str:
+    if result is None or result is False:
+        return 'failed'
+    if isinstance(result, dict) and result.get('error'):
+        return 'failed'
+    return 'ok'
+
+
+def _measure(stage: str, sizes: Optional[Callable], func: Callable, args, kwargs,
+             returns_value: bool = True):
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    record: Dict = {}
+    stack.append(record)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    outcome = 'error'
+    try:
+        result = func(*args, **kwargs)
+        outcome = _outcome_of(result) if returns_value else 'ok'
+        if sizes is not None:
+            record.update(sizes(args, result))
+        return result
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+        stack.pop()
+        registry.record(stage, wall, cpu, outcome, record)
+
+
+def _measure_generator(stage: str, sizes: Optional[Callable], func: Callable, args, kwargs):
+    # Yalnızca üretecin kendi içinde geçen süre sayılır, tüketicinin süresi sayılmaz
+    wall = cpu = 0.0
+    items = 0
+    outcome = 'closed'
+    generator = func(*args, **kwargs)
+    try:
+        while True:
+            start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                item = next(generator)
+            except StopIteration:
+                outcome = 'ok'
+                return
+            except Exception:
+                outcome = 'error'
+                raise
+            finally:
+                wall += time.perf_counter() - start
+                cpu += time.thread_time() - cpu_start
+            items += 1
+            yield item
+    finally:
+        generator.close()
+        record = {'items': items}
+        if sizes is not None:
+            record.update(sizes(args, None))
+        registry.record(stage, wall, cpu, outcome, record)
+
+
+def instrument(stage: str, sizes: Optional[Callable] = None, returns_value: bool = True):
+    """Fonksiyonu aşama olarak ölçen dekoratör.
+
+    Args:
+        stage: Metriklerde görünecek aşama adı
+        sizes: ``(args, sonuç)`` alıp boyut sözlüğü döndüren fonksiyon
+        returns_value: False ise dönüş değeri sonucu belirlemez (None döndüren
+            işlemler); yalnızca istisna 'error' sayılır, diğer çağrılar 'ok'
+    """
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                return _measure_generator(stage, sizes, func, args, kwargs)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            return _measure(stage, sizes, func, args, kwargs, returns_value)
+        return wrapper
+    return decorator
+
+
+class ProfileResult:
+    """``profiled()`` bağlamından çıkıldığında doldurulan profil çıktısı."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.text = ''
+        self.path: Optional[str] = None
+        self.stats: Optional[pstats.Stats] = None
+
+
+@contextmanager
+def profiled(name: str = 'request', output_dir: Optional[str] = None,
+             top: int = 25, sort: str = 'cumulative'):
+    """Bağlam içindeki kodu cProfile ile profiller.
+
+    En pahalı ``top`` fonksiyonun tablosu ``result.text``'e yazılır;
+    ``output_dir`` (ya da ``SMART_AUDIO_PROFILE_DIR``) verilirse ham
+    istatistikler snakeviz/pstats ile açılabilecek bir .prof dosyasına
+    kaydedilir.
+    """
+    result = ProfileResult(name)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        output = io.StringIO()
+        result.stats = pstats.Stats(profiler, stream=output)
+        result.stats.sort_stats(sort).print_stats(top)
+        result.text = output.getvalue()
+        output_dir = output_dir or os.environ.get('SMART_AUDIO_PROFILE_DIR')
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            result.path = os.path.join(output_dir, f'{name}-{int(time.time() * 1000)}.prof')
+            profiler.dump_stats(result.path)
+
+
+def recent(limit: Optional[int] = None) -> List[Dict]:
+    """Son aşama kayıtlarını (en yenisi sonda) döndürür."""
+    entries = list(registry.recent)
+    return entries[-limit:] if limit else entries
+
+
+_mode = os.environ.get('SMART_AUDIO_METRICS', '').lower()
+if _mode in ('1', 'true', 'on', 'log'):
+    enable(log=_mode == 'log')
@@ -0,0 +1,280 @@
+"""
+Metin katmanı olmayan (taranmış) PDF sayfaları için OCR aşaması.
+
+Yalnızca metin katmanı boş olan sayfalar işlenir. Sayfalar pypdfium2 ile
+sınırlı bir çözünürlükte görüntüye çevrilir ve yerel Tesseract motoruyla
+(pytesseract) okunur; sayfalar süreç havuzundaki işçilere dağıtılır (tek
+işçide havuz kurulmaz). Görüntü içermeyen boş sayfalar okunmaz. OCR
+çıktısı sayfa içeriğinin (içerik akışları ve gömülü görüntüler) özetiyle
+önbelleğe alınır, böylece aynı taranmış sayfa bir daha okunmaz. Sayfa
+başına OCR süresi ``ocr.page`` aşaması olarak ölçümlere yazılır.
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.util import find_spec
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import metrics
+from .cache import DEFAULT_CACHE_DIR, ContentCache, content_key
+
+# Kütüphaneleri içe aktarmadan yalnızca kurulu olup olmadıklarına bakılır
+OCR_AVAILABLE = (
+    find_spec('pytesseract') is not None and find_spec('pypdfium2') is not None
+    and shutil.which('tesseract') is not None
+)
+
+DEFAULT_DPI = int(os.environ.get('SMART_AUDIO_OCR_DPI', '200'))
+MAX_DPI = 300
+# A4 sayfa 300 DPI'da ~8.7 milyon piksel; daha büyük sayfalar küçültülür
+MAX_PIXELS = 9_000_000
+DEFAULT_LANGUAGE = 'tur+eng'
+OCR_WORKERS = int(os.environ.get('SMART_AUDIO_OCR_WORKERS', str(os.cpu_count() or 1)))
+
+# İçerik akışındaki satır içi görüntü (BI ... ID ... EI)
+_INLINE_IMAGE_RE = re.compile(rb'(?:^|\s)BI\s')
+
+ocr_cache = ContentCache('ocr', memory_items=256, disk_dir=DEFAULT_CACHE_DIR,
+                         disk_max_bytes=32 * 1024 * 1024)
+
+
+def page_count(pdf_bytes: bytes) -> int:
+    from pdfminer.pdfpage import PDFPage
+
+    return sum(1 for _ in PDFPage.get_pages(io.BytesIO(pdf_bytes)))
+
+
+def _has_image(resources, depth: int = 0) -> bool:
+    """Kaynaklarda görüntü nesnesi (doğrudan ya da form nesnesi içinde) var mı."""
+    from pdfminer.pdftypes import PDFStream, resolve1
+    from pdfminer.psparser import LIT
+
+    xobjects = resolve1((resources or {}).get('XObject')) or {}
+    for name in xobjects:
+        xobject = resolve1(xobjects[name])
+        if not isinstance(xobject, PDFStream):
+            continue
+        subtype = xobject.get('Subtype')
+        if subtype is LIT('Image'):
+            return True
+        if (subtype is LIT('Form') and depth < 4
+                and _has_image(resolve1(xobject.get('Resources')), depth + 1)):
+            return True
+    return False
+
+
+def scan_pages(pdf_bytes: bytes, indexes: Iterable[int]) -> Dict[int, Tuple[str, bool]]:
+    """İstenen sayfaların içerik özetini ve görüntü içerip içermediğini döndürür.
+
+    Özet sayfanın içerik akışlarını ve kaynaklarındaki gömülü nesnelerin ham
+    verisini kapsar; aynı tarama farklı PDF'lerde de aynı özeti verir. Görüntü
+    nesnesi ve satır içi görüntüsü olmayan (bilerek boş bırakılmış) sayfalar
+    OCR'a gönderilmez.
+    """
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import PDFStream, resolve1
+
+    wanted = set(indexes)
+    pages = {}
+    for index, page in enumerate(PDFPage.get_pages(io.BytesIO(pdf_bytes))):
+        if index not in wanted:
+            continue
+        digest = hashlib.sha256()
+        inline_image = False
+        for stream in page.contents:
+            stream = resolve1(stream)
+            if isinstance(stream, PDFStream):
+                digest.update(stream.get_rawdata() or b'')
+                inline_image = inline_image or _INLINE_IMAGE_RE.search(stream.get_data() or b'') is not None
+        xobjects = resolve1(page.resources.get('XObject')) or {}
+        for name in sorted(xobjects):
+            xobject = resolve1(xobjects[name])
+            if isinstance(xobject, PDFStream):
+                digest.update(name.encode('utf-8') if isinstance(name, str) else bytes(name))
+                digest.update(xobject.get_rawdata() or b'')
+        has_image = inline_image or _has_image(page.resources)
+        pages[index] = (f'{digest.hexdigest()}:{page.mediabox}', has_image)
+        if len(pages) == len(wanted):
+            break
+    return pages
+
+
+def page_hashes(pdf_bytes: bytes, indexes: Iterable[int]) -> Dict[int, str]:
+    """İstenen sayfaların içerik özetlerini döndürür (görüntüye çevirmeden)."""
+    return {index: page_hash for index, (page_hash, _) in scan_pages(pdf_bytes, indexes).items()}
+
+
+def _render_scale(width_pt: float, height_pt: float, dpi: int) -> float:
+    dpi = max(72, min(dpi, MAX_DPI))
+    scale = dpi / 72
+    pixels = width_pt * height_pt * scale * scale
+    if pixels > MAX_PIXELS:
+        scale *= (MAX_PIXELS / pixels) ** 0.5
+    return scale
+
+
+def _ocr_pages_in_worker(pdf_bytes: bytes, indexes: List[int], dpi: int,
+                         language: str) -> List[Tuple[int, str, float, float]]:
+    """İşçi süreçte sayfaları görüntüye çevirip okur.
+
+    Returns:
+        (sayfa sırası, metin, duvar saati sn, CPU sn) listesi; okunamayan
+        sayfalar listede yer almaz
+    """
+    import pypdfium2
+    import pytesseract
+
+    document = pypdfium2.PdfDocument(pdf_bytes)
+    pages = []
+    try:
+        for index in indexes:
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                page = document[index]
+                width, height = page.get_size()
+                image = page.render(scale=_render_scale(width, height, dpi), grayscale=True).to_pil()
+                page.close()
+                text = pytesseract.image_to_string(image, lang=language)
+            except Exception as e:
+                print(f"OCR hatası (sayfa {index + 1}): {e}")
+                continue
+            pages.append((index, text, time.perf_counter() - wall, time.process_time() - cpu))
+    finally:
+        document.close()
+    return pages
+
+
+def configure_workers(workers: int):
+    """Bu süreçteki OCR işçi sayısını ayarlar.
+
+    1 ise havuz kurulmaz, sayfalar çağıran süreçte okunur. Kendisi bir süreç
+    havuzu işçisi olan süreçler (toplu işleme, API ayrıştırma) iç içe havuz
+    kurmamak için 1 kullanır.
+    """
+    global OCR_WORKERS
+    OCR_WORKERS = max(1, workers)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_ocr_executor() -> ProcessPoolExecutor:
+    """Süreç genelinde tek OCR işçi havuzunu döndürür."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: Streamlit/uvicorn iş parçacıkları çatallanmaz
+            _executor = ProcessPoolExecutor(max_workers=OCR_WORKERS,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """Çöken havuzu bırakır; sonraki çağrı yeni bir havuz kurar."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def ocr_pages(pdf_bytes: bytes, indexes: Iterable[int], dpi: int = DEFAULT_DPI,
+              language: str = DEFAULT_LANGUAGE, workers: Optional[int] = None,
+              cache: Optional[ContentCache] = None) -> Dict:
+    """Verilen sayfaları (0 tabanlı sıra) OCR ile okur.
+
+    Önbellekte olmayan sayfalar işçi sayısı kadar gruba bölünür; PDF
+    baytları her gruba bir kez gönderilir.
+
+    Returns:
+        'texts' (sayfa sırası -> metin), 'page_ms' (yalnızca OCR yapılan
+        sayfaların süresi), 'cached' (önbellekten gelen sayfa sayısı),
+        'skipped' (görüntü içermediği için okunmayan sayfalar) ve 'failed'
+        (OCR hatası nedeniyle metni olmayan sayfalar)
+    """
+    indexes = sorted(set(indexes))
+    cache = cache or ocr_cache
+    result = {'texts': {}, 'page_ms': {}, 'cached': 0, 'skipped': [], 'failed': []}
+    if not indexes:
+        return result
+    if not OCR_AVAILABLE:
+        print("OCR kullanılamıyor: pytesseract, pypdfium2 ve tesseract kurulu olmalı.")
+        result['failed'] = indexes
+        return result
+
+    keys = {}
+    for index, (page_hash, has_image) in scan_pages(pdf_bytes, indexes).items():
+        if has_image:
+            keys[index] = content_key(b'ocr', language, str(dpi), page_hash)
+        else:
+            result['texts'][index] = ''
+            result['skipped'].append(index)
+    missing = []
+    for index in indexes:
+        if index in result['texts']:
+            continue
+        cached = cache.get(keys[index]) if index in keys else None
+        if cached is not None:
+            result['texts'][index] = cached.decode('utf-8')
+            result['cached'] += 1
+        else:
+            missing.append(index)
+
+    if missing:
+        _read_missing(result, pdf_bytes, missing, dpi, language, workers, keys, cache)
+        result['failed'] = [index for index in missing if index not in result['texts']]
+    return result
+
+
+def _read_missing(result: Dict, pdf_bytes: bytes, missing: List[int], dpi: int, language: str,
+                  workers: Optional[int], keys: Dict[int, str], cache: ContentCache):
+    workers = max(1, min(workers or OCR_WORKERS, len(missing)))
+    if workers == 1:
+        try:
+            pages = _ocr_pages_in_worker(pdf_bytes, missing, dpi, language)
+        except Exception as e:
+            print(f"OCR hatası: {e}")
+            return
+        _collect(result, pages, keys, cache)
+        return
+    executor = get_ocr_executor()
+    try:
+        futures = [
+            executor.submit(_ocr_pages_in_worker, pdf_bytes, missing[start::workers], dpi, language)
+            for start in range(workers)
+        ]
+    except BrokenProcessPool as e:
+        print(f"OCR hatası: {e}")
+        _discard_executor(executor)
+        return
+    for future in futures:
+        try:
+            pages = future.result()
+        except BrokenProcessPool as e:
+            print(f"OCR hatası: {e}")
+            _discard_executor(executor)
+            break
+        except Exception as e:
+            print(f"OCR hatası: {e}")
+            continue
+        _collect(result, pages, keys, cache)
+
+
+def _collect(result: Dict, pages: List[Tuple[int, str, float, float]], keys: Dict[int, str],
+             cache: ContentCache):
+    for index, text, wall, cpu in pages:
+        result['texts'][index] = text
+        result['page_ms'][index] = round(wall * 1000, 1)
+        if index in keys:
+            cache.put(keys[index], text.encode('utf-8'))
+        if metrics.is_enabled():
+            metrics.registry.record('ocr.page', wall, cpu, 'ok' if text.strip() else 'failed',
+                                    {'chars': len(text)})
@@ -1,15 +1,178 @@
 """
 PDF laboratuvar raporu okuma ve ayrıştırma modülü.
 """
+import io
 import re
-from typing import Dict, Optional
-from pdfminer.high_level import extract_text
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from pdfminer.high_level import extract_pages, extract_text
+from pdfminer.layout import LTTextContainer
+
+from .metrics import annotate, instrument
+
+
+# Ayrıştırma çıktısını etkileyen her değişiklikte artırılmalıdır (önbellek anahtarı)
+PARSER_VERSION = '3'
+
+_NUMBER_RE = re.compile(r'(\d+[.,]?\d*)')
+
+# Dosya yolu, bellekteki PDF baytları veya ikili dosya benzeri nesne
+PdfSource = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+
+def _as_pdf_input(source: PdfSource):
+    """Bellekteki baytları pdfminer'ın okuyabileceği bir akışa çevirir."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def _read_pdf_bytes(source: PdfSource) -> bytes:
+    """Kaynağın tüm PDF baytlarını döndürür (OCR işçilerine gönderilmek üzere)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read()
+    position = source.tell()
+    try:
+        source.seek(0)
+        return source.read()
+    finally:
+        source.seek(position)
+
+
+class TestMatcher:
+    """Test desenlerini tek bir derlenmiş anahtar kelime indeksinde birleştirir.
+
+    Yalnızca düz metin alternatiflerinden oluşan desenler (ör. ``Hb|Hemoglobin``)
+    önek ağacı (trie) biçiminde tek bir regex'e derlenir; böylece her satır
+    desen sayısından bağımsız olarak tek taramada sınıflandırılır. Regex
+    özel karakteri içeren desenler ayrıca derlenip yalnızca gerektiğinde
+    denenir. Bir satırda birden fazla test adı geçiyorsa, önceki davranışla
+    uyumlu olarak sözlükte önce tanımlanan test seçilir.
+    """
+
+    _REGEX_CHARS = frozenset('\\.^$*+?{}[]()')
+
+    def __init__(self, patterns: Dict[str, str]):
+        self.test_names: List[str] = list(patterns)
+        self._patterns: List[re.Pattern] = [
+            re.compile(pattern, re.IGNORECASE) for pattern in patterns.values()
+        ]
+        self._keywords: Dict[str, int] = {}
+        self._regex_indexes: List[int] = []
+
+        for index, pattern in enumerate(patterns.values()):
+            parts = pattern.split('|')
+            if self._REGEX_CHARS.isdisjoint(pattern) and all(parts):
+                for part in parts:
+                    self._keywords.setdefault(_fold(part), index)
+            else:
+                self._regex_indexes.append(index)
+
+        self._keyword_re = None
+        if self._keywords:
+            self._keyword_re = re.compile(
+                f'(?=({_trie_pattern(self._keywords)}))', re.IGNORECASE
+            )
+        self._regex_prefilter = None
+        if self._regex_indexes:
+            self._regex_prefilter = re.compile(
+                '|'.join(f'(?:{self._patterns[i].pattern})' for i in self._regex_indexes),
+                re.IGNORECASE
+            )
+
+    def match(self, line: str) -> Optional[str]:
+        """Satırdaki test adını döndürür, eşleşme yoksa None."""
+        best = len(self.test_names)
+
+        if self._keyword_re is not None:
+            keywords = self._keywords
+            for found in self._keyword_re.finditer(line):
+                text = _fold(found.group(1))
+                if text not in keywords:
+                    # Katlama eşlemesi tutmadı (nadir Unicode durumu), tam tarama yap
+                    return self._match_slow(line)
+                # Aynı konumdan başlayan daha kısa anahtar kelimeler de eşleşir
+                for end in range(1, len(text) + 1):
+                    index = keywords.get(text[:end])
+                    if index is not None and index < best:
+                        best = index
+
+        if self._regex_prefilter is not None and self._regex_prefilter.search(line):
+            for index in self._regex_indexes:
+                if index >= best:
+                    break
+                if self._patterns[index].search(line):
+                    best = index
+                    break
+
+        return self.test_names[best] if best < len(self.test_names) else None
+
+    def match_cell(self, cell: str) -> Optional[str]:
+        """Tablo hücresindeki test adını döndürür.
+
+        Hücre bir anahtar kelimenin kendisiyse tek sözlük aramasıyla çözülür;
+        aksi halde ``match`` ile taranır.
+        """
+        index = self._keywords.get(_fold(cell.strip()))
+        if index is not None:
+            return self.test_names[index]
+        return self.match(cell) if cell else None
+
+    def _match_slow(self, line: str) -> Optional[str]:
+        for test_name, pattern in zip(self.test_names, self._patterns):
+            if pattern.search(line):
+                return test_name
+        return None
+
+    def iter_matches(self, lines: Iterable[str]) -> Iterable[Tuple[str, str]]:
+        """Eşleşen satırları (test adı, satır) çiftleri olarak üretir."""
+        match = self.match
+        for line in lines:
+            test_name = match(line)
+            if test_name is not None:
+                yield test_name, line
+
+
+def _fold(text: str) -> str:
+    """Büyük/küçük harf duyarsız karşılaştırma için Türkçe i/ı/İ uyumlu katlama."""
+    return text.replace('İ', 'i').replace('ı', 'i').lower()
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Kelime listesinden ortak önekleri paylaşan bir regex üretir."""
+    root: Dict = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def emit(node: Dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Kelime bu düğümde bitebiliyorsa devamı isteğe bağlıdır (en uzun eşleşme)
+        return f'(?:{body})?' if '' in node else body
+
+    return emit(root)
 
 
 class ReportParser:
     """Laboratuvar raporlarını PDF'den okur ve yapılandırılmış veriye dönüştürür."""
     
-    def __init__(self):
+    def __init__(self, layout: bool = False, ocr: bool = True):
+        """
+        Args:
+            layout: Sonuçları satır metni yerine sayfa yerleşiminden, tablo
+                sütunlarına göre çıkar (bkz. layout_parse)
+            ocr: Metin katmanı boş sayfaları OCR ile oku (bkz. ocr; motor
+                kurulu değilse bu sayfalar atlanır)
+        """
+        self.layout = layout
+        self.ocr = ocr
         self.test_patterns = {
             'hemoglobin': r'Hb|Hemoglobin',
             'hematocrit': r'Hct|Hematokrit',
@@ -23,20 +186,46 @@ class ReportParser:
             'alt': r'ALT|Alanin Aminotransferaz',
             'ast': r'AST|Aspartat Aminotransferaz',
         }
+        self.compile_patterns()
+    
+    def compile_patterns(self):
+        """test_patterns sözlüğünü derler; desenler değiştirilirse tekrar çağrılmalıdır."""
+        self.matcher = TestMatcher(self.test_patterns)
+
+    @property
+    def cache_version(self) -> str:
+        """Önbellek anahtarına giren, ayrıştırma yöntemini ve OCR ayarını da içeren sürüm."""
+        version = f'{PARSER_VERSION}-layout' if self.layout else PARSER_VERSION
+        return version if self.ocr else f'{version}-noocr'
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """PDF dosyasından metin çıkarır."""
+    @instrument('parse.extract_text', sizes=lambda args, text: {'chars': len(text or '')})
+    def extract_text_from_pdf(self, pdf_path: PdfSource) -> str:
+        """PDF dosyasından (yol, bayt veya dosya nesnesi) metin çıkarır."""
         try:
-            text = extract_text(pdf_path)
+            text = extract_text(_as_pdf_input(pdf_path))
             return text
         except Exception as e:
             print(f"PDF okuma hatası: {e}")
             return ""
     
+    def iter_pages_text(self, pdf_path: PdfSource) -> Iterator[str]:
+        """PDF sayfalarını tek tek okuyup her sayfanın metnini üretir.
+
+        Belgenin tamamı belleğe alınmaz; pdfminer sayfaları ihtiyaç oldukça işler.
+        """
+        try:
+            for page_layout in extract_pages(_as_pdf_input(pdf_path)):
+                yield ''.join(
+                    element.get_text() for element in page_layout
+                    if isinstance(element, LTTextContainer)
+                )
+        except Exception as e:
+            print(f"PDF okuma hatası: {e}")
+    
     def parse_numeric_value(self, text: str) -> Optional[float]:
         """Metinden sayısal değer çıkarır."""
         # Sayıları ve ondalık değerleri bulur
-        match = re.search(r'(\d+[.,]?\d*)', text.replace(',', '.'))
+        match = _NUMBER_RE.search(text.replace(',', '.'))
         if match:
             try:
                 return float(match.group(1))
@@ -44,46 +233,215 @@ class ReportParser:
                 return None
         return None
     
+    @instrument('parse.find_results', sizes=lambda args, results: {'lines': args[1].count('\n') + 1,
+                                                                   'tests': len(results)})
     def find_test_results(self, text: str) -> Dict[str, Dict]:
         """Metinde test sonuçlarını bulur ve yapılandırır."""
+        return self.find_results_in_lines(text.split('\n'))
+    
+    def find_results_in_lines(self, lines: Iterable[str]) -> Dict[str, Dict]:
+        """Satır akışındaki test sonuçlarını bulur (satırlar üreteç olabilir)."""
         results = {}
-        lines = text.split('\n')
         
-        for line in lines:
-            line_upper = line.upper()
-            for test_name, pattern in self.test_patterns.items():
-                if re.search(pattern, line_upper, re.IGNORECASE):
-                    value = self.parse_numeric_value(line)
-                    if value is not None:
-                        results[test_name] = {
-                            'value': value,
-                            'unit': self.extract_unit(line),
-                            'raw_line': line.strip()
-                        }
-                    break
+        for test_name, line in self.matcher.iter_matches(lines):
+            value = self.parse_numeric_value(line)
+            if value is not None:
+                results[test_name] = {
+                    'value': value,
+                    'unit': self.extract_unit(line),
+                    'raw_line': line.strip()
+                }
         
         return results
     
     def extract_unit(self, text: str) -> str:
         """Metinden birim bilgisini çıkarır."""
-        common_units = ['g/dL', 'mg/dL', 'mg/L', 'U/L', 'IU/L', 'mmol/L', 
+        # Başka bir birimin parçası olanlar (g/dL ⊂ mg/dL, U/L ⊂ IU/L) sonra denenir
+        common_units = ['mg/dL', 'g/dL', 'mg/L', 'IU/L', 'U/L', 'mmol/L',
                        'x10^9/L', 'x10^12/L', '%', 'fL', 'pg']
         for unit in common_units:
             if unit in text:
                 return unit
         return ""
     
-    def parse(self, pdf_path: str) -> Dict:
-        """Ana parsing fonksiyonu."""
+    @instrument('parse', sizes=lambda args, result: {'tests': len(result['results'])})
+    def parse(self, pdf_path: PdfSource) -> Dict:
+        """Ana parsing fonksiyonu.
+
+        ``pdf_path`` bir dosya yolu, PDF baytları ya da ikili dosya benzeri
+        nesne olabilir; yüklenen dosyalar diske yazılmadan ayrıştırılır.
+        """
+        if self.layout:
+            return self.parse_layout(pdf_path)
         text = self.extract_text_from_pdf(pdf_path)
-        if not text:
+        ocr_info = None
+        if self.ocr:
+            # extract_text her sayfanın sonuna \f ekler
+            pages = text.split('\f')[:-1]
+            ocr_info = self._ocr_empty_pages(pdf_path, pages)
+            if ocr_info is not None:
+                text = '\f'.join(pages) + '\f'
+        if not text.strip():
             return {'error': 'PDF okunamadı', 'results': {}}
+        annotate(pages=text.count('\f') or 1, lines=text.count('\n') + 1, chars=len(text))
         
         results = self.find_test_results(text)
         
-        return {
+        parsed = {
             'raw_text': text[:500],  # İlk 500 karakter
             'results': results,
             'test_count': len(results)
         }
+        if ocr_info is not None:
+            parsed['ocr'] = ocr_info
+        return parsed
+
+    def _ocr_empty_pages(self, pdf_path: PdfSource, pages: List[str],
+                         first_page: int = 0) -> Optional[Dict]:
+        """Metni boş sayfaları OCR çıktısıyla yerinde doldurur.
+
+        ``pages`` PDF'in ``first_page`` sırasından başlayan sayfalarıdır; liste
+        boşsa (metin hiç okunamadıysa) sayfa sayısı PDF'ten bulunur ve liste
+        doldurulur. OCR yapılmadıysa None döner.
+        """
+        empty = [index for index, page in enumerate(pages) if not page.strip()]
+        if pages and not empty:
+            return None
+        from .ocr import OCR_AVAILABLE, ocr_pages, page_count
+
+        if not OCR_AVAILABLE:
+            return None
+        try:
+            pdf_bytes = _read_pdf_bytes(pdf_path)
+            if not pages:
+                pages.extend([''] * page_count(pdf_bytes))
+                empty = list(range(len(pages)))
+        except Exception as e:
+            print(f"PDF okuma hatası: {e}")
+            return None
+        if not empty:
+            return None
+        ocr = ocr_pages(pdf_bytes, [first_page + index for index in empty])
+        for index, text in ocr['texts'].items():
+            pages[index - first_page] = text
+        unread = set(ocr['skipped']) | set(ocr['failed'])
+        read = [first_page + index for index in empty if first_page + index not in unread]
+        if not read and not ocr['failed']:
+            # Yalnızca görüntüsüz (boş) sayfalar vardı
+            return None
+        annotate(ocr_pages=len(read), ocr_cached=ocr['cached'], ocr_failed=len(ocr['failed']))
+        info = {
+            'pages': [index + 1 for index in read],
+            'cached': ocr['cached'],
+            'page_ms': {str(index + 1): ms for index, ms in ocr['page_ms'].items()},
+        }
+        if ocr['failed']:
+            # Sonuç eksiktir; önbelleğe alınmaz (bkz. cache.is_cacheable_parse)
+            info['failed_pages'] = [index + 1 for index in ocr['failed']]
+        return info
+    
+    @instrument('parse.layout', sizes=lambda args, result: {'tests': len(result['results'])})
+    def parse_layout(self, pdf_path: PdfSource) -> Dict:
+        """Sonuçları sayfa yerleşimindeki tablo sütunlarına göre çıkarır.
 
+        Çıktı ``parse`` ile aynı biçimdedir; raporda referans aralığı sütunu
+        varsa sonuçlara ``report_reference`` olarak eklenir.
+        """
+        page_results, pages = [], []
+        for found, page_text in self._iter_layout_pages(pdf_path):
+            page_results.append(found)
+            pages.append(page_text)
+        ocr_info = self._ocr_empty_pages(pdf_path, pages) if self.ocr else None
+        if ocr_info is not None:
+            # pdfminer hiç sayfa veremediyse sayfa listesi OCR için PDF'ten doldurulmuştur
+            page_results.extend({} for _ in range(len(pages) - len(page_results)))
+            # Taranmış sayfalarda sütun bilgisi yoktur, satır tabanlı okunur
+            for page_number in ocr_info['pages']:
+                page_results[page_number - 1] = self.find_results_in_lines(
+                    pages[page_number - 1].split('\n')
+                )
+        results = {}
+        for found in page_results:
+            results.update(found)
+        text = '\f'.join(pages)
+        if not text.strip():
+            return {'error': 'PDF okunamadı', 'results': {}}
+        annotate(pages=len(pages), lines=text.count('\n') + 1, chars=len(text))
+
+        parsed = {
+            'raw_text': text[:500],
+            'results': results,
+            'test_count': len(results)
+        }
+        if ocr_info is not None:
+            parsed['ocr'] = ocr_info
+        return parsed
+
+    def _iter_layout_pages(self, pdf_path: PdfSource) -> Iterator[Tuple[Dict[str, Dict], str]]:
+        from .layout_parse import LayoutTableExtractor
+
+        try:
+            yield from LayoutTableExtractor(self).iter_pages(_as_pdf_input(pdf_path))
+        except Exception as e:
+            print(f"PDF okuma hatası: {e}")
+
+    def _iter_page_results(self, pdf_path: PdfSource) -> Iterator[Tuple[Dict[str, Dict], str]]:
+        if self.layout:
+            pages = self._iter_layout_pages(pdf_path)
+        else:
+            pages = ((self.find_results_in_lines(page_text.split('\n')), page_text)
+                     for page_text in self.iter_pages_text(pdf_path))
+        # Ardışık metinsiz sayfalar biriktirilir ve tek OCR çağrısıyla (havuzda) okunur
+        pending: List[Tuple[Dict[str, Dict], str]] = []
+        for index, (page_results, page_text) in enumerate(pages):
+            if self.ocr and not page_text.strip():
+                pending.append((page_results, page_text))
+                continue
+            if pending:
+                yield from self._ocr_page_run(pdf_path, pending, index - len(pending))
+                pending = []
+            yield page_results, page_text
+        if pending:
+            yield from self._ocr_page_run(pdf_path, pending, index + 1 - len(pending))
+
+    def _ocr_page_run(self, pdf_path: PdfSource, run: List[Tuple[Dict[str, Dict], str]],
+                      first_page: int) -> Iterator[Tuple[Dict[str, Dict], str]]:
+        """``first_page`` sırasından başlayan ardışık metinsiz sayfaları OCR ile okur."""
+        texts = [page_text for _, page_text in run]
+        if self._ocr_empty_pages(pdf_path, texts, first_page=first_page) is None:
+            yield from run
+            return
+        for page_text in texts:
+            yield self.find_results_in_lines(page_text.split('\n')), page_text
+
+    def iter_parse(self, pdf_path: PdfSource, stop_when_complete: bool = False) -> Iterator[Dict]:
+        """Raporu sayfa sayfa ayrıştırır ve her sayfa için kısmi sonuç üretir.
+
+        Her öğe o sayfada bulunan yeni sonuçları (``page_results``) ve o ana
+        kadar biriken sonuçları (``results``) içerir. Aynı test birden fazla
+        sayfada geçerse ``parse`` ile aynı şekilde son değer geçerli olur.
+        ``stop_when_complete`` açıksa test_patterns içindeki tüm testler
+        bulunduğunda kalan sayfalar okunmaz.
+        """
+        results = {}
+        raw_text = ''
+        
+        pages = self._iter_page_results(pdf_path)
+        for page_number, (page_results, page_text) in enumerate(pages, start=1):
+            if len(raw_text) < 500:
+                raw_text += page_text[:500 - len(raw_text)]
+            
+            results.update(page_results)
+            complete = len(results) == len(self.test_patterns)
+            
+            yield {
+                'page': page_number,
+                'page_results': page_results,
+                'raw_text': raw_text,
+                'results': dict(results),
+                'test_count': len(results),
+                'complete': complete
+            }
+            
+            if stop_when_complete and complete:
+                return
@@ -0,0 +1,307 @@
+"""
+Şablon özetler için cümle parçası ses kütüphanesi.
+
+``generate_simple_summary`` metninin büyük kısmı sabit cümlelerden, test
+adı/durum/birim parçalarından ve sayılardan oluşur. Bu parçalar motor ve
+ses profili başına bir kez sentezlenip önbelleğe alınır; bir raporun sesi
+önbellekteki parçaların PCM verileri (WAV) ya da MP3 çerçeveleri uç uca
+eklenerek oluşturulur. Çoğu rapor ses motoru hiç çağrılmadan seslendirilir.
+"""
+import io
+import re
+import string
+import threading
+import wave
+from typing import Dict, Iterable, List, Optional
+
+from .cache import ContentCache, audio_cache, tts_cache_key
+from .locales import get_catalog
+from .text_to_speech import describe_audio
+
+
+# Parçalar bu dilin özet cümleleridir; diğer dillerde tüm metin sentezlenir
+PHRASE_LOCALE = 'tr'
+
+_CATALOG = get_catalog(PHRASE_LOCALE)
+_SUMMARY = _CATALOG.template
+
+# Katalogdaki açılış "... analiz edildi. Toplam " sayıdan önceki sözcükle biter
+OPENING, TOTAL_PREFIX = _SUMMARY.opening.strip().rsplit(' ', 1)
+TOTAL_SUFFIX = _SUMMARY.total_suffix[0].strip()
+NORMAL_SUFFIX = _SUMMARY.normal_suffix[0].strip()
+ABNORMAL_SUFFIX = _SUMMARY.abnormal_suffix[0].strip()
+ATTENTION = _SUMMARY.attention.strip()
+ALL_NORMAL = _SUMMARY.all_normal.strip()
+# Aralığın ve sayıların okunuşu katalogda yoktur
+RANGE_SEPARATOR = "ile"
+INFINITY = "sonsuz"
+
+STATUS_WORDS = (_CATALOG.status_words['low'], _CATALOG.status_words['high'])
+UNITS = ('g/dL', 'mg/dL', 'mg/L', 'U/L', 'IU/L', 'mmol/L', 'x10^9/L', 'x10^12/L', '%', 'fL', 'pg')
+
+
+def _message_pattern(template: str):
+    """Katalogdaki sonuç mesajı şablonundan mesajı parçalayan ifade ve seslendirme sırası.
+
+    Sıra, alan adları ('name', 'status', 'reference') ile alanlar arasındaki
+    sabit sözcüklerden (ör. 'değeri', 'referans:') oluşur; parantezler okunmaz.
+    """
+    fields = {
+        'name': r'(?P<name>.+)',
+        'status': f"(?P<status>{'|'.join(map(re.escape, STATUS_WORDS))})",
+        'reference': r'(?P<min>[^-\s]+)-(?P<max>[^\s]+) ?(?P<unit>.*)',
+    }
+    pattern, order, literals = '', [], []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        pattern += re.escape(literal)
+        spoken = literal.strip(' ()')
+        if spoken:
+            order.append(('literal', spoken))
+            literals.append(spoken)
+        if field is not None:
+            pattern += fields[field]
+            order.append(('field', field))
+    return re.compile(f'^{pattern}$'), tuple(order), tuple(literals)
+
+
+_MESSAGE_RE, _MESSAGE_ORDER, MESSAGE_PHRASES = _message_pattern(_CATALOG.result_message)
+
+STATIC_PHRASES = (
+    OPENING, TOTAL_PREFIX, TOTAL_SUFFIX, NORMAL_SUFFIX, ABNORMAL_SUFFIX,
+    ATTENTION, ALL_NORMAL, *MESSAGE_PHRASES, RANGE_SEPARATOR, INFINITY,
+)
+
+_ONES = ('', 'bir', 'iki', 'üç', 'dört', 'beş', 'altı', 'yedi', 'sekiz', 'dokuz')
+_TENS = ('', 'on', 'yirmi', 'otuz', 'kırk', 'elli', 'altmış', 'yetmiş', 'seksen', 'doksan')
+NUMBER_WORDS = tuple(word for word in _ONES + _TENS if word) + ('sıfır', 'yüz', 'bin', 'milyon', 'virgül')
+
+
+def _hundreds_to_words(number: int) -> List[str]:
+    words = []
+    hundreds, rest = divmod(number, 100)
+    if hundreds:
+        if hundreds > 1:
+            words.append(_ONES[hundreds])
+        words.append('yüz')
+    tens, ones = divmod(rest, 10)
+    if tens:
+        words.append(_TENS[tens])
+    if ones:
+        words.append(_ONES[ones])
+    return words
+
+
+def number_to_words(text: str) -> List[str]:
+    """Sayı metnini Türkçe sayı sözcüklerine böler (ör. '13.5' -> on üç virgül beş)."""
+    if text == 'inf':
+        return [INFINITY]
+    integer_part, _, fraction = text.partition('.')
+    number = int(integer_part)
+    words: List[str] = []
+    if number == 0:
+        words.append('sıfır')
+    millions, number = divmod(number, 1_000_000)
+    thousands, number = divmod(number, 1000)
+    if millions:
+        words += _hundreds_to_words(millions) + ['milyon']
+    if thousands:
+        # Türkçede 1000 "bir bin" değil "bin" okunur
+        words += (_hundreds_to_words(thousands) if thousands > 1 else []) + ['bin']
+    words += _hundreds_to_words(number)
+    if fraction and fraction.strip('0'):
+        words.append('virgül')
+        leading_zeros = len(fraction) - len(fraction.lstrip('0'))
+        words += ['sıfır'] * leading_zeros + number_to_words(fraction.lstrip('0'))
+    return words
+
+
+def summary_phrases(analyses: Dict) -> Optional[List[str]]:
+    """``generate_simple_summary`` metnini seslendirme parçalarına ayırır.
+
+    Kütüphanede karşılığı olmayan bir mesaj biçimiyle karşılaşılırsa None döner.
+    """
+    summary = analyses.get('summary', {})
+    total = summary.get('total_tests', 0)
+    normal = summary.get('normal_count', 0)
+    abnormal = summary.get('abnormal_count', 0)
+
+    phrases = [OPENING, TOTAL_PREFIX, *number_to_words(str(total)), TOTAL_SUFFIX]
+    if normal > 0:
+        phrases += [*number_to_words(str(normal)), NORMAL_SUFFIX]
+    if abnormal > 0:
+        phrases += [*number_to_words(str(abnormal)), ABNORMAL_SUFFIX]
+
+    items = analyses.get('analyses', {}).values()
+    messages = [item.get('message', '') for item in items if item.get('is_normal') is False]
+    if messages:
+        phrases.append(ATTENTION)
+        for message in messages:
+            match = _MESSAGE_RE.match(message)
+            if match is None:
+                return None
+            for kind, part in _MESSAGE_ORDER:
+                if kind == 'literal':
+                    phrases.append(part)
+                elif part == 'reference':
+                    phrases += [*number_to_words(match['min']), RANGE_SEPARATOR,
+                                *number_to_words(match['max'])]
+                    if match['unit']:
+                        phrases.append(match['unit'])
+                else:
+                    phrases.append(match[part])
+
+    normal_seen = sum(1 for item in items if item.get('is_normal') is True)
+    if normal_seen == total and total > 0:
+        phrases.append(ALL_NORMAL)
+    return phrases
+
+
+def library_phrases() -> List[str]:
+    """Önceden sentezlenecek tüm sabit parçalar."""
+    return list(dict.fromkeys(
+        STATIC_PHRASES + tuple(_CATALOG.test_names.values()) + STATUS_WORDS + UNITS + NUMBER_WORDS
+    ))
+
+
+def concatenate_audio(segments: Iterable[bytes], gap_ms: int = 80) -> Optional[bytes]:
+    """WAV parçalarının PCM verisini ya da MP3 çerçevelerini birleştirir.
+
+    Tüm parçalar aynı kapsayıcıda (yalnızca WAV ya da yalnızca MP3) ve WAV
+    parçaları aynı formatta olmalıdır; aksi halde (AIFF, karışık biçimler)
+    birleştirilemez ve None döner.
+    """
+    segments = list(segments)
+    if not segments:
+        return None
+    containers = {describe_audio(segment)[0] for segment in segments}
+    if containers == {'mp3'}:
+        # MP3 akışları çerçeve sınırında uç uca eklenebilir
+        return b''.join(segments)
+    if containers != {'wav'}:
+        return None
+
+    params = None
+    frames = []
+    for segment in segments:
+        try:
+            with wave.open(io.BytesIO(segment), 'rb') as reader:
+                segment_params = (reader.getnchannels(), reader.getsampwidth(), reader.getframerate())
+                if params is None:
+                    params = segment_params
+                elif segment_params != params:
+                    return None
+                frames.append(reader.readframes(reader.getnframes()))
+        except (wave.Error, EOFError):
+            # ör. kayan noktalı (PCM olmayan) WAV
+            return None
+
+    channels, sample_width, frame_rate = params
+    silence = b'\x00' * (frame_rate * gap_ms // 1000) * channels * sample_width
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as writer:
+        writer.setnchannels(channels)
+        writer.setsampwidth(sample_width)
+        writer.setframerate(frame_rate)
+        writer.writeframes(silence.join(frames))
+    return output.getvalue()
+
+
+class PhraseAudioLibrary:
+    """Bir motor/dil/ses profili için parça seslerini tutar ve raporları birleştirir."""
+
+    def __init__(self, tts, cache: Optional[ContentCache] = None):
+        """
+        Args:
+            tts: Parçaları sentezlemek için kullanılacak TextToSpeech nesnesi
+            cache: Parça sesleri için önbellek (varsayılan: ortak ses önbelleği)
+        """
+        self.tts = tts
+        self.cache = cache or audio_cache
+        self.synth_calls = 0
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._warming: Optional[threading.Thread] = None
+
+    def _key(self, phrase: str) -> str:
+        return tts_cache_key(phrase, self.tts.engine_type, self.tts.language,
+                             'phrase:' + self.tts.voice_profile)
+
+    def segment(self, phrase: str) -> Optional[bytes]:
+        """Parçanın sesini önbellekten döndürür, yoksa sentezleyip saklar."""
+        def synthesize():
+            with self._lock:
+                self.synth_calls += 1
+            return self.tts.get_audio_bytes(phrase)
+        return self.cache.get_or_compute(self._key(phrase), synthesize)
+
+    def precompute(self, phrases: Optional[Iterable[str]] = None) -> int:
+        """Parçaları önceden sentezler; sentezlenemeyen parça sayısını döndürür.
+
+        Tüm kütüphane hatasız sentezlenince ``ready`` işaretlenir.
+        """
+        failed = 0
+        for phrase in phrases if phrases is not None else library_phrases():
+            if self.segment(phrase) is None:
+                failed += 1
+        if phrases is None and not failed:
+            self.ready.set()
+        return failed
+
+    def warm(self):
+        """Kütüphaneyi arka planda önceden sentezlemeye başlar.
+
+        Isıtma sürerken ya da kütüphane hazırken yeni iş başlatılmaz; önceki
+        ısıtmada sentezlenemeyen parçalar varsa sonraki çağrı yeniden dener.
+        """
+        with self._lock:
+            if self.ready.is_set() or (self._warming is not None and self._warming.is_alive()):
+                return
+            self._warming = threading.Thread(target=self.precompute, name='phrase-warm',
+                                             daemon=True)
+            self._warming.start()
+
+    def render(self, analyses: Dict) -> Optional[bytes]:
+        """Kural tabanlı özetin sesini parçalardan birleştirir.
+
+        Parçalara ayrılamayan ya da birleştirilemeyen durumlarda None döner;
+        çağıran taraf tüm metni sentezlemeye geri dönmelidir.
+        """
+        phrases = summary_phrases(analyses)
+        if phrases is None:
+            return None
+        segments = []
+        for phrase in phrases:
+            audio = self.segment(phrase)
+            if audio is None:
+                return None
+            segments.append(audio)
+        return concatenate_audio(segments)
+
+
+_libraries: Dict[tuple, PhraseAudioLibrary] = {}
+_libraries_lock = threading.Lock()
+
+
+def get_phrase_library(engine: str = 'pyttsx3', language: str = 'tr',
+                       voice_profile: str = 'default') -> PhraseAudioLibrary:
+    """Motor/dil/profil başına süreç genelinde tek bir kütüphane döndürür."""
+    key = (engine, language, voice_profile)
+    with _libraries_lock:
+        library = _libraries.get(key)
+        if library is None:
+            from .text_to_speech import TextToSpeech
+
+            tts = TextToSpeech(engine=engine, language=language, use_pool=True)
+            if voice_profile != 'default':
+                tts.set_voice_profile(voice_profile)
+            library = PhraseAudioLibrary(tts)
+            _libraries[key] = library
+        return library
+
+
+def warm_phrase_library(engine: str = 'pyttsx3', language: Optional[str] = None,
+                        voice_profile: str = 'default') -> PhraseAudioLibrary:
+    """Kütüphaneyi döndürür ve parçalarını arka planda sentezlemeye başlar."""
+    library = get_phrase_library(engine, language or _CATALOG.tts_language, voice_profile)
+    library.warm()
+    return library
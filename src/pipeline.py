@@ -0,0 +1,290 @@
+"""
+Bağımlılık izlemeli, aşama bazlı önbellekli rapor işleme hattı.
+
+Her aşamanın çıktısı yalnızca gerçekten bağlı olduğu girdilerle
+anahtarlanır:
+
+    parse    ← PDF baytları
+    analyze  ← parse + cinsiyet
+    summary  ← analyze + NLP ayarı + özet dili (+ hasta ve rapor tarihi)
+    audio    ← summary + ses motoru / dil / ses profili
+    encode   ← audio + ses biçimi / bit hızı
+    store    ← analyze + hasta + rapor tarihi (depo verilmişse)
+
+Böylece yalnızca cinsiyet değiştiğinde PDF yeniden okunmaz, yalnızca ses
+motoru değiştiğinde analiz ve özet yeniden üretilmez; aynı rapor başka
+dillerde istendiğinde yalnızca özet ve ses aşamaları çalışır; yalnızca ses
+biçimi değiştiğinde yalnızca kodlama aşaması çalışır. Her aşamanın
+kaç kez gerçekten hesaplandığı ``runs`` sayaçlarında tutulur.
+"""
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+from .analyze_results import ResultAnalyzer
+from .cache import cached_parse, cached_synthesize, content_key, parse_cache_key
+from .generate_summary import SummaryGenerator
+from .locales import DEFAULT_LOCALE, get_catalog
+from .parse_report import ReportParser
+from .result_store import ResultStore, Timestamp, to_epoch
+
+
+STAGES = ('parse', 'analyze', 'store', 'summary', 'audio', 'encode')
+
+
+class ReportPipeline:
+    """Aşama çıktılarını girdilerine göre hatırlayan rapor işleme hattı."""
+
+    def __init__(self, parser: Optional[ReportParser] = None,
+                 analyzer: Optional[ResultAnalyzer] = None, memo_items: int = 8,
+                 store: Optional[ResultStore] = None):
+        """
+        Args:
+            parser: Ayrıştırıcı (varsayılan: yeni ReportParser)
+            analyzer: Analizci (varsayılan: yeni ResultAnalyzer)
+            store: Hasta kimliği verilen raporların kaydedileceği ve önceki
+                sonuçlarla karşılaştırılacağı sonuç deposu
+            memo_items: Aşama başına hatırlanan en fazla girdi sayısı; ayarlar
+                arasında gidip gelindiğinde önceki sonuçlar yeniden kullanılır
+        """
+        self.parser = parser or ReportParser()
+        self.analyzer = analyzer or ResultAnalyzer()
+        self.memo_items = memo_items
+        self.store = store
+        self.runs = Counter()
+        self._generators: Dict[bool, SummaryGenerator] = {}
+        self._memo: Dict[str, OrderedDict] = {stage: OrderedDict() for stage in STAGES}
+        self._lock = threading.RLock()
+        # Hesaplanmakta olan (aşama, anahtar) -> sonucu bekleyen çağıranların Future'ı
+        self._pending: Dict[tuple, Future] = {}
+        self._local = threading.local()
+        # (PDF baytları, ayrıştırma anahtarı) birlikte değiştirilir
+        self._last_parse = (None, '')
+        self._saved_key = None
+
+    def _stage(self, stage: str, key: Hashable, compute: Callable, remember_none: bool = True):
+        """Aşama çıktısını hatırlanan sonuçtan döndürür ya da hesaplar.
+
+        Hesaplama kilit dışında çalışır; aynı anahtarı aynı anda isteyenler
+        tek hesaplamanın sonucunu bekler, farklı anahtarlar birbirini beklemez.
+        """
+        with self._lock:
+            memo = self._memo[stage]
+            if key in memo:
+                memo.move_to_end(key)
+                return memo[key]
+            pending = self._pending.get((stage, key))
+            owner = pending is None
+            if owner:
+                pending = self._pending[(stage, key)] = Future()
+        if not owner:
+            return pending.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[(stage, key)]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self.runs[stage] += 1
+            if value is not None or remember_none:
+                memo[key] = value
+                if len(memo) > self.memo_items:
+                    memo.popitem(last=False)
+            del self._pending[(stage, key)]
+        self._mark(stage)
+        pending.set_result(value)
+        return value
+
+    def _mark(self, stage: str):
+        computed = getattr(self._local, 'computed', None)
+        if computed is not None:
+            computed.add(stage)
+
+    def _generator(self, use_nlp: bool) -> SummaryGenerator:
+        generator = self._generators.get(use_nlp)
+        if generator is None:
+            generator = self._generators[use_nlp] = SummaryGenerator(use_nlp=use_nlp, use_service=True)
+        return generator
+
+    def _parse_key(self, pdf_bytes: bytes) -> str:
+        # Aynı bayt nesnesi için özet bir kez hesaplanır
+        last_pdf, last_key = self._last_parse
+        if pdf_bytes is last_pdf:
+            return last_key
+        key = parse_cache_key(pdf_bytes, self.parser.cache_version)
+        with self._lock:
+            self._last_parse = (pdf_bytes, key)
+        return key
+
+    def parse(self, pdf_bytes: bytes) -> Dict:
+        return self._stage('parse', self._parse_key(pdf_bytes),
+                           lambda: cached_parse(pdf_bytes, self.parser))
+
+    def analyze(self, pdf_bytes: bytes, gender: Optional[str] = None) -> Optional[Dict]:
+        """Raporun analizini döndürür; rapor okunamadıysa None."""
+        analyze_key = (self._parse_key(pdf_bytes), gender)
+        parsed = self.parse(pdf_bytes)
+        if 'error' in parsed:
+            return None
+        return self._stage('analyze', analyze_key,
+                           lambda: self.analyzer.analyze(parsed['results'], gender))
+
+    def _history_key(self, patient_id: Optional[str], taken_at: Optional[Timestamp]):
+        if self.store is None or not patient_id or taken_at is None:
+            return None
+        return (patient_id, to_epoch(taken_at))
+
+    def save(self, pdf_bytes: bytes, gender: Optional[str] = None, patient_id: Optional[str] = None,
+             taken_at: Optional[Timestamp] = None) -> int:
+        """Analizi hastanın geçmişine kaydeder; aynı girdiler için bir kez yazar.
+
+        Kayıtların kaynağı raporun içerik anahtarıdır; aynı rapor başka bir
+        tarihle kaydedilirse önceki kayıtların yerini alır.
+        """
+        history_key = self._history_key(patient_id, taken_at)
+        analyses = self.analyze(pdf_bytes, gender)
+        if history_key is None or analyses is None:
+            return 0
+        parse_key = self._parse_key(pdf_bytes)
+        key = (parse_key, gender) + history_key
+        with self._lock:
+            # Yalnızca son kayıt hatırlanır: önceki bir tarihe dönülürse yeniden yazılmalıdır
+            if self._saved_key == key:
+                return 0
+            saved = self.store.add_analyses(patient_id, analyses, taken_at, parse_key)
+            self._saved_key = key
+            self.runs['store'] += 1
+        self._mark('store')
+        return saved
+
+    def summary(self, pdf_bytes: bytes, gender: Optional[str] = None, use_nlp: bool = False,
+                patient_id: Optional[str] = None, taken_at: Optional[Timestamp] = None,
+                locale: str = DEFAULT_LOCALE) -> Optional[Dict]:
+        """Özeti ``locale`` dilinde döndürür; hasta ve tarih verilirse önceki
+        sonuçlara göre değişimler eklenir."""
+        history_key = self._history_key(patient_id, taken_at)
+        summary_key = (self._parse_key(pdf_bytes), gender, use_nlp, history_key, locale)
+        analyses = self.analyze(pdf_bytes, gender)
+        if analyses is None:
+            return None
+
+        def generate() -> Dict:
+            deltas = None
+            if history_key is not None:
+                deltas = self.store.deltas(patient_id, analyses, taken_at)
+            return self._generator(use_nlp).generate(analyses, use_nlp_summary=use_nlp, deltas=deltas,
+                                                     locale=locale)
+
+        return self._stage('summary', summary_key, generate)
+
+    def summaries(self, pdf_bytes: bytes, locales: Iterable[str], gender: Optional[str] = None,
+                  use_nlp: bool = False, patient_id: Optional[str] = None,
+                  taken_at: Optional[Timestamp] = None) -> Optional[Dict[str, Dict]]:
+        """Raporu bir kez ayrıştırıp analiz eder ve her dil için özeti döndürür.
+
+        Returns:
+            dil -> özet; rapor okunamadıysa None
+        """
+        if self.analyze(pdf_bytes, gender) is None:
+            return None
+        return {locale: self.summary(pdf_bytes, gender, use_nlp, patient_id, taken_at, locale)
+                for locale in dict.fromkeys(locales)}
+
+    def audio(self, pdf_bytes: bytes, gender: Optional[str] = None, use_nlp: bool = False,
+              patient_id: Optional[str] = None, taken_at: Optional[Timestamp] = None,
+              engine: str = 'pyttsx3', language: Optional[str] = None, voice_profile: str = 'default',
+              use_phrases: bool = True, locale: str = DEFAULT_LOCALE) -> Optional[bytes]:
+        """Özetin ``locale`` dilindeki sesini döndürür.
+
+        ``language`` verilmezse ses motorunun dili kataloğun ``tts_language``
+        değeridir. ``use_phrases`` açıksa Türkçe kural tabanlı özet önceden
+        sentezlenmiş parçalardan birleştirilir (bkz. phrase_audio); NLP özeti
+        ya da önceki sonuçlarla karşılaştırma varsa, parça kütüphanesi henüz
+        ısınmadıysa (arka planda ısıtılır) veya birleştirme mümkün değilse
+        tüm metin sentezlenir. Başarısız sentez hatırlanmaz, sonraki
+        çağrıda yeniden denenir.
+        """
+        summary = self.summary(pdf_bytes, gender, use_nlp, patient_id, taken_at, locale)
+        if summary is None:
+            return None
+        language = language or get_catalog(locale).tts_language
+        text = summary['audio_text']
+        key = (content_key(text), engine, language, voice_profile, use_phrases)
+
+        def synthesize() -> Optional[bytes]:
+            from .phrase_audio import PHRASE_LOCALE, get_phrase_library
+
+            audio = None
+            if (use_phrases and locale == PHRASE_LOCALE and not summary.get('nlp_summary')
+                    and not summary.get('trend_commentary')):
+                library = get_phrase_library(engine, language, voice_profile)
+                if library.ready.is_set():
+                    audio = library.render(self.analyze(pdf_bytes, gender))
+                else:
+                    # Soğuk kütüphane parça parça sentezler, tüm metinden yavaştır;
+                    # ısınana kadar tüm metin sentezlenir
+                    library.warm()
+            return audio or cached_synthesize(text, engine, language, voice_profile)
+
+        return self._stage('audio', key, synthesize, remember_none=False)
+
+    def encoded_audio(self, pdf_bytes: bytes, gender: Optional[str] = None, use_nlp: bool = False,
+                      patient_id: Optional[str] = None, taken_at: Optional[Timestamp] = None,
+                      engine: str = 'pyttsx3', language: Optional[str] = None,
+                      voice_profile: str = 'default', use_phrases: bool = True,
+                      locale: str = DEFAULT_LOCALE, audio_format: Optional[str] = None,
+                      bitrate: Optional[str] = None) -> Optional[Dict]:
+        """Özetin sesini ``audio_format`` biçiminde kodlanmış olarak döndürür.
+
+        ``audio_format`` verilmezse ``SMART_AUDIO_FORMAT`` ayarı kullanılır.
+        Kodlama ayrı iş parçacığı havuzunda çalışır (bkz. audio_encoding).
+
+        Returns:
+            ``encode_audio`` çıktısı ('audio', 'format', 'media_type',
+            'extension', ...); ses üretilemediyse None
+        """
+        from .audio_encoding import DEFAULT_FORMAT, submit_encode
+
+        audio = self.audio(pdf_bytes, gender, use_nlp, patient_id, taken_at, engine, language,
+                           voice_profile, use_phrases, locale)
+        if audio is None:
+            return None
+        audio_format = audio_format or DEFAULT_FORMAT
+        key = (content_key(audio), audio_format, bitrate)
+        return self._stage('encode', key,
+                           lambda: submit_encode(audio, audio_format, bitrate).result())
+
+    def run(self, pdf_bytes: bytes, gender: Optional[str] = None, use_nlp: bool = False,
+            patient_id: Optional[str] = None, taken_at: Optional[Timestamp] = None,
+            locale: str = DEFAULT_LOCALE) -> Dict:
+        """Ayrıştırma, analiz ve ``locale`` dilindeki özeti döndürür; yalnızca
+        girdisi değişen aşamalar çalışır.
+
+        Depo verilmişse ve hasta kimliği ile rapor tarihi belirtilmişse analiz
+        hastanın geçmişine kaydedilir ve özet önceki sonuçlarla karşılaştırılır.
+
+        Returns:
+            'parsed', 'analyses', 'summary' ve bu çağrıda yeniden hesaplanan
+            aşamaların listesi ('recomputed'); rapor okunamadıysa analiz ve
+            özet None
+        """
+        # Yeniden hesaplanan aşamalar bu iş parçacığının çağrılarından toplanır
+        self._local.computed = computed = set()
+        try:
+            parsed = self.parse(pdf_bytes)
+            analyses = self.analyze(pdf_bytes, gender)
+            summary = self.summary(pdf_bytes, gender, use_nlp, patient_id, taken_at, locale)
+            self.save(pdf_bytes, gender, patient_id, taken_at)
+        finally:
+            self._local.computed = None
+        recomputed = [stage for stage in STAGES if stage in computed]
+        return {'parsed': parsed, 'analyses': analyses, 'summary': summary,
+                'recomputed': recomputed}
+
+    def stats(self) -> Dict:
+        return {stage: {'runs': self.runs[stage], 'memo_items': len(self._memo[stage])}
+                for stage in STAGES}
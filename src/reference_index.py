@@ -0,0 +1,190 @@
+"""
+Derlenmiş referans aralığı indeksi.
+
+``reference_ranges.json`` yüklenirken her (test, cinsiyet) çifti için
+min/max değerleri, birim, referans metni ve durum mesajları önceden
+hesaplanmış değişmez bir kayda dönüştürülür. Böylece değer başına
+kontrol tek bir sözlük aramasına iner. Aynı dosyayı kullanan tüm
+analizciler tek bir ``ReferenceSource`` nesnesini paylaşır; dosya
+değiştiğinde indeks analizcileri yeniden kurmadan yenilenir. Kayıtlardaki
+mesajlar varsayılan dilin kataloğundan üretilir (bkz. locales).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+
+# Cinsiyet kodları: belirtilmemiş, erkek, kadın
+GENDER_NONE = 0
+GENDER_MALE = 1
+GENDER_FEMALE = 2
+
+_GENDER_KEYS = {GENDER_MALE: 'male', GENDER_FEMALE: 'female'}
+_STATUSES = ('low', 'high', 'normal')
+
+
+@functools.lru_cache(maxsize=64)
+def _gender_code(gender: str) -> int:
+    return GENDER_MALE if gender.lower() == 'erkek' else GENDER_FEMALE
+
+
+def gender_code(gender: Optional[str]) -> int:
+    """Cinsiyet metnini koda çevirir ('erkek' dışındaki her değer kadın kabul edilir)."""
+    if not gender:
+        return GENDER_NONE
+    return _gender_code(gender)
+
+
+class RangeRecord:
+    """Bir test ve cinsiyet için önceden hesaplanmış referans kaydı."""
+
+    __slots__ = ('test_name', 'min', 'max', 'unit', 'reference_range', 'messages')
+
+    def __init__(self, test_name: str, min_val, max_val, unit: str, catalog: 'MessageCatalog'):
+        self.test_name = test_name
+        self.min = min_val
+        self.max = max_val
+        self.unit = unit
+        self.reference_range = f'{min_val}-{max_val} {unit}'
+        self.messages = MappingProxyType({
+            status: catalog.message(test_name, status, self.reference_range) for status in _STATUSES
+        })
+
+    def __setattr__(self, name, value):
+        if hasattr(self, 'messages'):
+            raise AttributeError('RangeRecord değiştirilemez')
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        return (self.test_name, self.min, self.max, self.unit, self.reference_range,
+                dict(self.messages))
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, 'messages', MappingProxyType(state[-1]))
+
+    def status_of(self, value: float) -> str:
+        if value < self.min:
+            return 'low'
+        if value > self.max:
+            return 'high'
+        return 'normal'
+
+    def check(self, value: float) -> Dict:
+        """``ResultAnalyzer.check_range`` çıktısını üretir."""
+        status = self.status_of(value)
+        return {
+            'status': status,
+            'message': self.messages[status],
+            'is_normal': self.min <= value <= self.max,
+            'reference_range': self.reference_range
+        }
+
+
+class ReferenceIndex:
+    """Ham referans sözlüğünden derlenmiş değişmez (test, cinsiyet) indeksi."""
+
+    __slots__ = ('raw', 'records')
+
+    def __init__(self, raw: Dict, catalog: 'MessageCatalog'):
+        records = {}
+        for test_name, ref in raw.items():
+            base = RangeRecord(test_name, ref.get('min', 0), ref.get('max', float('inf')),
+                               ref.get('unit', ''), catalog)
+            records[(test_name, GENDER_NONE)] = base
+            for code, key in _GENDER_KEYS.items():
+                sub = ref.get(key) if ref.get('gender_specific') else None
+                if sub is None:
+                    records[(test_name, code)] = base
+                else:
+                    records[(test_name, code)] = RangeRecord(
+                        test_name, sub.get('min', 0), sub.get('max', float('inf')),
+                        sub.get('unit', ''), catalog
+                    )
+        self.raw = MappingProxyType(raw)
+        self.records: Mapping[Tuple[str, int], RangeRecord] = MappingProxyType(records)
+
+    def lookup(self, test_name: str, gender: Optional[str] = None) -> Optional[RangeRecord]:
+        return self.records.get((test_name, gender_code(gender)))
+
+
+class ReferenceSource:
+    """Bir referans dosyasının güncel indeksini tutar ve değişince yeniler."""
+
+    def __init__(self, path: Path, catalog: 'MessageCatalog', defaults: Dict,
+                 check_interval: float = 2.0):
+        """
+        Args:
+            path: reference_ranges.json yolu
+            catalog: Kayıtlardaki mesajları üreten dil kataloğu
+            defaults: Dosya bulunamazsa kullanılacak aralıklar
+            check_interval: Dosya değişikliği kontrolleri arasındaki en az süre (sn)
+        """
+        self.path = Path(path)
+        self.catalog = catalog
+        self.defaults = defaults
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked = time.monotonic()
+        self.index = self._build()
+
+    def _stat_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _build(self) -> ReferenceIndex:
+        # Değişiklik zamanı ancak indeks kurulunca kaydedilir; okunamayan dosya
+        # sonraki kontrolde yeniden denenir
+        mtime = self._stat_mtime()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            print(f"Uyarı: {self.path} bulunamadı, varsayılan aralıklar kullanılıyor.")
+            raw = self.defaults
+        index = ReferenceIndex(raw, self.catalog)
+        self._mtime = mtime
+        return index
+
+    def reload(self) -> ReferenceIndex:
+        """Dosyayı yeniden okuyup indeksi değiştirir."""
+        with self._lock:
+            try:
+                self.index = self._build()
+            except (OSError, ValueError) as e:
+                print(f"Referans aralıkları yeniden yüklenemedi, eski indeks kullanılıyor: {e}")
+            return self.index
+
+    def current(self) -> ReferenceIndex:
+        """Güncel indeksi döndürür; dosya değiştiyse önce yeniler."""
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self._checked = now
+            if self._stat_mtime() != self._mtime:
+                return self.reload()
+        return self.index
+
+
+_sources: Dict[Path, ReferenceSource] = {}
+_sources_lock = threading.Lock()
+
+
+def get_reference_source(path: Path, catalog: 'MessageCatalog',
+                         defaults: Dict) -> ReferenceSource:
+    """Aynı dosya için süreç genelinde tek bir ``ReferenceSource`` döndürür."""
+    key = Path(path).resolve()
+    with _sources_lock:
+        source = _sources.get(key)
+        if source is None:
+            source = ReferenceSource(key, catalog, defaults)
+            _sources[key] = source
+        return source
@@ -0,0 +1,246 @@
+"""
+Sözlük yerine ``__slots__`` kullanan kompakt sonuç modeli.
+
+``analyze`` çıktısındaki her test için iki iç içe sözlük (ayrıştırma ve
+analiz) yerine tek bir ``TestResult`` nesnesi tutulur. Test adları ve
+birimler ``sys.intern`` ile paylaşılır; durum bir ``Status`` sabitidir;
+mesaj ve referans metni, derlenmiş referans kaydındaki (RangeRecord)
+hazır metinlere işaret eder, sonuç başına yeni metin üretilmez. Milyonlarca
+sonucun bellekte tutulduğu toplu işlerde bellek ve çöp toplayıcı yükü
+azalır. Mevcut sözlük biçimine dönüşüm kayıpsızdır:
+``ReportAnalysis.from_dict(d).to_dict() == d``.
+"""
+import sys
+from enum import IntEnum
+from typing import Dict, Iterator, Optional
+
+from .reference_index import RangeRecord
+
+
+class Status(IntEnum):
+    """Test durumu; değerler batch_analysis durum kodlarıyla aynıdır."""
+
+    NORMAL = 0
+    LOW = 1
+    HIGH = 2
+    UNKNOWN = 3
+
+    @property
+    def label(self) -> str:
+        """Sözlük biçimindeki durum metni ('normal', 'low', 'high', 'unknown')."""
+        return _STATUS_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label: str) -> 'Status':
+        return _STATUS_BY_LABEL[label]
+
+
+_STATUS_LABELS = {status: sys.intern(status.name.lower()) for status in Status}
+_STATUS_BY_LABEL = {label: status for status, label in _STATUS_LABELS.items()}
+
+# Ayrıştırma ve analiz sözlüklerinde ayrı slotta tutulan anahtarlar
+_KNOWN_KEYS = frozenset(('value', 'unit', 'raw_line', 'status', 'message', 'is_normal',
+                         'reference_range'))
+
+
+def _intern(text: Optional[str]) -> Optional[str]:
+    return sys.intern(text) if isinstance(text, str) else text
+
+
+class TestResult:
+    """Bir testin ayrıştırılmış değeri ve (varsa) analiz sonucu.
+
+    Sözlükte bulunmayan alanlar None tutulur ve ``to_dict`` çıktısına
+    yazılmaz; bilinmeyen ek anahtarlar (ör. ``report_reference``) ``extra``
+    sözlüğünde saklanır.
+    """
+
+    __slots__ = ('test_name', 'value', 'unit', 'raw_line', 'status', 'message',
+                 'reference_range', 'extra')
+
+    def __init__(self, test_name: str, value: float, unit: Optional[str] = None,
+                 raw_line: Optional[str] = None, status: Optional[Status] = None,
+                 message: Optional[str] = None, reference_range: Optional[str] = None,
+                 extra: Optional[Dict] = None):
+        self.test_name = sys.intern(test_name)
+        self.value = value
+        self.unit = _intern(unit)
+        self.raw_line = raw_line
+        self.status = status
+        self.message = message
+        self.reference_range = reference_range
+        self.extra = extra
+
+    def __repr__(self) -> str:
+        status = self.status.label if self.status is not None else None
+        return f'TestResult({self.test_name!r}, {self.value!r}, unit={self.unit!r}, status={status!r})'
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TestResult):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    @property
+    def is_normal(self) -> Optional[bool]:
+        """Analiz edilmemiş veya referansı olmayan testler için None."""
+        if self.status is None or self.status is Status.UNKNOWN:
+            return None
+        return self.status is Status.NORMAL
+
+    @property
+    def is_abnormal(self) -> bool:
+        return self.status is Status.LOW or self.status is Status.HIGH
+
+    def apply_reference(self, record: Optional[RangeRecord]) -> 'TestResult':
+        """Durumu referans kaydına göre yerinde belirler ve nesnenin kendisini döndürür."""
+        if record is None:
+            self.status = Status.UNKNOWN
+            self.message = unknown_message(self.test_name)
+            self.reference_range = None
+        else:
+            label = record.status_of(self.value)
+            self.status = _STATUS_BY_LABEL[label]
+            self.message = record.messages[label]
+            self.reference_range = record.reference_range
+        return self
+
+    def analyzed(self, record: Optional[RangeRecord]) -> 'TestResult':
+        """Referans kaydına göre durumu belirlenmiş yeni bir sonuç döndürür."""
+        return TestResult(self.test_name, self.value, self.unit, self.raw_line,
+                          extra=self.extra).apply_reference(record)
+
+    @classmethod
+    def from_parsed(cls, test_name: str, data: Dict, record: Optional[RangeRecord]) -> 'TestResult':
+        """Ayrıştırma sözlüğünden doğrudan analiz edilmiş sonuç oluşturur (``analyze_model``)."""
+        result = cls.__new__(cls)
+        result.test_name = test_name
+        result.value = value = data['value']
+        result.unit = _intern(data.get('unit'))
+        result.raw_line = data.get('raw_line')
+        if len(data) == 3 and 'raw_line' in data and 'unit' in data:
+            result.extra = None
+        else:
+            result.extra = {key: item for key, item in data.items() if key not in _KNOWN_KEYS} or None
+        if record is None:
+            result.status = Status.UNKNOWN
+            result.message = unknown_message(test_name)
+            result.reference_range = None
+        else:
+            label = record.status_of(value)
+            result.status = _STATUS_BY_LABEL[label]
+            result.message = record.messages[label]
+            result.reference_range = record.reference_range
+        return result
+
+    @classmethod
+    def from_dict(cls, test_name: str, data: Dict) -> 'TestResult':
+        """Ayrıştırma (``find_test_results``) veya analiz sözlüğünden oluşturur."""
+        status = data.get('status')
+        extra = {key: value for key, value in data.items() if key not in _KNOWN_KEYS} or None
+        return cls(
+            test_name,
+            data.get('value'),
+            data.get('unit'),
+            data.get('raw_line'),
+            _STATUS_BY_LABEL[status] if status is not None else None,
+            _intern(data.get('message')),
+            _intern(data.get('reference_range')),
+            extra,
+        )
+
+    def to_dict(self) -> Dict:
+        """``analyze`` (veya analiz edilmemişse ``find_test_results``) sözlük biçimi."""
+        data = {'value': self.value}
+        if self.unit is not None:
+            data['unit'] = self.unit
+        if self.raw_line is not None:
+            data['raw_line'] = self.raw_line
+        if self.extra:
+            data.update(self.extra)
+        if self.status is not None:
+            data['status'] = self.status.label
+            data['message'] = self.message
+            data['is_normal'] = self.is_normal
+            if self.reference_range is not None:
+                data['reference_range'] = self.reference_range
+        return data
+
+
+_unknown_messages: Dict[str, str] = {}
+
+
+def unknown_message(test_name: str) -> str:
+    """Referansı olmayan test için varsayılan dildeki paylaşılan mesaj metni."""
+    message = _unknown_messages.get(test_name)
+    if message is None:
+        from .locales import DEFAULT_LOCALE, get_catalog
+
+        message = _unknown_messages[test_name] = get_catalog(DEFAULT_LOCALE).message(test_name, 'unknown')
+    return message
+
+
+class ReportAnalysis:
+    """Bir raporun analiz edilmiş sonuçları ve durum sayıları."""
+
+    __slots__ = ('results', 'normal_count', 'abnormal_count', 'unknown_count')
+
+    def __init__(self, results: Dict[str, TestResult], normal: Optional[int] = None,
+                 abnormal: Optional[int] = None):
+        """
+        Args:
+            results: Test adı -> sonuç
+            normal, abnormal: Biliniyorsa durum sayıları (verilmezse sayılır)
+        """
+        self.results = results
+        if normal is None or abnormal is None:
+            normal = abnormal = 0
+            for result in results.values():
+                if result.status is Status.NORMAL:
+                    normal += 1
+                elif result.status is Status.LOW or result.status is Status.HIGH:
+                    abnormal += 1
+        self.normal_count = normal
+        self.abnormal_count = abnormal
+        self.unknown_count = len(results) - normal - abnormal
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> Iterator[TestResult]:
+        return iter(self.results.values())
+
+    def __getitem__(self, test_name: str) -> TestResult:
+        return self.results[test_name]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ReportAnalysis):
+            return NotImplemented
+        return self.results == other.results
+
+    @property
+    def total_tests(self) -> int:
+        return len(self.results)
+
+    def abnormal(self) -> Iterator[TestResult]:
+        return (result for result in self.results.values() if result.is_abnormal)
+
+    def summary(self) -> Dict:
+        return {
+            'total_tests': len(self.results),
+            'normal_count': self.normal_count,
+            'abnormal_count': self.abnormal_count,
+            'unknown_count': self.unknown_count
+        }
+
+    @classmethod
+    def from_dict(cls, analyses: Dict) -> 'ReportAnalysis':
+        """``ResultAnalyzer.analyze`` çıktısından oluşturur."""
+        return cls({test_name: TestResult.from_dict(test_name, data)
+                    for test_name, data in analyses.get('analyses', {}).items()})
+
+    def to_dict(self) -> Dict:
+        """``ResultAnalyzer.analyze`` çıktısıyla aynı sözlüğü üretir."""
+        return {
+            'analyses': {test_name: result.to_dict() for test_name, result in self.results.items()},
+            'summary': self.summary()
+        }
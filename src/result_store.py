@@ -0,0 +1,261 @@
+"""
+Hasta bazında zaman içindeki test sonuçlarını saklayan SQLite deposu.
+
+Analiz çıktıları (hasta, test, zaman) birincil anahtarıyla, satır kimliği
+olmadan (WITHOUT ROWID) saklanır; tablo bu anahtara göre kümelenmiş
+olduğundan bir hastanın bir testteki geçmişi tek bir aralık taramasıyla
+okunur. Aynı rapor yeniden eklendiğinde kayıtlar üzerine yazılır.
+"""
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .result_model import ReportAnalysis
+
+
+DEFAULT_STORE_PATH = Path(
+    os.environ.get('SMART_AUDIO_RESULTS_DB',
+                   Path.home() / '.local' / 'share' / 'smart-audio-lab-report' / 'results.sqlite3')
+)
+
+# executemany çağrısı başına satır sayısı (toplu eklemede bellek sınırı)
+INSERT_BATCH = 10000
+
+Timestamp = Union[datetime, date, str, int, float]
+
+# (hasta, test, zaman, değer, birim, durum, kaynak)
+Row = Tuple[str, str, int, float, str, str, Optional[str]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    patient_id TEXT NOT NULL,
+    test_name  TEXT NOT NULL,
+    taken_at   INTEGER NOT NULL,
+    value      REAL NOT NULL,
+    unit       TEXT NOT NULL DEFAULT '',
+    status     TEXT NOT NULL DEFAULT '',
+    source     TEXT,
+    PRIMARY KEY (patient_id, test_name, taken_at)
+) WITHOUT ROWID;
+"""
+
+_INSERT = 'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)'
+
+
+def to_epoch(value: Timestamp) -> int:
+    """Tarih/zaman değerini UTC Unix saniyesine çevirir (ISO metin kabul edilir)."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def from_epoch(seconds: int) -> str:
+    """Unix saniyesini ISO tarih metnine çevirir (saat 00:00 ise yalnızca tarih)."""
+    moment = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    if moment.hour == moment.minute == moment.second == 0:
+        return moment.date().isoformat()
+    return moment.replace(tzinfo=None).isoformat(timespec='seconds')
+
+
+def analysis_rows(patient_id: str, analyses: Union[Dict, ReportAnalysis], taken_at: Timestamp,
+                  source: Optional[str] = None) -> List[Row]:
+    """``ResultAnalyzer.analyze`` (veya ``analyze_model``) çıktısını depo satırlarına dönüştürür."""
+    epoch = to_epoch(taken_at)
+    if isinstance(analyses, ReportAnalysis):
+        return [(patient_id, result.test_name, epoch, float(result.value), result.unit or '',
+                 result.status.label if result.status is not None else '', source)
+                for result in analyses]
+    rows = []
+    for test_name, analysis in analyses.get('analyses', {}).items():
+        value = analysis.get('value')
+        if value is None:
+            continue
+        rows.append((patient_id, test_name, epoch, float(value), analysis.get('unit') or '',
+                     analysis.get('status', ''), source))
+    return rows
+
+
+class ResultStore:
+    """Hasta / test / zaman dizinli sonuç deposu."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_STORE_PATH):
+        """
+        Args:
+            path: SQLite dosyası (':memory:' ile yalnızca bellekte)
+        """
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def bulk_insert(self, rows: Iterable[Row]) -> int:
+        """Satırları tek işlemde, parça parça ekler; eklenen satır sayısını döndürür."""
+        inserted = 0
+        batch: List[Row] = []
+        with self._lock, self._conn:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= INSERT_BATCH:
+                    self._conn.executemany(_INSERT, batch)
+                    inserted += len(batch)
+                    batch.clear()
+            if batch:
+                self._conn.executemany(_INSERT, batch)
+                inserted += len(batch)
+        return inserted
+
+    def add_analyses(self, patient_id: str, analyses: Dict, taken_at: Timestamp,
+                     source: Optional[str] = None) -> int:
+        """Bir raporun analiz sonuçlarını hastanın geçmişine ekler.
+
+        ``source`` verilirse aynı kaynaktan önceden eklenmiş kayıtlar (ör.
+        tarihi sonradan düzeltilen rapor) önce silinir.
+        """
+        rows = analysis_rows(patient_id, analyses, taken_at, source)
+        # Silme ve ekleme tek işlemde: arada okuyan biri raporu yarım görmez
+        with self._lock, self._conn:
+            if source is not None:
+                self._conn.execute('DELETE FROM results WHERE patient_id = ? AND source = ?',
+                                   (patient_id, source))
+            for start in range(0, len(rows), INSERT_BATCH):
+                self._conn.executemany(_INSERT, rows[start:start + INSERT_BATCH])
+        return len(rows)
+
+    def history(self, patient_id: str, test_name: Optional[str] = None,
+                start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> List[Dict]:
+        """Hastanın sonuçlarını zamana göre sıralı döndürür (``end`` hariç)."""
+        query = 'SELECT test_name, taken_at, value, unit, status, source FROM results WHERE patient_id = ?'
+        params: List = [patient_id]
+        if test_name is not None:
+            query += ' AND test_name = ?'
+            params.append(test_name)
+        if start is not None:
+            query += ' AND taken_at >= ?'
+            params.append(to_epoch(start))
+        if end is not None:
+            query += ' AND taken_at < ?'
+            params.append(to_epoch(end))
+        query += ' ORDER BY test_name, taken_at'
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {'test_name': test, 'taken_at': from_epoch(taken_at), 'value': value,
+             'unit': unit, 'status': status, 'source': source}
+            for test, taken_at, value, unit, status, source in rows
+        ]
+
+    def latest(self, patient_id: str, before: Optional[Timestamp] = None,
+               tests: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+        """Her test için ``before`` zamanından önceki en son sonucu döndürür."""
+        # SQLite'ta MAX() ile seçilen diğer sütunlar en büyük değerli satırdan gelir
+        query = ('SELECT test_name, MAX(taken_at), value, unit, status FROM results '
+                 'WHERE patient_id = ?')
+        params: List = [patient_id]
+        if before is not None:
+            query += ' AND taken_at < ?'
+            params.append(to_epoch(before))
+        if tests is not None:
+            query += f" AND test_name IN ({', '.join('?' * len(tests))})"
+            params.extend(tests)
+        query += ' GROUP BY test_name'
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return {
+            test: {'taken_at': from_epoch(taken_at), 'value': value, 'unit': unit, 'status': status}
+            for test, taken_at, value, unit, status in rows
+        }
+
+    def trend(self, patient_id: str, test_name: str, start: Optional[Timestamp] = None,
+              end: Optional[Timestamp] = None) -> Optional[Dict]:
+        """Bir testin aralıktaki ilk/son değeri, farkı ve 30 günlük eğimini döndürür."""
+        points = self.history(patient_id, test_name, start, end)
+        if not points:
+            return None
+        times = [to_epoch(point['taken_at']) / 86400 for point in points]
+        values = [point['value'] for point in points]
+        slope = 0.0
+        if len(points) > 1:
+            mean_t, mean_v = sum(times) / len(times), sum(values) / len(values)
+            variance = sum((t - mean_t) ** 2 for t in times)
+            if variance:
+                slope = sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values)) / variance
+        return {
+            'test_name': test_name,
+            'count': len(points),
+            'first': points[0],
+            'last': points[-1],
+            'delta': round(values[-1] - values[0], 4),
+            'slope_per_30d': round(slope * 30, 4),
+            'points': points,
+        }
+
+    def deltas(self, patient_id: str, analyses: Dict, taken_at: Timestamp) -> Dict[str, Dict]:
+        """Bu rapordaki her test için bir önceki sonuca göre değişimi hesaplar.
+
+        Returns:
+            test adı -> {'previous_value', 'previous_at', 'previous_status',
+            'delta', 'unit'}; geçmiş sonucu olmayan veya önceki sonucu farklı
+            birimle kaydedilmiş testler yer almaz
+        """
+        current = analyses.get('analyses', {})
+        previous = self.latest(patient_id, before=taken_at, tests=list(current))
+        deltas = {}
+        for test_name, prior in previous.items():
+            value = current[test_name].get('value')
+            if value is None:
+                continue
+            unit = current[test_name].get('unit') or ''
+            if unit and prior['unit'] and unit.strip().lower() != prior['unit'].strip().lower():
+                continue
+            deltas[test_name] = {
+                'previous_value': prior['value'],
+                'previous_at': prior['taken_at'],
+                'previous_status': prior['status'],
+                'delta': round(value - prior['value'], 4),
+                'unit': unit or prior['unit'],
+            }
+        return deltas
+
+    def stats(self) -> Dict:
+        with self._lock:
+            rows, patients = self._conn.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT patient_id) FROM results'
+            ).fetchone()
+        return {'rows': rows, 'patients': patients, 'path': self.path}
+
+
+_stores: Dict[str, ResultStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_result_store(path: Union[str, Path] = DEFAULT_STORE_PATH) -> ResultStore:
+    """Dosya başına süreç genelinde tek bir depo bağlantısı döndürür."""
+    key = str(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ResultStore(path)
+        return store
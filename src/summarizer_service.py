@@ -0,0 +1,243 @@
+"""
+Kalıcı NLP özetleme servisi.
+
+Özetleme modeli ayrı bir süreçte yalnızca bir kez yüklenir. Aynı anda gelen
+istekler en fazla ``max_batch_size`` adetlik ya da ``max_wait`` saniyelik
+mikro gruplar halinde modele verilir. ``SummaryGenerator(use_service=True)``
+bu servisi kullanır ve zaman aşımında kural tabanlı özete döner.
+"""
+import atexit
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional, Tuple
+
+
+DEFAULT_MODEL = 'facebook/bart-large-cnn'
+SUMMARY_KWARGS = {'max_length': 150, 'min_length': 50, 'do_sample': False}
+
+
+def _serve(requests, responses, model: str, backend: str, max_batch_size: int, max_wait: float):
+    """Servis süreci: modeli yükler ve istekleri gruplayarak özetler."""
+    try:
+        from .generate_summary import load_summarizer
+        summarizer = load_summarizer(model, backend)
+    except Exception as e:
+        responses.put(('failed', str(e)))
+        return
+    responses.put(('ready', None))
+
+    while True:
+        item = requests.get()
+        if item is None:
+            return
+        batch = [item]
+        deadline = time.monotonic() + max_wait
+        while len(batch) < max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                requests.put(None)
+                break
+            batch.append(item)
+
+        start = time.perf_counter()
+        try:
+            outputs = summarizer([text for _, text in batch], batch_size=len(batch),
+                                 **SUMMARY_KWARGS)
+            results = [(request_id, output['summary_text'], None)
+                       for (request_id, _), output in zip(batch, outputs)]
+        except Exception as e:
+            results = [(request_id, None, str(e)) for request_id, _ in batch]
+        responses.put(('results', results, time.perf_counter() - start))
+
+
+class SummarizerService:
+    """Özetleme sürecini başlatır ve isteklerini yönlendirir (iş parçacığı güvenli)."""
+
+    def __init__(self, model: str = DEFAULT_MODEL, backend: str = 'pytorch',
+                 max_batch_size: int = 8, max_wait: float = 0.05):
+        context = mp.get_context('spawn')
+        self.model = model
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(
+            target=_serve,
+            args=(self._requests, self._responses, model, backend, max_batch_size, max_wait),
+            daemon=True
+        )
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self.ready = threading.Event()
+        self.error: Optional[str] = None
+        self.batch_count = 0
+        self.request_count = 0
+        self.last_batch_size = 0
+        self.last_batch_latency = 0.0
+        self.total_batch_latency = 0.0
+
+        self._process.start()
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+
+    def _read_responses(self):
+        while True:
+            try:
+                message = self._responses.get(timeout=1.0)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    # Süreç yanıt vermeden sonlandı (ör. bellek yetersizliği);
+                    # bekleyen istekler hata alır, sonraki çağrı servisi yeniden başlatır
+                    self.error = self.error or 'servis süreci sonlandı'
+                    self.ready.set()
+                    self._fail_pending()
+                    return
+                continue
+            except (EOFError, OSError, ValueError, TypeError):
+                # Yorumlayıcı kapanırken kuyruk tanıtıcısı kapatılmış olabilir
+                return
+            kind = message[0]
+            if kind == 'ready':
+                self.ready.set()
+            elif kind == 'failed':
+                self.error = message[1]
+                print(f"Özetleme servisi başlatılamadı: {self.error}")
+                self.ready.set()
+                self._fail_pending()
+                return
+            elif kind == 'results':
+                _, results, latency = message
+                with self._lock:
+                    self.batch_count += 1
+                    self.request_count += len(results)
+                    self.last_batch_size = len(results)
+                    self.last_batch_latency = latency
+                    self.total_batch_latency += latency
+                    futures = [(self._futures.pop(request_id, None), summary, error)
+                               for request_id, summary, error in results]
+                for future, summary, error in futures:
+                    if future is None:
+                        continue
+                    if error is None:
+                        future.set_result(summary)
+                    else:
+                        future.set_exception(RuntimeError(error))
+
+    def _fail_pending(self):
+        with self._lock:
+            futures, self._futures = list(self._futures.values()), {}
+        for future in futures:
+            future.set_exception(RuntimeError(self.error or 'servis kapandı'))
+
+    @property
+    def available(self) -> bool:
+        return self.error is None and self._process.is_alive()
+
+    def submit(self, text: str) -> Future:
+        """Metni özetleme kuyruğuna ekler."""
+        future: Future = Future()
+        if not self.available:
+            future.set_exception(RuntimeError(self.error or 'servis çalışmıyor'))
+            return future
+        request_id = next(self._ids)
+        with self._lock:
+            self._futures[request_id] = future
+        self._requests.put((request_id, text))
+        return future
+
+    def summarize(self, text: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Metnin özetini döndürür; zaman aşımı veya hata durumunda None."""
+        try:
+            return self.submit(text).result(timeout=timeout)
+        except FutureTimeoutError:
+            print("NLP özetleme zaman aşımına uğradı, kural tabanlı özet kullanılıyor.")
+        except Exception as e:
+            print(f"NLP özetleme hatası: {e}")
+        return None
+
+    def stats(self) -> Dict:
+        """Kuyruk derinliği ve grup gecikmesi istatistiklerini döndürür."""
+        try:
+            queued = self._requests.qsize()
+        except NotImplementedError:  # macOS
+            queued = None
+        with self._lock:
+            return {
+                'ready': self.ready.is_set() and self.error is None,
+                'in_flight': len(self._futures),
+                'queue_depth': queued,
+                'batches': self.batch_count,
+                'requests': self.request_count,
+                'last_batch_size': self.last_batch_size,
+                'last_batch_latency_s': self.last_batch_latency,
+                'avg_batch_latency_s': (self.total_batch_latency / self.batch_count
+                                        if self.batch_count else 0.0),
+            }
+
+    def close(self):
+        """Servis sürecini durdurur."""
+        if self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+        # Okuyucu iş parçacığı süreç sonlanınca kendiliğinden çıkar; öldürülen
+        # süreç kuyruğun yazma kilidini tutuyor olabileceğinden kuyruğa yazılmaz
+        self.error = self.error or 'servis kapandı'
+        self._fail_pending()
+
+
+# Her servis modeli kendi sürecinde tutar; sınır aşılınca en uzun süredir
+# kullanılmayan servis kapatılır
+MAX_SERVICES = 2
+
+_services: 'OrderedDict[Tuple[str, str], SummarizerService]' = OrderedDict()
+_services_lock = threading.Lock()
+
+
+def _close_services():
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+    for service in services:
+        service.close()
+
+
+atexit.register(_close_services)
+
+
+def get_summarizer_service(model: str = DEFAULT_MODEL, backend: str = 'pytorch',
+                           **kwargs) -> SummarizerService:
+    """(model, arka uç) başına süreç genelinde paylaşılan özetleme servisini döndürür.
+
+    Servis ilk çağrıda başlatılır, süreci sonlanmışsa yeniden başlatılır.
+    ``kwargs`` yalnızca servis başlatılırken kullanılır.
+    """
+    key = (model, backend)
+    stale = []
+    with _services_lock:
+        service = _services.get(key)
+        if service is not None and not service.available:
+            stale.append(_services.pop(key))
+            service = None
+        if service is None:
+            while len(_services) >= MAX_SERVICES:
+                stale.append(_services.popitem(last=False)[1])
+            service = _services[key] = SummarizerService(model, backend, **kwargs)
+        else:
+            _services.move_to_end(key)
+    for old in stale:
+        old.close()
+    return service
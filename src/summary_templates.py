@@ -0,0 +1,189 @@
+"""
+Derlenmiş özet şablonları ve tek geçişli özet üretimi.
+
+Bir dilin sabit cümleleri, başlık blokları ve test -> kategori eşlemesi
+şablon oluşturulurken (bkz. locales.MessageCatalog) bir kez hazırlanır.
+Bir raporun sonuçları tek geçişte dolaşılır: anormal mesajlar ve (yalnızca
+detaylı yorum istenirse) kategori satırları aynı döngüde toplanır; yalnızca
+istenen çıktılar (ör. yalnızca sesli özet metni) oluşturulur. Mesajlar
+analizdeki metinden değil durum kodu ve referans aralığından şablonun
+dilinde üretilir; analiz sözlüğü ve ``ReportAnalysis`` modeli aynı şekilde
+işlenir.
+"""
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .result_model import ReportAnalysis
+
+SIMPLE = 'simple_summary'
+DETAILED = 'detailed_commentary'
+TREND = 'trend_commentary'
+OUTPUTS = (SIMPLE, DETAILED, TREND)
+
+# (kategori anahtarı, testler) — detaylı yorumda bu sırayla yazılır; başlıklar katalogdadır
+CATEGORY_TESTS = (
+    ('hematology', ('hemoglobin', 'hematocrit', 'wbc', 'rbc', 'platelet')),
+    ('biochemistry', ('glucose', 'cholesterol', 'triglyceride', 'creatinine', 'alt', 'ast')),
+)
+
+
+def _counts(analyses: Union[Dict, ReportAnalysis]) -> Tuple[int, int, int]:
+    if isinstance(analyses, ReportAnalysis):
+        return analyses.total_tests, analyses.normal_count, analyses.abnormal_count
+    summary = analyses.get('summary', {})
+    return (summary.get('total_tests', 0), summary.get('normal_count', 0),
+            summary.get('abnormal_count', 0))
+
+
+def _plural_forms(strings: Mapping[str, str], key: str) -> Tuple[str, str]:
+    return strings[key], strings.get(f'{key}_one', strings[key])
+
+
+class SummaryTemplate:
+    """Özet metinlerinin sabit parçaları ve kategori indeksi."""
+
+    def __init__(self, catalog: 'MessageCatalog', strings: Mapping[str, str],
+                 categories: Iterable[Tuple[str, Iterable[str]]]):
+        """
+        Args:
+            catalog: Test adlarını ve sonuç mesajlarını üreten dil kataloğu
+            strings: Katalogdaki ``summary`` bölümü
+            categories: (başlık, testler) çiftleri
+        """
+        self.catalog = catalog
+        self.categories = tuple((title, tuple(tests)) for title, tests in categories)
+        # Test adı -> kategori sırası (tek sözlük araması)
+        self.category_of: Dict[str, int] = {
+            test: index for index, (_, tests) in enumerate(self.categories) for test in tests
+        }
+        self.category_headers = tuple(f"{title}\n{'-' * 40}" for title, _ in self.categories)
+
+        self.opening = strings['opening']
+        # (çoğul, tekil) — sayı 1 ise tekil biçim; katalogda '_one' yoksa ikisi aynıdır
+        self.total_suffix = _plural_forms(strings, 'total_suffix')
+        self.normal_suffix = _plural_forms(strings, 'normal_suffix')
+        self.abnormal_suffix = _plural_forms(strings, 'abnormal_suffix')
+        self.attention = "\n" + strings['attention']
+        self.all_normal = "\n" + strings['all_normal']
+        rule = "=" * 50
+        self.detailed_header = f"{rule}\n{strings['detailed_title']}\n{rule}\n"
+        self.detailed_abnormal = strings['detailed_abnormal']
+        self.detailed_normal = strings['detailed_normal']
+        self.icons = {'normal': "✓"}
+        self.warning_icon = "⚠"
+
+        self.trend_header = strings['trend_header']
+        self.trend_changed = strings['trend_changed']
+        self.trend_unchanged = strings['trend_unchanged']
+        self.trend_directions = (strings['trend_decreased'], strings['trend_increased'])
+        self.trend_recovered = strings['trend_recovered']
+        self.trend_left_range = strings['trend_left_range']
+
+    def render(self, analyses: Union[Dict, ReportAnalysis], outputs: Iterable[str] = OUTPUTS,
+               deltas: Optional[Dict[str, Dict]] = None) -> Dict[str, str]:
+        """İstenen metinleri sonuçlar üzerinde tek geçişte üretir.
+
+        Trend metni (``deltas`` verilmişse) basit özete ve detaylı yoruma
+        eklenir; ``generate`` çıktısıyla aynı metinleri verir.
+        """
+        want_simple, want_detailed = SIMPLE in outputs, DETAILED in outputs
+        want_trend = bool(deltas) and (TREND in outputs or want_simple or want_detailed)
+        abnormal_messages: List[str] = []
+        groups: List[List[str]] = [[] for _ in self.categories]
+        statuses: Dict[str, Optional[str]] = {}
+
+        category_of, icons, warning = self.category_of, self.icons, self.warning_icon
+        message_of = self.catalog.message
+        if isinstance(analyses, ReportAnalysis):
+            for result in analyses:
+                test_name = result.test_name
+                if result.status is None:
+                    status, message = None, result.message or test_name
+                else:
+                    status = result.status.label
+                    message = message_of(test_name, status, result.reference_range)
+                if status == 'low' or status == 'high':
+                    abnormal_messages.append(message)
+                if want_detailed:
+                    index = category_of.get(test_name)
+                    if index is not None:
+                        unit = result.unit if result.unit is not None else ''
+                        groups[index].append(f"{icons.get(status, warning)} {message}: {result.value} {unit}")
+                if want_trend:
+                    statuses[test_name] = status
+        else:
+            for test_name, analysis in analyses.get('analyses', {}).items():
+                status = analysis.get('status')
+                if status is None:
+                    message = analysis.get('message', test_name)
+                else:
+                    message = message_of(test_name, status, analysis.get('reference_range'))
+                if status == 'low' or status == 'high':
+                    abnormal_messages.append(message)
+                if want_detailed:
+                    index = category_of.get(test_name)
+                    if index is not None:
+                        groups[index].append(f"{icons.get(status, warning)} {message}: "
+                                             f"{analysis.get('value')} {analysis.get('unit', '')}")
+                if want_trend:
+                    statuses[test_name] = status
+
+        total, normal, abnormal = _counts(analyses)
+        trend = self.render_trend(deltas, statuses) if want_trend else ""
+        rendered = {}
+        if want_simple:
+            rendered[SIMPLE] = self._simple(total, normal, abnormal, abnormal_messages, trend)
+        if want_detailed:
+            rendered[DETAILED] = self._detailed(groups, abnormal, trend)
+        if TREND in outputs:
+            rendered[TREND] = trend
+        return rendered
+
+    def _simple(self, total: int, normal: int, abnormal: int, messages: List[str], trend: str) -> str:
+        parts = [f"{self.opening}{total}{self.total_suffix[total == 1]}"]
+        if normal > 0:
+            parts.append(f"{normal}{self.normal_suffix[normal == 1]}")
+        if abnormal > 0:
+            parts.append(f"{abnormal}{self.abnormal_suffix[abnormal == 1]}")
+        if messages:
+            parts.append(self.attention)
+            parts.extend(f"- {message}" for message in messages)
+        if normal == total and total > 0:
+            parts.append(self.all_normal)
+        text = "\n".join(parts)
+        return f"{text}\n\n{trend}" if trend else text
+
+    def _detailed(self, groups: List[List[str]], abnormal: int, trend: str) -> str:
+        parts = [self.detailed_header]
+        for header, lines in zip(self.category_headers, groups):
+            if lines:
+                parts.append(header)
+                parts.extend(lines)
+                parts.append("")
+        parts.append(self.detailed_abnormal if abnormal > 0 else self.detailed_normal)
+        text = "\n".join(parts)
+        return f"{text}\n\n{trend}" if trend else text
+
+    def render_trend(self, deltas: Dict[str, Dict], statuses: Dict[str, Optional[str]]) -> str:
+        """Önceki sonuçlara göre değişim metni (bkz. ResultStore.deltas)."""
+        lines = []
+        test_label = self.catalog.test_name
+        for test_name, change in deltas.items():
+            name = test_label(test_name)
+            when = '.'.join(reversed(change['previous_at'][:10].split('-')))
+            delta = change['delta']
+            if delta:
+                unit = f" {change['unit']}" if change.get('unit') else ''
+                line = self.trend_changed.format(name=name, when=when, amount=f"{abs(delta):g}",
+                                                 unit=unit, direction=self.trend_directions[delta > 0])
+            else:
+                line = self.trend_unchanged.format(name=name, when=when)
+            status, previous = statuses.get(test_name), change.get('previous_status')
+            if status == 'normal' and previous in ('low', 'high'):
+                line += self.trend_recovered
+            elif status in ('low', 'high') and previous == 'normal':
+                line += self.trend_left_range
+            lines.append(line)
+        if not lines:
+            return ""
+        return self.trend_header + "\n" + "\n".join(lines)
+
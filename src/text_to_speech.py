@@ -1,27 +1,156 @@
 """
 Metin-ses dönüştürme modülü.
+
+pyttsx3 ve gTTS ilk gerçek kullanımda içe aktarılır; modülün kendisini
+içe aktarmak ses motorlarını yüklemez.
 """
-import pyttsx3
-import gtts
-from typing import Optional
-import io
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+import os
+import re
+import shutil
+import tempfile
+
+from .metrics import instrument
+
+
+# Bu boyutu aşan ses çıktısı bellekte tutulmaz, benzersiz adlı geçici dosyaya taşınır
+SPILL_THRESHOLD = 16 * 1024 * 1024
+
+# pyttsx3 yalnızca dosya yoluna yazabildiği için varsa bellek tabanlı dizin kullanılır
+_SCRATCH_DIR = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+
+# Kütüphaneyi içe aktarmadan yalnızca kurulu olup olmadığına bakılır
+PYTTSX3_AVAILABLE = find_spec('pyttsx3') is not None
+GTTS_AVAILABLE = find_spec('gtts') is not None
+AIOHTTP_AVAILABLE = find_spec('aiohttp') is not None
+
+
+def _gtts(text: str, language: str):
+    import gtts
+    return gtts.gTTS(text=text, lang=language, slow=False)
+
+
+# Dosya başlığı -> (biçim, MIME türü, uzantı); pyttsx3 sürücüye göre WAV veya
+# AIFF, gTTS MP3 üretir
+AUDIO_CONTAINERS = (
+    (b'RIFF', ('wav', 'audio/wav', 'wav')),
+    (b'OggS', ('opus', 'audio/ogg', 'ogg')),
+    (b'FORM', ('aiff', 'audio/aiff', 'aiff')),
+    (b'ID3', ('mp3', 'audio/mpeg', 'mp3')),
+)
+_MP3 = ('mp3', 'audio/mpeg', 'mp3')
+
+
+def describe_audio(audio: bytes) -> Tuple[str, str, str]:
+    """Ses baytlarının (biçim, MIME türü, uzantı) bilgisini başlığından bulur."""
+    for magic, info in AUDIO_CONTAINERS:
+        if audio.startswith(magic):
+            return info
+    # ID3 etiketi olmayan MP3 akışı çerçeve eşleme bitleriyle (0xFFE) başlar
+    if len(audio) > 1 and audio[0] == 0xFF and audio[1] & 0xE0 == 0xE0:
+        return _MP3
+    return 'unknown', 'application/octet-stream', 'bin'
+
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?؟])\s+')
+
+
+def split_into_chunks(text: str) -> List[str]:
+    """Özet metnini satırlara, satırları da cümlelere böler.
+
+    ``generate_simple_summary`` her bilgiyi ayrı bir satıra, anormal
+    sonuçları da ``- `` ile başlayan maddelere yazar; madde işaretleri
+    seslendirilmediği için atılır.
+    """
+    chunks = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line.startswith('- '):
+            line = line[2:]
+        for sentence in _SENTENCE_END_RE.split(line):
+            sentence = sentence.strip()
+            if sentence:
+                chunks.append(sentence)
+    return chunks
+
+
+# Sistem seslerinin adlarında geçen dil adları
+_VOICE_LANGUAGE_NAMES = {'tr': 'turkish', 'en': 'english', 'ar': 'arabic'}
+
+
+_VOICE_ID_SEPARATORS_RE = re.compile(r'[._/\\-]+')
+
+
+def _voice_language_codes(voice) -> set:
+    """Sesin dil kodları: ``languages`` listesi ve kimliğin parçaları (ör. 'tr', 'tr-TR').
+
+    espeak dilleri başında öncelik baytı olan bayt dizileri (b'\\x05tr'),
+    macOS 'tr_TR', Windows ise kimlikte 'TTS_MS_TR-TR_TOLGA' biçimini kullanır;
+    'ar' gibi kısa kodlar kimlikte alt dizgi olarak aranmaz ('software').
+    """
+    codes = set()
+    for code in getattr(voice, 'languages', None) or ():
+        if isinstance(code, bytes):
+            code = code.decode('utf-8', 'ignore')
+        code = re.sub(r'^[^A-Za-z]+', '', str(code)).lower()
+        if code:
+            codes.add(re.split(r'[-_]', code)[0])
+    codes.update(_VOICE_ID_SEPARATORS_RE.split(str(voice.id).lower()))
+    return codes
+
+
+def find_language_voice(voices, language: str = 'tr') -> Optional[str]:
+    """Sistem sesleri arasından dile (varsayılan Türkçe) uygun sesin kimliğini bulur."""
+    # Ad yalnızca tam dil adıyla aranır (ör. 'de' kodu 'Desktop' adına uymaz)
+    name = _VOICE_LANGUAGE_NAMES.get(language)
+    for voice in voices:
+        if language in _voice_language_codes(voice) or (name and name in (voice.name or '').lower()):
+            return voice.id
+    return None
+
+
+def find_profile_voice(voices, profile: str) -> Optional[str]:
+    """'female' veya 'male' profiline uyan ilk sesin kimliğini bulur."""
+    for voice in voices:
+        name = voice.name.lower()
+        if profile == 'female' and ('female' in name or 'zira' in name):
+            return voice.id
+        if profile == 'male' and 'male' in name and 'female' not in name:
+            return voice.id
+    return None
 
 
 class TextToSpeech:
     """Metni sese dönüştürür."""
     
-    def __init__(self, engine: str = 'pyttsx3', language: str = 'tr'):
+    def __init__(self, engine: str = 'pyttsx3', language: str = 'tr', use_pool: bool = False):
         """
         Args:
             engine: 'pyttsx3' (offline) veya 'gtts' (online)
             language: Dil kodu ('tr', 'en', vb.)
+            use_pool: pyttsx3 için kendi motorunu kurmak yerine süreç genelinde
+                paylaşılan, önceden başlatılmış motoru kullanır (bkz. tts_pool);
+                gTTS için aiohttp kuruluysa paylaşılan asenkron istemciyi
+                kullanır (bkz. async_tts)
         """
         self.engine_type = engine
         self.language = language
+        self.voice_profile = 'default'
         self.engine = None
+        self.worker = None
+        self.online = None
         
-        if engine == 'pyttsx3':
+        if engine == 'gtts' and use_pool and AIOHTTP_AVAILABLE:
+            from .async_tts import get_online_backend
+            self.online = get_online_backend(language)
+        elif engine == 'pyttsx3' and use_pool:
+            from .tts_pool import get_engine_manager
+            self.worker = get_engine_manager().pyttsx3_worker()
+        elif engine == 'pyttsx3':
             try:
+                import pyttsx3
                 self.engine = pyttsx3.init()
                 self._configure_pyttsx3()
             except Exception as e:
@@ -41,16 +170,16 @@ class TextToSpeech:
             # Ses seviyesi (0.0-1.0)
             self.engine.setProperty('volume', 1.0)
             
-            # Türkçe ses seçimi (mevcut sistem sesleri)
-            voices = self.engine.getProperty('voices')
-            # Türkçe ses varsa seç
-            for voice in voices:
-                if 'turkish' in voice.name.lower() or 'tr' in voice.id.lower():
-                    self.engine.setProperty('voice', voice.id)
-                    break
+            # Dile uygun ses seçimi (mevcut sistem sesleri)
+            voice_id = find_language_voice(self.engine.getProperty('voices'), self.language)
+            if voice_id:
+                self.engine.setProperty('voice', voice_id)
     
+    @instrument('tts.speak', sizes=lambda args, result: {'chars': len(args[1])})
     def speak(self, text: str) -> bool:
         """Metni seslendirir (offline - pyttsx3)."""
+        if self.worker is not None:
+            return self.worker.speak(text, self.language, self.voice_profile)
         if self.engine_type == 'pyttsx3' and self.engine:
             try:
                 self.engine.say(text)
@@ -61,8 +190,11 @@ class TextToSpeech:
                 return False
         return False
     
+    @instrument('tts.save_to_file', sizes=lambda args, result: {'chars': len(args[1])})
     def save_to_file(self, text: str, output_path: str) -> bool:
         """Metni ses dosyasına kaydeder."""
+        if self.worker is not None:
+            return self.worker.save_to_file(text, output_path, self.language, self.voice_profile)
         if self.engine_type == 'pyttsx3' and self.engine:
             try:
                 self.engine.save_to_file(text, output_path)
@@ -74,7 +206,7 @@ class TextToSpeech:
         
         elif self.engine_type == 'gtts':
             try:
-                tts = gtts.gTTS(text=text, lang=self.language, slow=False)
+                tts = _gtts(text, self.language)
                 tts.save(output_path)
                 return True
             except Exception as e:
@@ -83,34 +215,97 @@ class TextToSpeech:
         
         return False
     
-    def get_audio_bytes(self, text: str) -> Optional[bytes]:
-        """Metni ses byte'larına dönüştürür (gTTS için)."""
-        if self.engine_type == 'gtts':
+    @instrument('tts.synthesize_to_buffer', sizes=lambda args, result: {'chars': len(args[1])})
+    def synthesize_to_buffer(self, text: str,
+                             spill_threshold: int = SPILL_THRESHOLD) -> Optional[BinaryIO]:
+        """Metni başa sarılmış bir ses tamponuna dönüştürür (her iki motor için).
+
+        Tampon ``spill_threshold`` baytı aşana kadar bellekte kalır; aşarsa
+        içerik isimsiz, benzersiz bir geçici dosyaya taşınır. Eşzamanlı
+        istekler hiçbir zaman ortak bir dosya adını paylaşmaz.
+        """
+        buffer = tempfile.SpooledTemporaryFile(max_size=spill_threshold)
+        
+        if self.online is not None:
+            audio = self.online.synthesize(text)
+            if audio is None:
+                buffer.close()
+                return None
+            buffer.write(audio)
+        
+        elif self.engine_type == 'gtts':
             try:
-                tts = gtts.gTTS(text=text, lang=self.language, slow=False)
-                audio_buffer = io.BytesIO()
-                tts.write_to_fp(audio_buffer)
-                audio_buffer.seek(0)
-                return audio_buffer.read()
+                _gtts(text, self.language).write_to_fp(buffer)
             except Exception as e:
                 print(f"gTTS byte dönüştürme hatası: {e}")
+                buffer.close()
                 return None
-        return None
+        
+        elif self.engine_type == 'pyttsx3' and (self.engine or self.worker is not None):
+            fd, path = tempfile.mkstemp(suffix='.wav', dir=_SCRATCH_DIR)
+            os.close(fd)
+            try:
+                if not self.save_to_file(text, path):
+                    buffer.close()
+                    return None
+                with open(path, 'rb') as f:
+                    shutil.copyfileobj(f, buffer)
+            finally:
+                os.remove(path)
+        
+        else:
+            buffer.close()
+            return None
+        
+        buffer.seek(0)
+        return buffer
+    
+    @instrument('tts.get_audio_bytes', sizes=lambda args, audio: {'chars': len(args[1]),
+                                                                   'bytes': len(audio or b'')})
+    def get_audio_bytes(self, text: str) -> Optional[bytes]:
+        """Metni ses byte'larına dönüştürür (her iki motor için)."""
+        buffer = self.synthesize_to_buffer(text)
+        if buffer is None:
+            return None
+        with buffer:
+            return buffer.read()
+    
+    @instrument('tts.iter_audio_chunks', sizes=lambda args, result: {'chars': len(args[1])})
+    def iter_audio_chunks(self, text: str, max_workers: int = 4) -> Iterator[Tuple[int, str, Optional[bytes]]]:
+        """Metni cümle cümle sentezler ve ses parçalarını sırayla üretir.
+
+        Parçalar en fazla ``max_workers`` eşzamanlı işle sentezlenir; ilk
+        parça hazır olur olmaz (diğerleri beklenmeden) üretilir, böylece
+        oynatma veya indirme tüm metnin sentezini beklemez. pyttsx3 motoru
+        iş parçacığı güvenli olmadığından tek işçiyle çalışır.
+
+        Yields:
+            (sıra, parça metni, ses baytları) üçlüleri; sentez başarısızsa bayt None
+        """
+        chunks = split_into_chunks(text)
+        if not chunks:
+            return
+        if self.engine_type != 'gtts':
+            max_workers = 1
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Belleği sınırlamak için en fazla 2 x işçi kadar parça önde tutulur
+            window = max_workers * 2
+            futures = [executor.submit(self.get_audio_bytes, chunk) for chunk in chunks[:window]]
+            for index, chunk in enumerate(chunks):
+                next_index = index + window
+                if next_index < len(chunks):
+                    futures.append(executor.submit(self.get_audio_bytes, chunks[next_index]))
+                yield index, chunk, futures[index].result()
+                futures[index] = None
     
+    @instrument('tts.set_voice_profile', returns_value=False)
     def set_voice_profile(self, profile: str):
         """Ses profili ayarlar (v1.0 özelliği)."""
+        # Paylaşılan motorda ses, her istekte önbellekteki kimlikle seçilir
+        self.voice_profile = profile
         if self.engine_type == 'pyttsx3' and self.engine:
-            voices = self.engine.getProperty('voices')
-            if profile == 'female':
-                # Kadın sesi seç
-                for voice in voices:
-                    if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                        self.engine.setProperty('voice', voice.id)
-                        break
-            elif profile == 'male':
-                # Erkek sesi seç
-                for voice in voices:
-                    if 'male' in voice.name.lower() and 'female' not in voice.name.lower():
-                        self.engine.setProperty('voice', voice.id)
-                        break
+            voice_id = find_profile_voice(self.engine.getProperty('voices'), profile)
+            if voice_id:
+                self.engine.setProperty('voice', voice_id)
 
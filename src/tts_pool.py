@@ -0,0 +1,152 @@
+"""
+Paylaşılan TTS motoru yöneticisi.
+
+pyttsx3 motoru süreç başına bir kez başlatılır ve iş parçacığı güvenli
+olmadığından tüm çağrılar tek bir adanmış iş parçacığında, bir istek
+kuyruğu üzerinden sırayla çalıştırılır. Dil/profil için ses seçimi de
+bir kez yapılıp önbelleğe alınır; her istekte sistem sesleri taranmaz.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+from .text_to_speech import find_language_voice, find_profile_voice
+
+
+class Pyttsx3Worker:
+    """Tek bir pyttsx3 motorunu sahiplenen ve istekleri sırayla işleyen iş parçacığı."""
+
+    def __init__(self, rate: int = 150, volume: float = 1.0, start_timeout: float = 10.0):
+        self.rate = rate
+        self.volume = volume
+        self.error: Optional[str] = None
+        self._all_voices = []
+        self._voices: Dict[Tuple[str, str], Optional[str]] = {}
+        self._default_voice: Optional[str] = None
+        self._current_voice: Optional[str] = None
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='pyttsx3-worker', daemon=True)
+        self._thread.start()
+        self._ready.wait(start_timeout)
+
+    @property
+    def available(self) -> bool:
+        return self.error is None and self._thread.is_alive()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.setProperty('rate', self.rate)
+            engine.setProperty('volume', self.volume)
+        except Exception as e:
+            self.error = str(e)
+            print(f"pyttsx3 yüklenemedi: {e}")
+            self._ready.set()
+            return
+        self._all_voices = list(engine.getProperty('voices'))
+        # Dile/profile uygun ses bulunamayan istekler için motorun kendi sesi
+        self._default_voice = self._current_voice = engine.getProperty('voice')
+        self._ready.set()
+
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            func, args, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(engine, *args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def submit(self, func: Callable, *args) -> Future:
+        """``func(engine, *args)`` çağrısını motor iş parçacığında sıraya koyar."""
+        future: Future = Future()
+        if not self.available:
+            future.set_exception(RuntimeError(self.error or 'pyttsx3 motoru çalışmıyor'))
+        else:
+            self._queue.put((func, args, future))
+        return future
+
+    def voice_id(self, language: str, profile: str = 'default') -> Optional[str]:
+        """Dil ve profil için ses kimliğini döndürür (ilk çağrıdan sonra önbellekten)."""
+        key = (language, profile)
+        if key not in self._voices:
+            voices = self._all_voices
+            voice_id = find_profile_voice(voices, profile) if profile != 'default' else None
+            self._voices[key] = voice_id or find_language_voice(voices, language)
+        return self._voices[key]
+
+    def _select_voice(self, engine, language: str, profile: str):
+        # Önceki isteğin profil sesi sonraki varsayılan isteğe taşınmasın
+        voice_id = self.voice_id(language, profile) or self._default_voice
+        if voice_id and voice_id != self._current_voice:
+            engine.setProperty('voice', voice_id)
+            self._current_voice = voice_id
+
+    def _speak(self, engine, text: str, language: str, profile: str):
+        self._select_voice(engine, language, profile)
+        engine.say(text)
+        engine.runAndWait()
+
+    def _save(self, engine, text: str, output_path: str, language: str, profile: str):
+        self._select_voice(engine, language, profile)
+        engine.save_to_file(text, output_path)
+        engine.runAndWait()
+
+    def speak(self, text: str, language: str = 'tr', profile: str = 'default') -> bool:
+        try:
+            self.submit(self._speak, text, language, profile).result()
+            return True
+        except Exception as e:
+            print(f"Seslendirme hatası: {e}")
+            return False
+
+    def save_to_file(self, text: str, output_path: str, language: str = 'tr',
+                     profile: str = 'default') -> bool:
+        try:
+            self.submit(self._save, text, output_path, language, profile).result()
+            return True
+        except Exception as e:
+            print(f"Dosyaya kaydetme hatası: {e}")
+            return False
+
+    def close(self):
+        self._queue.put(None)
+
+
+class TTSEngineManager:
+    """Süreç genelindeki TTS motorlarını bir kez başlatır ve paylaştırır."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pyttsx3: Optional[Pyttsx3Worker] = None
+
+    def pyttsx3_worker(self) -> Pyttsx3Worker:
+        with self._lock:
+            if self._pyttsx3 is None:
+                self._pyttsx3 = Pyttsx3Worker()
+            return self._pyttsx3
+
+    def stats(self) -> Dict:
+        worker = self._pyttsx3
+        return {
+            'pyttsx3_ready': worker is not None and worker.available,
+            'pyttsx3_queue_depth': worker.queue_depth if worker is not None else 0,
+            'cached_voices': len(worker._voices) if worker is not None else 0,
+        }
+
+
+_manager = TTSEngineManager()
+
+
+def get_engine_manager() -> TTSEngineManager:
+    return _manager
@@ -0,0 +1,11 @@
+"""
+Testler için ortak ayarlar: önbellekler kullanıcının dizinine değil geçici
+bir dizine yazılır (``src`` içe aktarılmadan önce ayarlanmalıdır).
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault('SMART_AUDIO_CACHE_DIR', tempfile.mkdtemp(prefix='smart-audio-test-'))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
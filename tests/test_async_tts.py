@@ -0,0 +1,182 @@
+"""AsyncOnlineTTS: yeniden deneme, geri çekilme, devre kesici ve çevrimdışı yedek."""
+import asyncio
+import io
+import wave
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import src.async_tts as async_tts
+from benchmarks.stub_tts_server import start_server
+from src.async_tts import AsyncOnlineTTS, CircuitBreaker, OnlineTTSBackend, split_for_request
+from src.cache import ContentCache, cached_synthesize, tts_cache_key
+from src.text_to_speech import TextToSpeech, describe_audio
+
+TEXT = ("Laboratuvar sonuçlarınız analiz edildi. Toplam 5 test değerlendirildi. "
+        "Hemoglobin değeri düşük (referans: 12.0-16.0 g/dL). "
+        "Glukoz değeri yüksek (referans: 70-100 mg/dL).")
+
+
+@pytest.fixture
+def stub():
+    server, url = start_server(latency=0.0)
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+
+def _fail_first(server, count: int):
+    """Sunucunun ilk ``count`` isteğine 503 döndürmesini sağlar."""
+    base = server.RequestHandlerClass
+
+    class Flaky(base):
+        remaining = count
+
+        def do_POST(self):
+            if type(self).remaining > 0:
+                type(self).remaining -= 1
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            super().do_POST()
+
+    server.RequestHandlerClass = Flaky
+
+
+def _synthesize(client: AsyncOnlineTTS, text: str = TEXT) -> bytes:
+    async def run():
+        try:
+            return await client.synthesize(text)
+        finally:
+            await client.close()
+    return asyncio.run(run())
+
+
+def test_synthesize_joins_pieces(stub):
+    _, url = stub
+    client = AsyncOnlineTTS(base_url=url, backoff=0.001)
+    audio = _synthesize(client)
+    pieces = split_for_request(TEXT)
+    assert len(pieces) > 1
+    assert audio == b''.join(b'\xff\xfb' + piece.encode('utf-8') for piece in pieces)
+    assert describe_audio(audio)[0] == 'mp3'
+    assert client.stats() == {'breaker': 'closed', 'requests': len(pieces), 'failures': 0}
+
+
+def test_retry_with_exponential_backoff(stub, monkeypatch):
+    server, url = stub
+    _fail_first(server, 2)
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(async_tts.random, 'random', lambda: 0.0)
+    monkeypatch.setattr(async_tts.asyncio, 'sleep', record_sleep)
+    client = AsyncOnlineTTS(base_url=url, retries=3, backoff=0.1)
+    assert _synthesize(client, 'Merhaba.') == b'\xff\xfbMerhaba.'
+    assert delays == [0.1, 0.2]
+    assert client.requests == 3
+    assert client.failures == 2
+    assert client.breaker.state == 'closed'
+
+
+def test_retries_exhausted_raises(stub):
+    server, url = stub
+    _fail_first(server, 10)
+    client = AsyncOnlineTTS(base_url=url, retries=2, backoff=0.001)
+    with pytest.raises(Exception):
+        _synthesize(client, 'Merhaba.')
+    assert client.requests == 3
+    assert client.breaker.failures == 1
+
+
+def test_circuit_breaker_states(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(async_tts.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    now[0] += 30.0
+    assert breaker.state == 'half-open' and breaker.allow()
+    # Yarı açıkken tek hata devreyi yeniden açar
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    now[0] += 30.0
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+
+
+def test_open_breaker_skips_requests(stub):
+    server, url = stub
+    _fail_first(server, 10)
+    client = AsyncOnlineTTS(base_url=url, retries=0, breaker=CircuitBreaker(failure_threshold=1))
+
+    async def run():
+        try:
+            with pytest.raises(Exception):
+                await client.synthesize('Merhaba.')
+            requests = client.requests
+            with pytest.raises(RuntimeError):
+                await client.synthesize('Merhaba.')
+            return requests
+        finally:
+            await client.close()
+
+    requests = asyncio.run(run())
+    assert client.requests == requests == 1
+    assert client.breaker.state == 'open'
+
+
+def test_backend_returns_none_on_failure(stub):
+    server, url = stub
+    _fail_first(server, 10)
+    backend = OnlineTTSBackend(base_url=url, retries=0)
+    try:
+        assert backend.synthesize('Merhaba.') is None
+        assert backend.stats()['failed_calls'] == 1
+    finally:
+        backend.close()
+
+
+def _wav() -> bytes:
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(8000)
+        writer.writeframes(b'\x00\x00' * 800)
+    return output.getvalue()
+
+
+def test_gtts_failure_falls_back_to_pyttsx3_key(stub, monkeypatch):
+    server, url = stub
+    _fail_first(server, 10)
+    backend = OnlineTTSBackend(base_url=url, retries=0)
+    monkeypatch.setattr(async_tts, 'get_online_backend', lambda language='tr': backend)
+
+    def save_to_file(self, text, output_path):
+        with open(output_path, 'wb') as f:
+            f.write(_wav())
+        return True
+
+    # Yerel ses motoru yerine sabit bir WAV yazılır
+    monkeypatch.setattr(TextToSpeech, 'save_to_file', save_to_file)
+    cache = ContentCache('test-audio')
+    try:
+        audio = cached_synthesize('Merhaba.', 'gtts', 'tr', cache=cache)
+    finally:
+        backend.close()
+    assert describe_audio(audio)[0] == 'wav'
+    assert cache.get(tts_cache_key('Merhaba.', 'gtts', 'tr', 'default')) is None
+    assert cache.get(tts_cache_key('Merhaba.', 'pyttsx3', 'tr', 'default')) == audio
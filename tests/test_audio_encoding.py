@@ -0,0 +1,103 @@
+"""audio_encoding: sessizlik kırpma, ses düzeyi ve ffmpeg olmadan biçim geri dönüşü."""
+import io
+import wave
+
+import numpy as np
+import pytest
+
+import src.audio_encoding as audio_encoding
+from src.audio_encoding import (PADDING_MS, PEAK_DBFS, TARGET_RMS_DBFS, cached_encode,
+                                encode_audio, prepare_pcm)
+from src.cache import ContentCache
+
+RATE = 16000
+
+
+def _tone(seconds: float, amplitude: float = 0.05) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (np.sin(2 * np.pi * 220 * t) * amplitude * 32767).astype(np.int16)
+
+
+def _padded_tone() -> np.ndarray:
+    silence = np.zeros(RATE // 2, dtype=np.int16)
+    return np.concatenate([silence, _tone(0.5), silence])
+
+
+def _wav(samples: np.ndarray) -> bytes:
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(RATE)
+        writer.writeframes(samples.astype('<i2').tobytes())
+    return output.getvalue()
+
+
+def _dbfs(samples: np.ndarray) -> float:
+    values = samples.astype(np.float64) / 32768.0
+    return 20 * np.log10(np.sqrt(np.mean(values * values)))
+
+
+def test_trim_keeps_speech_with_padding():
+    trimmed = prepare_pcm(_padded_tone(), RATE, normalize=False)
+    expected = RATE // 2 + 2 * RATE * PADDING_MS // 1000
+    frame = RATE * audio_encoding.FRAME_MS // 1000
+    assert abs(len(trimmed) - expected) <= frame
+    assert np.array_equal(prepare_pcm(_padded_tone(), RATE, trim=False, normalize=False), _padded_tone())
+
+
+def test_normalize_to_target_level():
+    quiet = prepare_pcm(_tone(1.0, amplitude=0.01), RATE, trim=False)
+    assert _dbfs(quiet) == pytest.approx(TARGET_RMS_DBFS, abs=0.5)
+    # Sessiz aralar konuşma düzeyinin ölçümüne katılmaz
+    padded = prepare_pcm(_padded_tone(), RATE, trim=False)
+    speech = padded[RATE // 2:RATE]
+    assert _dbfs(speech) == pytest.approx(TARGET_RMS_DBFS, abs=0.5)
+
+
+def test_normalize_limits_peak():
+    # Kısa bir tepe kazancı sınırlar: tepe PEAK_DBFS'i aşmaz
+    samples = _tone(1.0, amplitude=0.01)
+    samples[RATE // 2] = 16000
+    prepared = prepare_pcm(samples, RATE, trim=False)
+    peak = np.max(np.abs(prepared.astype(np.float64))) / 32768.0
+    assert 20 * np.log10(peak) <= PEAK_DBFS + 0.01
+
+
+def test_silence_unchanged():
+    silence = np.zeros(RATE, dtype=np.int16)
+    assert np.array_equal(prepare_pcm(silence, RATE), silence)
+
+
+@pytest.fixture
+def no_ffmpeg(monkeypatch):
+    monkeypatch.setattr(audio_encoding, 'FFMPEG_AVAILABLE', False)
+
+
+def test_format_falls_back_to_wav_without_ffmpeg(no_ffmpeg):
+    result = encode_audio(_wav(_padded_tone()), 'speech')
+    assert result['format'] == 'wav'
+    assert result['media_type'] == 'audio/wav'
+    assert result['audio'][:4] == b'RIFF'
+
+
+def test_fallback_is_not_cached(no_ffmpeg, monkeypatch):
+    cache = ContentCache('test-encode')
+    audio = _wav(_padded_tone())
+    assert cached_encode(audio, 'mp3', cache=cache)['format'] == 'wav'
+    assert cached_encode(audio, 'mp3', cache=cache)['cached'] is False
+
+    # ffmpeg yeniden çalışınca istenen biçim üretilir ve saklanır
+    monkeypatch.setattr(audio_encoding, 'FFMPEG_AVAILABLE', True)
+    monkeypatch.setattr(audio_encoding, '_ffmpeg', lambda args, data: b'ID3\x04' + bytes(64))
+    result = cached_encode(audio, 'mp3', cache=cache)
+    assert (result['format'], result['cached']) == ('mp3', False)
+    result = cached_encode(audio, 'mp3', cache=cache)
+    assert (result['format'], result['media_type'], result['cached']) == ('mp3', 'audio/mpeg', True)
+
+
+def test_wav_request_is_cached(no_ffmpeg):
+    cache = ContentCache('test-encode')
+    audio = _wav(_padded_tone())
+    cached_encode(audio, 'wav', cache=cache)
+    assert cached_encode(audio, 'wav', cache=cache)['cached'] is True
@@ -0,0 +1,125 @@
+"""ReportPipeline: yalnızca girdisi değişen aşamalar yeniden hesaplanır."""
+import io
+import math
+import struct
+import wave
+
+import pytest
+
+import src.pipeline as pipeline_module
+from benchmarks.synthetic_pdf import build_pdf
+from src.pipeline import ReportPipeline
+
+
+def _wav(text: str) -> bytes:
+    rate = 8000
+    samples = [int(8000 * math.sin(2 * math.pi * 220 * i / rate)) for i in range(rate // 10 * len(text))]
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(struct.pack(f'<{len(samples)}h', *samples))
+    return output.getvalue()
+
+
+@pytest.fixture
+def synth_calls(monkeypatch):
+    calls = []
+
+    def synthesize(text, engine, language, voice_profile):
+        calls.append((engine, language))
+        return _wav(text[:5])
+
+    # Gerçek ses motoru yerine sentez çağrıları sayılır
+    monkeypatch.setattr(pipeline_module, 'cached_synthesize', synthesize)
+    return calls
+
+
+@pytest.fixture
+def pdf_bytes():
+    return build_pdf([['Hemoglobin 11.2 g/dL', 'Glukoz 131 mg/dL', 'ALT 25 U/L']])
+
+
+def runs(pipeline):
+    return {stage: pipeline.runs[stage] for stage in ('parse', 'analyze', 'summary', 'audio', 'encode')}
+
+
+def test_same_inputs_are_not_recomputed(pdf_bytes):
+    pipeline = ReportPipeline()
+    first = pipeline.run(pdf_bytes, 'Erkek')
+    second = pipeline.run(pdf_bytes, 'Erkek')
+    assert first['recomputed'] == ['parse', 'analyze', 'summary']
+    assert second['recomputed'] == []
+    assert runs(pipeline) == {'parse': 1, 'analyze': 1, 'summary': 1, 'audio': 0, 'encode': 0}
+
+
+def test_gender_change_skips_parsing(pdf_bytes):
+    pipeline = ReportPipeline()
+    pipeline.run(pdf_bytes, 'Erkek')
+    result = pipeline.run(pdf_bytes, 'Kadın')
+    assert result['recomputed'] == ['analyze', 'summary']
+    assert runs(pipeline) == {'parse': 1, 'analyze': 2, 'summary': 2, 'audio': 0, 'encode': 0}
+    # Önceki ayara dönüldüğünde hatırlanan sonuç kullanılır
+    assert pipeline.run(pdf_bytes, 'Erkek')['recomputed'] == []
+
+
+def test_locale_change_reruns_summary_and_audio_only(pdf_bytes, synth_calls):
+    pipeline = ReportPipeline()
+    pipeline.audio(pdf_bytes, 'Erkek', use_phrases=False)
+    pipeline.audio(pdf_bytes, 'Erkek', use_phrases=False, locale='en')
+    assert runs(pipeline) == {'parse': 1, 'analyze': 1, 'summary': 2, 'audio': 2, 'encode': 0}
+    assert [language for _, language in synth_calls] == ['tr', 'en']
+
+
+def test_engine_change_reruns_audio_only(pdf_bytes, synth_calls):
+    pipeline = ReportPipeline()
+    pipeline.audio(pdf_bytes, 'Erkek', engine='pyttsx3', use_phrases=False)
+    pipeline.audio(pdf_bytes, 'Erkek', engine='gtts', use_phrases=False)
+    pipeline.audio(pdf_bytes, 'Erkek', engine='pyttsx3', use_phrases=False)
+    assert runs(pipeline) == {'parse': 1, 'analyze': 1, 'summary': 1, 'audio': 2, 'encode': 0}
+    assert [engine for engine, _ in synth_calls] == ['pyttsx3', 'gtts']
+
+
+def test_format_change_reruns_encoding_only(pdf_bytes, synth_calls):
+    pytest.importorskip('numpy')
+    pipeline = ReportPipeline()
+    encoded = pipeline.encoded_audio(pdf_bytes, 'Erkek', use_phrases=False, audio_format='speech')
+    pipeline.encoded_audio(pdf_bytes, 'Erkek', use_phrases=False, audio_format='wav')
+    pipeline.encoded_audio(pdf_bytes, 'Erkek', use_phrases=False, audio_format='speech')
+    assert encoded['format'] in ('speech', 'wav')
+    assert runs(pipeline) == {'parse': 1, 'analyze': 1, 'summary': 1, 'audio': 1, 'encode': 2}
+    assert len(synth_calls) == 1
+
+
+class _PhraseTTS:
+    engine_type = 'pyttsx3'
+    language = 'tr'
+    voice_profile = 'default'
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_audio_bytes(self, text):
+        self.calls += 1
+        return _wav('x')
+
+
+def test_phrase_path_waits_for_warm_library(pdf_bytes, synth_calls, monkeypatch):
+    import src.phrase_audio as phrase_audio
+    from src.cache import ContentCache
+
+    tts = _PhraseTTS()
+    library = phrase_audio.PhraseAudioLibrary(tts, cache=ContentCache('test-phrases'))
+    monkeypatch.setattr(phrase_audio, 'get_phrase_library', lambda *args: library)
+
+    # Soğuk kütüphanede tüm metin sentezlenir, kütüphane arka planda ısınır
+    ReportPipeline().audio(pdf_bytes, 'Erkek')
+    assert len(synth_calls) == 1
+    library._warming.join(10)
+    assert library.ready.is_set()
+    assert tts.calls == len(phrase_audio.library_phrases())
+
+    audio = ReportPipeline().audio(pdf_bytes, 'Erkek')
+    assert len(synth_calls) == 1
+    assert audio is not None
@@ -0,0 +1,27 @@
+"""ReferenceSource: dosya değişince indeks yenilenir, okunamayan dosya yeniden denenir."""
+import json
+import os
+
+from src.locales import DEFAULT_LOCALE, get_catalog
+from src.reference_index import ReferenceSource
+
+
+def _write(path, content: str, mtime_ns: int):
+    path.write_text(content, encoding='utf-8')
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_broken_file_is_retried_after_fix(tmp_path):
+    path = tmp_path / 'reference_ranges.json'
+    start = os.stat(tmp_path).st_mtime_ns
+    _write(path, json.dumps({'glucose': {'min': 70, 'max': 100, 'unit': 'mg/dL'}}), start)
+    source = ReferenceSource(path, get_catalog(DEFAULT_LOCALE), {}, check_interval=0.0)
+    assert source.current().lookup('glucose').max == 100
+
+    # Yarım yazılmış dosya: eski indeks kullanılmaya devam eder
+    _write(path, '{"glucose": {"min": 70,', start + 10**9)
+    assert source.current().lookup('glucose').max == 100
+
+    # Düzeltilen dosya aynı değişiklik zamanına sahip olsa da yüklenir
+    _write(path, json.dumps({'glucose': {'min': 70, 'max': 110, 'unit': 'mg/dL'}}), start + 10**9)
+    assert source.current().lookup('glucose').max == 110
@@ -0,0 +1,166 @@
+"""Özetleme arka uçları ve SummarizerService: küçük yerel bir BART modeliyle, ağ olmadan."""
+import json
+import os
+from collections import OrderedDict
+
+import pytest
+
+transformers = pytest.importorskip('transformers')
+torch = pytest.importorskip('torch')
+
+import src.generate_summary as generate_summary
+from src import summarizer_service
+from src.generate_summary import NLP_BACKENDS, load_summarizer, onnx_export_path
+from src.summarizer_service import SummarizerService, get_summarizer_service
+
+
+TIMEOUT = 120
+
+TEXT = ("Laboratuvar sonuçlarınız analiz edildi. Toplam 5 test değerlendirildi. "
+        "Hemoglobin değeri düşük (referans: 12.0-16.0 g/dL). "
+        "Glukoz değeri yüksek (referans: 70-100 mg/dL). ") * 3
+
+
+def _byte_symbols():
+    """Bayt düzeyi BPE'nin 256 bayt için kullandığı yazdırılabilir karakterler."""
+    printable = list(range(ord('!'), ord('~') + 1)) + list(range(ord('¡'), ord('¬') + 1)) + \
+        list(range(ord('®'), ord('ÿ') + 1))
+    symbols, extra = [], 0
+    for byte in range(256):
+        if byte in printable:
+            symbols.append(chr(byte))
+        else:
+            symbols.append(chr(256 + extra))
+            extra += 1
+    return symbols
+
+
+@pytest.fixture(scope='module')
+def model(tmp_path_factory):
+    """Rastgele ağırlıklı, birleştirmesiz bayt düzeyi sözlüklü küçük bir BART dizini.
+
+    ``SMART_AUDIO_TEST_MODEL`` verilirse onun yerine bu model kullanılır.
+    """
+    override = os.environ.get('SMART_AUDIO_TEST_MODEL')
+    if override:
+        return override
+    from transformers import BartConfig, BartForConditionalGeneration, BartTokenizer
+
+    directory = tmp_path_factory.mktemp('tiny-bart')
+    vocab = {token: index for index, token in enumerate(
+        ['<s>', '<pad>', '</s>', '<unk>'] + _byte_symbols() + ['<mask>']
+    )}
+    (directory / 'vocab.json').write_text(json.dumps(vocab), encoding='utf-8')
+    (directory / 'merges.txt').write_text('#version: 0.2\n', encoding='utf-8')
+    tokenizer = BartTokenizer(str(directory / 'vocab.json'), str(directory / 'merges.txt'))
+
+    torch.manual_seed(0)
+    config = BartConfig(
+        vocab_size=len(vocab), d_model=32, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=64,
+        decoder_ffn_dim=64, max_position_embeddings=1024, pad_token_id=1, bos_token_id=0,
+        eos_token_id=2, decoder_start_token_id=2, forced_bos_token_id=0,
+    )
+    BartForConditionalGeneration(config).save_pretrained(directory)
+    tokenizer.save_pretrained(directory)
+    return str(directory)
+
+
+def _summary(summarizer) -> str:
+    return summarizer(TEXT, max_length=20, min_length=5, do_sample=False)[0]['summary_text']
+
+
+@pytest.mark.parametrize('backend', NLP_BACKENDS)
+def test_load_summarizer_backends(model, backend, tmp_path, monkeypatch):
+    if backend == 'onnx':
+        pytest.importorskip('onnxruntime')
+        pytest.importorskip('optimum.onnxruntime')
+        monkeypatch.setattr(generate_summary, 'ONNX_EXPORT_DIR', str(tmp_path))
+    summarizer = load_summarizer(model, backend)
+    assert isinstance(_summary(summarizer), str)
+    if backend == 'int8':
+        assert any('quantized' in type(module).__module__ for module in summarizer.model.modules())
+
+
+def test_onnx_export_is_reused(model, tmp_path, monkeypatch):
+    pytest.importorskip('onnxruntime')
+    optimum_onnx = pytest.importorskip('optimum.onnxruntime')
+    monkeypatch.setattr(generate_summary, 'ONNX_EXPORT_DIR', str(tmp_path))
+    load_summarizer(model, 'onnx')
+    assert onnx_export_path(model).is_dir()
+
+    model_class = optimum_onnx.ORTModelForSeq2SeqLM
+    original = model_class.from_pretrained.__func__
+    exports = []
+
+    def from_pretrained(cls, *args, **kwargs):
+        exports.append(kwargs.get('export', False))
+        return original(cls, *args, **kwargs)
+
+    monkeypatch.setattr(model_class, 'from_pretrained', classmethod(from_pretrained))
+    assert isinstance(_summary(load_summarizer(model, 'onnx')), str)
+    assert exports == [False]
+
+
+@pytest.fixture
+def service(model):
+    service = SummarizerService(model=model, max_batch_size=4, max_wait=0.01)
+    yield service
+    service.close()
+
+
+def test_round_trip(service):
+    assert service.ready.wait(TIMEOUT)
+    assert service.error is None
+    futures = [service.submit(f'{TEXT} Rapor {index}.') for index in range(3)]
+    summaries = [future.result(timeout=TIMEOUT) for future in futures]
+    assert all(isinstance(summary, str) for summary in summaries)
+    stats = service.stats()
+    assert stats['requests'] == 3
+    assert stats['in_flight'] == 0
+    assert 1 <= stats['batches'] <= 3
+
+
+def test_restart_after_worker_death(model, monkeypatch):
+    monkeypatch.setattr(summarizer_service, '_services', OrderedDict())
+    service = get_summarizer_service(model=model)
+    restarted = None
+    try:
+        assert service.ready.wait(TIMEOUT)
+        service._process.kill()
+        service._process.join(10)
+        assert not service.available
+        # Ölü servis beklemeden hata verir; çağıran kural tabanlı özete döner
+        assert service.summarize(TEXT, timeout=5) is None
+
+        restarted = get_summarizer_service(model=model)
+        assert restarted is not service
+        assert get_summarizer_service(model=model) is restarted
+        assert isinstance(restarted.summarize(TEXT, timeout=TIMEOUT), str)
+    finally:
+        service.close()
+        if restarted is not None:
+            restarted.close()
+
+
+def test_services_keyed_by_model_and_backend(model, monkeypatch):
+    monkeypatch.setattr(summarizer_service, '_services', OrderedDict())
+    monkeypatch.setattr(summarizer_service, 'MAX_SERVICES', 2)
+    services = []
+    try:
+        pytorch = get_summarizer_service(model=model)
+        int8 = get_summarizer_service(model=model, backend='int8')
+        services += [pytorch, int8]
+        assert int8 is not pytorch
+        # Farklı arka uç istemek mevcut servisi kapatmaz
+        assert get_summarizer_service(model=model) is pytorch
+        assert pytorch.available and int8.available
+
+        # Sınır dolunca en uzun süredir kullanılmayan servis kapatılır
+        services.append(get_summarizer_service(model=model, backend='onnx'))
+        assert not int8.available
+        assert pytorch.available
+        assert list(summarizer_service._services) == [(model, 'pytorch'), (model, 'onnx')]
+    finally:
+        for service in services:
+            service.close()